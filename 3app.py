@@ -1,23 +1,41 @@
 import streamlit as st
 import gspread
+from gspread.utils import rowcol_to_a1
 from google.oauth2.service_account import Credentials
 import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
 import json
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, NamedTuple
 import re
 import logging
+import logging.handlers
+import heapq
+import itertools
+import bisect
+import difflib
+from collections import deque, Counter, defaultdict
 from io import StringIO, BytesIO
 import smtplib
+import queue
+import threading
+import uuid
+import string
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
 import hashlib
+import gzip
 import requests
 import plotly.express as px
 import plotly.graph_objects as go
 import calendar as cal_module
+import time
+import os
+import sqlite3
 
 # Configure logging
 logging.basicConfig(
@@ -26,8 +44,41 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# System log ring buffer size per session; set BOOKING_LOG_FILE to also spill every
+# record to a size-rotated JSONL file
+LOG_BUFFER_SIZE = 500
+LOG_SPILL_PATH = os.environ.get("BOOKING_LOG_FILE")
+LOG_SPILL_MAX_BYTES = 5_000_000
+LOG_SPILL_BACKUPS = 3
+# Rows per page in the log and history viewers
+LOG_PAGE_SIZE = 50
+LOG_TIME_WINDOWS = {"All time": None, "Last 15 minutes": 15, "Last hour": 60, "Last 24 hours": 1440}
+
+# Outbound email queue is bounded so a stalled SMTP server pushes back on the UI instead of piling up
+EMAIL_QUEUE_SIZE = 500
+# A sender waits this long for queue space before the message is marked failed
+EMAIL_QUEUE_WAIT_SECONDS = 120
+# Pooled SMTP connection is closed after this long without messages
+SMTP_IDLE_TIMEOUT_SECONDS = 60
+SMTP_SEND_RETRIES = 2
+
+# Keep each values:batchUpdate request comfortably under the Sheets API payload limit
+WRITE_BATCH_MAX_BYTES = 1_000_000
+
 DRIVE_FOLDER_ID = "1Fk5dJGkm5dNMZkfsITe5Lt9x-yCsBiF2"
 
+# Idle authorized Drive HTTP connections kept per service account for reuse
+GOOGLE_HTTP_POOL_SIZE = 8
+
+# Spreadsheet and sheet properties fetched when a workbook is opened; no cell data
+WORKBOOK_METADATA_FIELDS = (
+    "properties(title,locale,timeZone),"
+    "sheets.properties(sheetId,title,index,hidden,gridProperties(rowCount,columnCount,frozenRowCount,frozenColumnCount))"
+)
+
+# Directory for the on-disk store that survives Streamlit restarts
+LOCAL_STORE_DIR = os.environ.get("BOOKING_STORE_DIR", ".booking_store")
+
 # Page Configuration
 st.set_page_config(
     page_title="Professional Booking Management System",
@@ -329,8 +380,6 @@ if 'workbooks' not in st.session_state:
     st.session_state.workbooks = []
 if 'current_workbook' not in st.session_state:
     st.session_state.current_workbook = None
-if 'logs' not in st.session_state:
-    st.session_state.logs = []
 if 'service_account_email' not in st.session_state:
     st.session_state.service_account_email = None
 if 'all_sheets' not in st.session_state:
@@ -341,20 +390,18 @@ if 'email_logs' not in st.session_state:
     st.session_state.email_logs = []
 if 'email_config' not in st.session_state:
     st.session_state.email_config = {}
-if 'edit_history' not in st.session_state:
-    st.session_state.edit_history = []
 if 'pending_changes' not in st.session_state:
     st.session_state.pending_changes = []
 if 'notification_count' not in st.session_state:
     st.session_state.notification_count = 0
 if 'templates' not in st.session_state:
     st.session_state.templates = []
+if 'campaign_recipients' not in st.session_state:
+    st.session_state.campaign_recipients = {}
 if 'dark_mode' not in st.session_state:
     st.session_state.dark_mode = False
 if 'auto_backup' not in st.session_state:
     st.session_state.auto_backup = True
-if 'backup_history' not in st.session_state:
-    st.session_state.backup_history = []
 
 if 'selected_bookings' not in st.session_state:
     st.session_state.selected_bookings = []
@@ -394,6 +441,43 @@ CALENDAR_COLUMNS = {
 HEADER_ROW = 13
 DATA_START_ROW = 14
 
+# Date formats seen in the DATE column, in order of preference when a sample is ambiguous
+DATE_FORMATS = ['%d/%m/%Y', '%m/%d/%Y', '%Y-%m-%d', '%d-%m-%Y']
+
+# Booking fields tokenized into the full-text search index
+SEARCH_FIELDS = ['VILLA', 'TYPE CLEAN', 'RESERVATION STATUS', 'COMMENTS']
+# Fuzzy term matching: minimum difflib similarity, and shortest query term it applies to
+SEARCH_FUZZY_CUTOFF = 0.8
+SEARCH_FUZZY_MIN_LENGTH = 4
+# Workbooks read in parallel when indexing the whole folder for search
+SEARCH_INDEX_MAX_WORKERS = 4
+
+# How long a fetched worksheet snapshot is shared between views before re-reading
+SNAPSHOT_TTL_SECONDS = 60
+
+# Rows re-fetched above a sheet's watermark to catch recent edits during incremental sync
+SYNC_OVERLAP_ROWS = 20
+
+# Rows above the overlap window are only re-checked by a periodic full read
+FULL_RESYNC_SECONDS = 900
+
+# Backup versions kept per sheet; older ones and their unreferenced objects are pruned
+BACKUP_RETENTION = 200
+# A delta touching more than this share of its base's cells is stored as a new base instead
+BACKUP_REBASE_RATIO = 0.5
+# Scheduled backups: default cadence, and the pause between workbooks so a pass (two Sheets
+# reads per changed workbook) leaves room for interactive sessions on the shared limiter
+AUTO_BACKUP_DEFAULT_MINUTES = 60
+AUTO_BACKUP_STAGGER_SECONDS = 3
+
+# Sheets requests per minute allowed across every session and the backup scheduler,
+# matching the default per-user read quota, and the burst a quiet minute can bank
+SHEETS_REQUESTS_PER_MINUTE = 60
+SHEETS_REQUEST_BURST = 10
+
+# Days of edit history kept in the audit store
+AUDIT_RETENTION_DAYS = 366
+
 STATUS_CODES = {
     'CI': {'name': 'Check-In', 'description': 'Complete cleaning and preparation for incoming guests', 'color': '#4CAF50', 'icon': '🏠'},
     'SO': {'name': 'Stay-over', 'description': 'Mid-stay cleaning with linen and towel refresh', 'color': '#2196F3', 'icon': '🔄'},
@@ -404,6 +488,755 @@ STATUS_CODES = {
     'CO': {'name': 'Check-Out', 'description': 'Final cleaning after guest departure', 'color': '#607D8B', 'icon': '🚪'}
 }
 
+# Session state that is kept in the local store across sessions and restarts, one row per
+# template, email log entry or campaign recipient so concurrent sessions do not overwrite each other
+PERSISTED_STATE_KEYS = ['templates', 'email_logs', 'campaign_recipients']
+
+# Workbooks read in parallel while preparing a bulk summary campaign
+CAMPAIGN_MAX_WORKERS = 4
+
+# Worker threads shared by every session for Drive refreshes that run behind a render
+BACKGROUND_MAX_WORKERS = 2
+
+# Booking summary email body, compiled once and shared by single sends and campaigns
+BOOKING_SUMMARY_TEMPLATE = string.Template("""
+        <html>
+            <head>
+                <style>
+                    body { font-family: Arial, sans-serif; }
+                    table { border-collapse: collapse; width: 100%; margin-top: 20px; }
+                    th, td { border: 1px solid #ddd; padding: 12px; text-align: left; }
+                    th { background-color: #667eea; color: white; }
+                    tr:nth-child(even) { background-color: #f2f2f2; }
+                    h2 { color: #667eea; }
+                </style>
+            </head>
+            <body>
+                <h2>📊 Booking Summary Report</h2>
+                <p><strong>Client:</strong> $client_name</p>
+                <p><strong>Generated:</strong> $generated</p>
+                <p><strong>Total Bookings:</strong> $total_bookings</p>
+                
+                $table
+                
+                <br>
+                <p style="color: #666; font-size: 0.9em;">
+                    This is an automated report from the Professional Booking Management System.
+                </p>
+            </body>
+        </html>
+        """)
+
+class SQLiteStore:
+    """One SQLite database under a directory, creating only the tables in SCHEMA
+    
+    A store that cannot be opened is disabled; statement failures are logged and
+    never break the app.
+    """
+    
+    SCHEMA = ""
+    
+    def __init__(self, directory: str):
+        """Open (or create) the store database under the given directory"""
+        self.path = os.path.join(directory, 'booking_store.sqlite3')
+        self.enabled = True
+        try:
+            os.makedirs(directory, exist_ok=True)
+            self._execute_script(self.SCHEMA)
+            self._setup()
+        except Exception as e:
+            self.enabled = False
+            logger.warning(f"{type(self).__name__} disabled: {str(e)}")
+    
+    def _setup(self):
+        """Store-specific setup once SCHEMA exists, such as upgrading older databases"""
+    
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+    
+    def _execute_script(self, script: str):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executescript(script)
+        finally:
+            conn.close()
+    
+    def _execute(self, sql: str, params: tuple = ()) -> List[tuple]:
+        """Run one statement; store failures are logged and never break the app"""
+        if not self.enabled:
+            return []
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    return conn.execute(sql, params).fetchall()
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.warning(f"{type(self).__name__} error: {str(e)}")
+            return []
+
+class LocalStore(SQLiteStore):
+    """SQLite store for sheet snapshots, workbook listings and session history
+    
+    Snapshots and listings are scoped to the service account that read them, so a second
+    account in the same process never starts from data it may not be allowed to see.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS snapshots (
+            account TEXT NOT NULL,
+            workbook_id TEXT NOT NULL,
+            sheet_id INTEGER NOT NULL,
+            entry TEXT NOT NULL,
+            fetched_at REAL,
+            modified TEXT,
+            PRIMARY KEY (account, workbook_id, sheet_id)
+        );
+        CREATE TABLE IF NOT EXISTS workbook_listings (
+            account TEXT NOT NULL,
+            folder_id TEXT NOT NULL,
+            workbooks TEXT NOT NULL,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (account, folder_id)
+        );
+        CREATE TABLE IF NOT EXISTS session_state (
+            name TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS state_items (
+            name TEXT NOT NULL,
+            item_key TEXT NOT NULL,
+            value TEXT NOT NULL,
+            PRIMARY KEY (name, item_key)
+        );
+    """
+    
+    def _setup(self):
+        # Stores created before snapshots and listings were scoped per account only hold cached
+        # copies of Drive data, so they are rebuilt rather than migrated
+        columns = {row[1] for row in self._execute("PRAGMA table_info(snapshots)")}
+        if 'account' not in columns:
+            self._execute_script(
+                "DROP TABLE snapshots; DROP TABLE IF EXISTS workbook_listings; "
+                "DELETE FROM session_state WHERE name LIKE 'drive_changes_token:%';"
+            )
+            self._execute_script(self.SCHEMA)
+    
+    def save_snapshot(self, account: str, key: tuple, entry: Dict):
+        """Persist a worksheet snapshot (raw rows and sync metadata, not the parsed frames)"""
+        stored = {k: v for k, v in entry.items() if k not in ('frame', 'months', 'dates', 'fetched_at', 'modified')}
+        self._execute(
+            """INSERT OR REPLACE INTO snapshots (account, workbook_id, sheet_id, entry, fetched_at, modified)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (account, key[0], key[1], json.dumps(stored), entry['fetched_at'], entry.get('modified'))
+        )
+    
+    def touch_snapshot(self, account: str, key: tuple, fetched_at: float, modified: Optional[str] = None):
+        """Update a snapshot's sync metadata without rewriting its rows"""
+        self._execute(
+            """UPDATE snapshots SET fetched_at = ?, modified = COALESCE(?, modified)
+               WHERE account = ? AND workbook_id = ? AND sheet_id = ?""",
+            (fetched_at, modified, account, key[0], key[1])
+        )
+    
+    def delete_snapshots(self, account: str, workbook_id: Optional[str] = None, sheet_id: Optional[int] = None):
+        """Delete one sheet's snapshot, one workbook's snapshots, or all of an account's"""
+        if workbook_id is None:
+            self._execute("DELETE FROM snapshots WHERE account = ?", (account,))
+        elif sheet_id is None:
+            self._execute("DELETE FROM snapshots WHERE account = ? AND workbook_id = ?", (account, workbook_id))
+        else:
+            self._execute("DELETE FROM snapshots WHERE account = ? AND workbook_id = ? AND sheet_id = ?",
+                          (account, workbook_id, sheet_id))
+    
+    def load_snapshots(self, account: str) -> Dict[tuple, Dict]:
+        """Load an account's stored snapshots keyed by (spreadsheet id, sheet id)"""
+        snapshots = {}
+        rows = self._execute(
+            "SELECT workbook_id, sheet_id, entry, fetched_at, modified FROM snapshots WHERE account = ?", (account,)
+        )
+        for workbook_id, sheet_id, entry, fetched_at, modified in rows:
+            snapshot = json.loads(entry)
+            snapshot['fetched_at'] = fetched_at or 0
+            snapshot['modified'] = modified
+            snapshot['frame'] = None
+            snapshot['months'] = None
+            snapshot['dates'] = None
+            snapshots[(workbook_id, sheet_id)] = snapshot
+        return snapshots
+    
+    def save_workbooks(self, account: str, folder_id: str, workbooks: List[Dict]):
+        self._execute(
+            "INSERT OR REPLACE INTO workbook_listings (account, folder_id, workbooks, updated_at) VALUES (?, ?, ?, ?)",
+            (account, folder_id, json.dumps(workbooks), time.time())
+        )
+    
+    def load_workbooks(self, account: str, folder_id: str) -> List[Dict]:
+        rows = self._execute(
+            "SELECT workbooks FROM workbook_listings WHERE account = ? AND folder_id = ?", (account, folder_id)
+        )
+        return json.loads(rows[0][0]) if rows else []
+    
+    def save_state(self, name: str, value):
+        self._execute(
+            "INSERT OR REPLACE INTO session_state (name, value) VALUES (?, ?)",
+            (name, json.dumps(value, default=str))
+        )
+    
+    def load_state(self, name: str, default=None):
+        rows = self._execute("SELECT value FROM session_state WHERE name = ?", (name,))
+        return json.loads(rows[0][0]) if rows else default
+    
+    def delete_state(self, name: str):
+        self._execute("DELETE FROM session_state WHERE name = ?", (name,))
+    
+    def save_item(self, name: str, item_key: str, value):
+        """Insert or update one entry of a persisted collection, keeping its original position"""
+        self._execute(
+            """INSERT INTO state_items (name, item_key, value) VALUES (?, ?, ?)
+               ON CONFLICT (name, item_key) DO UPDATE SET value = excluded.value""",
+            (name, item_key, json.dumps(value, default=str))
+        )
+    
+    def delete_item(self, name: str, item_key: str):
+        self._execute("DELETE FROM state_items WHERE name = ? AND item_key = ?", (name, item_key))
+    
+    def load_items(self, name: str) -> Dict:
+        """Entries of a persisted collection keyed by item key, in insertion order"""
+        rows = self._execute("SELECT item_key, value FROM state_items WHERE name = ? ORDER BY rowid", (name,))
+        return {item_key: json.loads(value) for item_key, value in rows}
+
+def state_item_key(item: Dict) -> str:
+    """Row key for a persisted template (its id) or email log entry (its job id)"""
+    return item.get('id') or item.get('job_id') or uuid.uuid4().hex[:12]
+
+@st.cache_resource
+def get_local_store() -> LocalStore:
+    """One local store per server process, opened on first use"""
+    local_store = LocalStore(LOCAL_STORE_DIR)
+    
+    # Collections saved as whole blobs by earlier versions move to per-item rows once
+    for name in PERSISTED_STATE_KEYS:
+        legacy = local_store.load_state(name)
+        if legacy is None:
+            continue
+        items = legacy.items() if isinstance(legacy, dict) else [(state_item_key(item), item) for item in legacy]
+        for item_key, value in items:
+            local_store.save_item(name, item_key, value)
+        local_store.delete_state(name)
+    return local_store
+
+class BackupStore(SQLiteStore):
+    """Sheet backups on disk: one base snapshot per sheet plus cell-level deltas
+    
+    Payloads are gzip-compressed JSON objects named by their SHA-256, so identical
+    bases and deltas are stored once. The version manifest lives in the SQLite store.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS backups (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            workbook_id TEXT NOT NULL,
+            workbook TEXT NOT NULL,
+            sheet_id INTEGER NOT NULL,
+            sheet TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            object TEXT NOT NULL,
+            base_object TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            row_count INTEGER NOT NULL,
+            col_count INTEGER NOT NULL,
+            changed_cells INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS backups_by_sheet ON backups (workbook_id, sheet_id, id);
+        CREATE INDEX IF NOT EXISTS backups_by_object ON backups (object);
+        CREATE INDEX IF NOT EXISTS backups_by_base ON backups (base_object);
+        CREATE TABLE IF NOT EXISTS objects (
+            digest TEXT PRIMARY KEY,
+            size INTEGER NOT NULL
+        );
+    """
+    
+    def __init__(self, directory: str):
+        self.objects_dir = os.path.join(directory, 'objects')
+        # Held across save, prune and clear so garbage collection never removes an
+        # object another save has written but not yet recorded
+        self.lock = threading.Lock()
+        super().__init__(directory)
+    
+    def _setup(self):
+        os.makedirs(self.objects_dir, exist_ok=True)
+        # Stores created before object sizes were tracked are indexed once
+        if not self._execute("SELECT 1 FROM objects LIMIT 1"):
+            for root, _, files in os.walk(self.objects_dir):
+                for name in files:
+                    if name.endswith('.json.gz'):
+                        self._execute(
+                            "INSERT OR IGNORE INTO objects (digest, size) VALUES (?, ?)",
+                            (name[:-len('.json.gz')], os.path.getsize(os.path.join(root, name)))
+                        )
+    
+    COLUMNS = ['id', 'workbook_id', 'workbook', 'sheet_id', 'sheet', 'timestamp', 'kind', 'object',
+               'base_object', 'content_hash', 'row_count', 'col_count', 'changed_cells']
+    
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.json.gz")
+    
+    def _put_object(self, payload) -> str:
+        """Write a payload once under its content hash and return the hash"""
+        data = json.dumps(payload, separators=(',', ':')).encode()
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            with gzip.open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        self._execute("INSERT OR IGNORE INTO objects (digest, size) VALUES (?, ?)", (digest, os.path.getsize(path)))
+        return digest
+    
+    def _get_object(self, digest: str):
+        with gzip.open(self._object_path(digest), 'rb') as f:
+            return json.loads(f.read())
+    
+    @staticmethod
+    def _grid(values: List[List[str]], rows: int, cols: int) -> np.ndarray:
+        """Values as a rows x cols object array, padded with blanks and cropped to size"""
+        grid = np.full((rows, cols), '', dtype=object)
+        for i, row in enumerate(values[:rows]):
+            row = row[:cols]
+            grid[i, :len(row)] = row
+        return grid
+    
+    def _rows(self, where: str = '', params: tuple = ()) -> List[Dict]:
+        rows = self._execute(f"SELECT {', '.join(self.COLUMNS)} FROM backups {where}", params)
+        return [dict(zip(self.COLUMNS, row)) for row in rows]
+    
+    def latest(self, workbook_id: str, sheet_id: int) -> Optional[Dict]:
+        rows = self._rows("WHERE workbook_id = ? AND sheet_id = ? ORDER BY id DESC LIMIT 1", (workbook_id, sheet_id))
+        return rows[0] if rows else None
+    
+    def save(self, workbook_id: str, workbook: str, sheet_id: int, sheet: str, values: List[List[str]]) -> Optional[Dict]:
+        """Record a version of a sheet, as a delta against its base when that is small enough"""
+        if not self.enabled:
+            return None
+        
+        content_hash = hashlib.sha256(json.dumps(values, separators=(',', ':')).encode()).hexdigest()
+        with self.lock:
+            previous = self.latest(workbook_id, sheet_id)
+            if previous and previous['content_hash'] == content_hash:
+                return dict(previous, unchanged=True)
+            
+            rows = len(values)
+            cols = max((len(row) for row in values), default=0)
+            kind, changed_cells = 'base', rows * cols
+            
+            if previous:
+                base = self._get_object(previous['base_object'])
+                base_cells = len(base) * max((len(row) for row in base), default=0)
+                diff = np.argwhere(self._grid(base, rows, cols) != self._grid(values, rows, cols))
+                if len(diff) <= BACKUP_REBASE_RATIO * max(base_cells, 1):
+                    cells = [[int(i), int(j), values[i][j] if j < len(values[i]) else ''] for i, j in diff]
+                    kind, changed_cells = 'delta', len(cells)
+                    obj = self._put_object({'rows': rows, 'cols': cols, 'cells': cells})
+                    base_object = previous['base_object']
+            
+            if kind == 'base':
+                obj = base_object = self._put_object(values)
+            
+            self._execute(
+                """INSERT INTO backups (workbook_id, workbook, sheet_id, sheet, timestamp, kind, object,
+                                        base_object, content_hash, row_count, col_count, changed_cells)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (workbook_id, workbook, sheet_id, sheet, datetime.now().isoformat(), kind, obj,
+                 base_object, content_hash, rows, cols, changed_cells)
+            )
+            self._prune(workbook_id, sheet_id)
+            return self.latest(workbook_id, sheet_id)
+    
+    def load(self, backup: Dict) -> List[List[str]]:
+        """Reconstruct the sheet values a backup version recorded"""
+        base = self._get_object(backup['base_object'])
+        if backup['kind'] == 'base':
+            return base
+        
+        delta = self._get_object(backup['object'])
+        grid = self._grid(base, delta['rows'], delta['cols'])
+        for i, j, value in delta['cells']:
+            grid[i, j] = value
+        return grid.tolist()
+    
+    def list_backups(self, workbook_id: Optional[str] = None) -> List[Dict]:
+        """Backup versions, newest first"""
+        if workbook_id:
+            return self._rows("WHERE workbook_id = ? ORDER BY id DESC", (workbook_id,))
+        return self._rows("ORDER BY id DESC")
+    
+    def count(self) -> int:
+        rows = self._execute("SELECT COUNT(*) FROM backups")
+        return rows[0][0] if rows else 0
+    
+    def disk_usage(self) -> int:
+        """Bytes used by stored objects"""
+        rows = self._execute("SELECT COALESCE(SUM(size), 0) FROM objects")
+        return rows[0][0] if rows else 0
+    
+    def _prune(self, workbook_id: str, sheet_id: int):
+        """Drop versions past the retention limit, then the objects only they referred to"""
+        expired_where = """WHERE workbook_id = ? AND sheet_id = ? AND id NOT IN (
+                   SELECT id FROM backups WHERE workbook_id = ? AND sheet_id = ? ORDER BY id DESC LIMIT ?)"""
+        params = (workbook_id, sheet_id, workbook_id, sheet_id, BACKUP_RETENTION)
+        expired = self._execute(f"SELECT object, base_object FROM backups {expired_where}", params)
+        if expired:
+            self._execute(f"DELETE FROM backups {expired_where}", params)
+            self._release({digest for row in expired for digest in row})
+    
+    def _release(self, digests: set):
+        """Delete the given objects unless a remaining version still refers to them; needs the lock"""
+        for digest in digests:
+            if self._execute("SELECT 1 FROM backups WHERE object = ? OR base_object = ? LIMIT 1", (digest, digest)):
+                continue
+            try:
+                os.remove(self._object_path(digest))
+            except FileNotFoundError:
+                pass
+            self._execute("DELETE FROM objects WHERE digest = ?", (digest,))
+    
+    def clear(self):
+        with self.lock:
+            digests = {row[0] for row in self._execute("SELECT digest FROM objects")}
+            self._execute("DELETE FROM backups")
+            self._release(digests)
+
+@st.cache_resource
+def get_backup_store() -> BackupStore:
+    """One backup store per server process, opened on first use"""
+    return BackupStore(os.path.join(LOCAL_STORE_DIR, 'backups'))
+
+class AuditStore(SQLiteStore):
+    """Append-only edit audit log shared by every session
+    
+    Each edit is one indexed row. Per-day counts by sheet and action live in a side table
+    bumped in the same transaction, so dashboards read totals without counting the log.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS edits (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT NOT NULL,
+            action TEXT NOT NULL,
+            sheet TEXT NOT NULL,
+            user TEXT,
+            details TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS edits_by_time ON edits (timestamp);
+        CREATE INDEX IF NOT EXISTS edits_by_sheet ON edits (sheet, timestamp);
+        CREATE INDEX IF NOT EXISTS edits_by_action ON edits (action, timestamp);
+        CREATE TABLE IF NOT EXISTS edit_counts (
+            day TEXT NOT NULL,
+            sheet TEXT NOT NULL,
+            action TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (day, sheet, action)
+        );
+    """
+    
+    COLUMNS = ['id', 'timestamp', 'action', 'sheet', 'user', 'details']
+    
+    def record(self, entries: List[Dict]) -> bool:
+        """Append edits and bump their daily counts in one transaction, then drop expired days"""
+        if not self.enabled:
+            return False
+        cutoff = (datetime.now() - timedelta(days=AUDIT_RETENTION_DAYS)).strftime("%Y-%m-%d")
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    for entry in entries:
+                        sheet = str(entry['details'].get('sheet', ''))
+                        conn.execute(
+                            "INSERT INTO edits (timestamp, action, sheet, user, details) VALUES (?, ?, ?, ?, ?)",
+                            (entry['timestamp'], entry['action'], sheet, entry.get('user'),
+                             json.dumps(entry['details'], default=str))
+                        )
+                        conn.execute(
+                            """INSERT INTO edit_counts (day, sheet, action, count) VALUES (?, ?, ?, 1)
+                               ON CONFLICT (day, sheet, action) DO UPDATE SET count = count + 1""",
+                            (entry['timestamp'][:10], sheet, entry['action'])
+                        )
+                    conn.execute("DELETE FROM edits WHERE timestamp < ?", (cutoff,))
+                    conn.execute("DELETE FROM edit_counts WHERE day < ?", (cutoff,))
+            finally:
+                conn.close()
+            return True
+        except Exception as e:
+            logger.warning(f"Audit store error: {str(e)}")
+            return False
+    
+    @staticmethod
+    def _where(actions: Optional[List[str]], day: Optional[str], sheet: Optional[str],
+               text: str = '', counts: bool = False):
+        """WHERE clause and parameters for the edits table, or the counts table when no text is searched"""
+        clauses, params = [], []
+        if actions is not None:
+            clauses.append(f"action IN ({', '.join('?' * len(actions))})")
+            params.extend(actions)
+        if day and counts:
+            clauses.append("day = ?")
+            params.append(day)
+        elif day:
+            next_day = (datetime.strptime(day, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+            clauses.append("timestamp >= ? AND timestamp < ?")
+            params.extend([day, next_day])
+        if sheet:
+            clauses.append("sheet = ?")
+            params.append(sheet)
+        if text:
+            escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            clauses.append("details LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ''), tuple(params)
+    
+    def query(self, actions: Optional[List[str]] = None, day: Optional[str] = None, sheet: Optional[str] = None,
+              text: str = '', offset: int = 0, limit: int = LOG_PAGE_SIZE):
+        """One newest-first page of edits matching the filters, plus the number of matches"""
+        if actions is not None and not actions:
+            return [], 0
+        where, params = self._where(actions, day, sheet, text)
+        rows = self._execute(
+            f"SELECT {', '.join(self.COLUMNS)} FROM edits {where} ORDER BY id DESC LIMIT ? OFFSET ?",
+            params + (limit, offset)
+        )
+        if text:
+            matched = self._execute(f"SELECT COUNT(*) FROM edits {where}", params)
+        else:
+            where, params = self._where(actions, day, sheet, counts=True)
+            matched = self._execute(f"SELECT COALESCE(SUM(count), 0) FROM edit_counts {where}", params)
+        return [dict(zip(self.COLUMNS, row)) for row in rows], (matched[0][0] if matched else 0)
+    
+    def recent(self, limit: int = 10) -> List[Dict]:
+        return self.query(limit=limit)[0]
+    
+    def count(self, day: Optional[str] = None) -> int:
+        """Edits recorded on one day (YYYY-MM-DD), or in total"""
+        return self.query(day=day, limit=0)[1]
+    
+    def actions(self) -> List[str]:
+        return [row[0] for row in self._execute("SELECT DISTINCT action FROM edit_counts ORDER BY action")]
+    
+    def sheet_activity(self, day: Optional[str] = None) -> pd.DataFrame:
+        """Edit counts per sheet and action, for one day or the whole retention window"""
+        where, params = self._where(None, day, None, counts=True)
+        rows = self._execute(
+            f"SELECT sheet, action, SUM(count) FROM edit_counts {where} GROUP BY sheet, action", params
+        )
+        if not rows:
+            return pd.DataFrame()
+        activity = pd.DataFrame(rows, columns=['sheet', 'action', 'count'])
+        activity = activity.pivot_table(index='sheet', columns='action', values='count', aggfunc='sum', fill_value=0)
+        activity['Total'] = activity.sum(axis=1)
+        return activity.sort_values('Total', ascending=False)
+    
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self._execute(f"SELECT {', '.join(self.COLUMNS)} FROM edits ORDER BY id"),
+                            columns=self.COLUMNS)
+    
+    def clear(self):
+        self._execute("DELETE FROM edits")
+        self._execute("DELETE FROM edit_counts")
+
+@st.cache_resource
+def get_audit_store() -> AuditStore:
+    """One audit store per server process, opened on first use"""
+    audit_store = AuditStore(os.path.join(LOCAL_STORE_DIR, 'audit'))
+    
+    # Edit history persisted by earlier versions as session state moves into the audit store once
+    legacy_edit_history = get_local_store().load_state('edit_history')
+    if legacy_edit_history and audit_store.record(legacy_edit_history):
+        get_local_store().delete_state('edit_history')
+    return audit_store
+
+class BackupScheduler:
+    """Server-side thread that backs up every calendar in the Drive folder on a cadence
+    
+    It outlives the browser session that started it. Each pass lists the folder once and
+    only reads workbooks whose Drive modifiedTime changed since their last backup, so idle
+    clients cost no Sheets reads.
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.clients = None
+        self.folder_id = None
+        self.interval_minutes = AUTO_BACKUP_DEFAULT_MINUTES
+        self.backed_up_modified = get_local_store().load_state('auto_backup_modified', {})
+        self.status = {
+            'last_run': None,
+            'next_run': None,
+            'workbooks_backed_up': 0,
+            'workbooks_skipped': 0,
+            'workbooks_failed': 0,
+            'sheets_backed_up': 0,
+            'last_error': None
+        }
+    
+    def is_running(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+    
+    def start(self, clients: Dict, folder_id: str, interval_minutes: int):
+        """Start the worker, or update its cadence if it is already running"""
+        with self.lock:
+            self.clients = clients
+            self.folder_id = folder_id
+            self.interval_minutes = interval_minutes
+            if self.is_running():
+                return
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self._run, name="backup-scheduler", daemon=True)
+            self.thread.start()
+    
+    def stop(self):
+        self.stop_event.set()
+        self.status['next_run'] = None
+    
+    def _run(self):
+        while not self.stop_event.is_set():
+            try:
+                self.run_pass(self.clients['gc'], self.clients['drive'])
+                self.status['last_error'] = None
+            except Exception as e:
+                self.status['last_error'] = str(e)
+                logger.warning(f"Scheduled backup pass failed: {str(e)}")
+            
+            self.status['next_run'] = (datetime.now() + timedelta(minutes=self.interval_minutes)).isoformat()
+            self.stop_event.wait(self.interval_minutes * 60)
+    
+    def _list_workbooks(self, drive) -> List[Dict]:
+        """The folder's spreadsheets plus any other workbook in the listing the app shows"""
+        files = self._list_folder(drive)
+        listed = {file['id'] for file in files}
+        for wb in get_local_store().load_workbooks(self.clients['email'], self.folder_id):
+            if wb['id'] not in listed:
+                files.append({'id': wb['id'], 'name': wb['name'], 'modifiedTime': wb.get('modified')})
+        return files
+    
+    def _list_folder(self, drive) -> List[Dict]:
+        query = f"'{self.folder_id}' in parents and mimeType='application/vnd.google-apps.spreadsheet' and trashed=false"
+        files, page_token = [], None
+        while True:
+            results = drive.files().list(
+                q=query,
+                pageSize=100,
+                fields="nextPageToken, files(id, name, modifiedTime)",
+                supportsAllDrives=True,
+                includeItemsFromAllDrives=True,
+                corpora='allDrives',
+                pageToken=page_token
+            ).execute()
+            files.extend(results.get('files', []))
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                return files
+    
+    def run_pass(self, gc, drive):
+        """Back up the calendars of every workbook modified since its last scheduled backup
+        
+        Each changed workbook costs one masked metadata fetch and one values:batchGet, both
+        paced by the process-wide Sheets limiter. A workbook that cannot be read is logged
+        and retried on the next pass without holding up the others.
+        """
+        backed_up = skipped = failed = sheets = 0
+        
+        for file in self._list_workbooks(drive):
+            if self.stop_event.is_set():
+                break
+            if self.backed_up_modified.get(file['id']) == file.get('modifiedTime'):
+                skipped += 1
+                continue
+            if backed_up or failed:
+                self.stop_event.wait(AUTO_BACKUP_STAGGER_SECONDS)
+            
+            try:
+                workbook = CachedSpreadsheet(gc.http_client, {'id': file['id']})
+                calendars = workbook.worksheets()[1:]
+                if calendars:
+                    ranges = ["'{}'".format(sheet.title.replace("'", "''")) for sheet in calendars]
+                    value_ranges = workbook.values_batch_get(ranges).get('valueRanges', [])
+                    for sheet, value_range in zip(calendars, value_ranges):
+                        # batchGet trims trailing blanks; pad to a grid like get_all_values
+                        rows = value_range.get('values', [])
+                        width = max((len(row) for row in rows), default=0)
+                        rows = [row + [''] * (width - len(row)) for row in rows]
+                        get_backup_store().save(workbook.id, workbook.title, sheet.id, sheet.title, rows)
+                        sheets += 1
+            except Exception as e:
+                failed += 1
+                logger.warning(f"Scheduled backup of {file.get('name', file['id'])} failed: {str(e)}")
+                continue
+            
+            self.backed_up_modified[file['id']] = file.get('modifiedTime')
+            get_local_store().save_state('auto_backup_modified', self.backed_up_modified)
+            backed_up += 1
+        
+        self.status.update({
+            'last_run': datetime.now().isoformat(),
+            'workbooks_backed_up': backed_up,
+            'workbooks_skipped': skipped,
+            'workbooks_failed': failed,
+            'sheets_backed_up': sheets
+        })
+        logger.info(f"Scheduled backup: {backed_up} workbook(s), {sheets} sheet(s) backed up, "
+                    f"{skipped} unchanged, {failed} failed")
+
+@st.cache_resource
+def get_backup_scheduler() -> BackupScheduler:
+    """One scheduler per server process, shared by every session"""
+    return BackupScheduler()
+
+@st.cache_resource
+def get_background_executor() -> ThreadPoolExecutor:
+    """Process-wide worker pool for refreshes that must not hold up a render"""
+    return ThreadPoolExecutor(max_workers=BACKGROUND_MAX_WORKERS, thread_name_prefix="background-refresh")
+
+def start_workbook_refresh(manager):
+    """Catch up on Drive changes in a worker thread; main_app swaps the listing in once it is done"""
+    ctx = get_script_run_ctx()
+    
+    def refresh() -> List[Dict]:
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return manager.refresh_workbooks(DRIVE_FOLDER_ID)
+    
+    return get_background_executor().submit(refresh)
+
+def warm_session_state():
+    """Load templates, email logs and campaign recipients from the local store once per browser session"""
+    if 'store_warmed' in st.session_state:
+        return
+    st.session_state.templates = list(get_local_store().load_items('templates').values())
+    st.session_state.email_logs = list(get_local_store().load_items('email_logs').values())
+    st.session_state.campaign_recipients = get_local_store().load_items('campaign_recipients')
+    # Results from earlier sessions were already reported there. Jobs still queued or sending
+    # that this process's dispatcher does not hold were cut off by a restart and will never finish.
+    pending = get_email_dispatcher().pending
+    for email_log in st.session_state.email_logs:
+        status = email_log.get('status')
+        if status not in ('Queued', 'Sending'):
+            email_log['reported'] = True
+        elif email_log.get('job_id') not in pending:
+            if status == 'Queued':
+                email_log['status'] = 'Failed: not sent before the app restarted'
+            else:
+                email_log['status'] = 'Unknown: the app restarted during delivery'
+            email_log['reported'] = True
+            get_local_store().save_item('email_logs', email_log['job_id'], email_log)
+    st.session_state.store_warmed = True
+
 # Data loading functions
 @st.cache_data(ttl=300)
 def load_client_data():
@@ -431,18 +1264,127 @@ def load_reservations_data():
         st.error(f"Error loading reservations: {str(e)}")
         return pd.DataFrame()
 
+class LogRecord(NamedTuple):
+    seq: int
+    timestamp: str
+    level: str
+    message: str
+
+def get_log_spill() -> Optional[logging.Logger]:
+    """JSONL logger for the on-disk spill, set up once per process"""
+    if not LOG_SPILL_PATH:
+        return None
+    spill = logging.getLogger("booking.log_spill")
+    if not spill.handlers:
+        handler = logging.handlers.RotatingFileHandler(
+            LOG_SPILL_PATH, maxBytes=LOG_SPILL_MAX_BYTES, backupCount=LOG_SPILL_BACKUPS, encoding='utf-8'
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        spill.addHandler(handler)
+        spill.setLevel(logging.INFO)
+        spill.propagate = False
+    return spill
+
+class LogStore:
+    """Bounded ring buffer of log records with per-level counts kept up to date on append"""
+    
+    def __init__(self, maxlen: int = LOG_BUFFER_SIZE):
+        self.records = deque(maxlen=maxlen)
+        self.by_level = {}
+        self.level_counts = Counter()
+        self.next_seq = 0
+        self.spill = get_log_spill()
+        self.lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def __iter__(self):
+        return iter(self.records)
+    
+    def append(self, level: str, message: str) -> LogRecord:
+        with self.lock:
+            record = LogRecord(self.next_seq, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), level, message)
+            self.next_seq += 1
+            
+            if len(self.records) == self.records.maxlen:
+                evicted = self.records[0]
+                self.by_level[evicted.level].popleft()
+                self.level_counts[evicted.level] -= 1
+            
+            self.records.append(record)
+            self.by_level.setdefault(level, deque()).append(record)
+            self.level_counts[level] += 1
+        
+        if self.spill:
+            self.spill.info(json.dumps(record._asdict()))
+        return record
+    
+    def _newest(self, levels: Optional[List[str]]):
+        """Lazy newest-first iterator over the records of the given levels; hold the lock while iterating"""
+        if levels is None:
+            sources = [self.records]
+        else:
+            sources = [self.by_level[level] for level in levels if level in self.by_level]
+        return heapq.merge(*(reversed(source) for source in sources), key=lambda r: r.seq, reverse=True)
+    
+    def tail(self, levels: Optional[List[str]] = None, limit: int = 100) -> List[LogRecord]:
+        """Newest records first, touching only as many records as are returned"""
+        with self.lock:
+            return list(itertools.islice(self._newest(levels), limit))
+    
+    def query(self, levels: Optional[List[str]] = None, text: str = '', since: Optional[str] = None,
+              offset: int = 0, limit: int = LOG_PAGE_SIZE):
+        """One newest-first page of records matching the filters, plus the number of matches
+        
+        Without a text or time filter the count comes from the per-level counters and only
+        the first offset + limit records are visited. Filtered queries make a single pass
+        that stops at the time cutoff.
+        """
+        text = text.lower()
+        with self.lock:
+            if not text and not since:
+                if levels is None:
+                    matched = len(self.records)
+                else:
+                    matched = sum(self.level_counts[level] for level in levels)
+                return list(itertools.islice(self._newest(levels), offset, offset + limit)), matched
+            
+            page, matched = [], 0
+            for record in self._newest(levels):
+                if since and record.timestamp < since:
+                    break
+                if text and text not in record.message.lower():
+                    continue
+                if offset <= matched < offset + limit:
+                    page.append(record)
+                matched += 1
+            return page, matched
+    
+    def clear(self):
+        with self.lock:
+            self.records.clear()
+            self.by_level.clear()
+            self.level_counts.clear()
+    
+    def to_frame(self) -> pd.DataFrame:
+        with self.lock:
+            return pd.DataFrame(list(self.records), columns=LogRecord._fields)
+
+if 'logs' not in st.session_state:
+    st.session_state.logs = LogStore()
+
+def render_page_selector(total: int, key: str, page_size: int = LOG_PAGE_SIZE) -> int:
+    """Page picker for the paginated viewers; returns the offset of the chosen page"""
+    pages = max(1, -(-total // page_size))
+    if st.session_state.get(key, 1) > pages:
+        st.session_state[key] = pages
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key=key)
+    return (page - 1) * page_size
+
 def add_log(message: str, level: str = "INFO"):
     """Add a log entry with timestamp"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_entry = {
-        'timestamp': timestamp,
-        'level': level,
-        'message': message
-    }
-    st.session_state.logs.append(log_entry)
-    
-    if len(st.session_state.logs) > 500:
-        st.session_state.logs = st.session_state.logs[-500:]
+    st.session_state.logs.append(level, message)
     
     if level == "INFO":
         logger.info(message)
@@ -464,54 +1406,95 @@ def add_edit_history(action: str, details: Dict):
         'details': details,
         'user': st.session_state.service_account_email
     }
-    st.session_state.edit_history.append(edit_entry)
+    get_audit_store().record([edit_entry])
     
-    if len(st.session_state.edit_history) > 1000:
-        st.session_state.edit_history = st.session_state.edit_history[-1000:]
-    
-    add_log(f"Edit: {action} - {details}", "SUCCESS")
+    add_log(f"Edit: {action} in {details.get('sheet', 'workbook')}", "SUCCESS")
 
 def create_backup(workbook, sheet_name: str) -> Dict:
-    """Create a backup of current sheet data"""
+    """Record a backup of current sheet data in the on-disk backup store"""
     try:
         sheet = workbook.worksheet(sheet_name)
-        all_values = sheet.get_all_values()
-        
-        backup = {
-            'timestamp': datetime.now().isoformat(),
-            'workbook': workbook.title,
-            'sheet': sheet_name,
-            'data': all_values,
-            'row_count': len(all_values),
-            'col_count': len(all_values[0]) if all_values else 0
-        }
-        
-        st.session_state.backup_history.append(backup)
+        manager = st.session_state.gc
+        all_values = manager.get_sheet_values(sheet) if manager else sheet.get_all_values()
         
-        # Keep only last 50 backups
-        if len(st.session_state.backup_history) > 50:
-            st.session_state.backup_history = st.session_state.backup_history[-50:]
+        backup = get_backup_store().save(workbook.id, workbook.title, sheet.id, sheet_name, all_values)
+        if not backup:
+            raise RuntimeError("backup store is unavailable")
         
-        add_log(f"Backup created: {sheet_name} ({len(all_values)} rows)", "SUCCESS")
+        if backup.get('unchanged'):
+            add_log(f"Backup skipped: {sheet_name} unchanged since {backup['timestamp']}", "INFO")
+        else:
+            add_log(f"Backup created: {sheet_name} ({len(all_values)} rows, {backup['kind']}, {backup['changed_cells']} cells)", "SUCCESS")
         return backup
     except Exception as e:
         add_log(f"Backup failed: {str(e)}", "ERROR")
         return None
 
+def diff_backup(backup: Dict, manager):
+    """Compare a backup with the sheet's current contents
+    
+    Returns the worksheet and the cells that differ, each with its current and backed-up value.
+    """
+    workbook = manager.get_workbook(backup['workbook_id'])
+    sheet = workbook.get_worksheet_by_id(backup['sheet_id'])
+    
+    manager.invalidate_sheet(sheet)
+    current = manager.get_sheet_values(sheet)
+    target = get_backup_store().load(backup)
+    
+    rows = max(len(current), len(target))
+    cols = max([len(row) for row in current + target] or [0])
+    current_grid = BackupStore._grid(current, rows, cols)
+    target_grid = BackupStore._grid(target, rows, cols)
+    
+    changes = [
+        {
+            'row': int(i) + 1,
+            'col': int(j) + 1,
+            'cell': rowcol_to_a1(int(i) + 1, int(j) + 1),
+            'current': current_grid[i, j],
+            'backup': target_grid[i, j]
+        }
+        for i, j in np.argwhere(current_grid != target_grid)
+    ]
+    return sheet, changes
+
+def preview_restore(backup: Dict, manager) -> pd.DataFrame:
+    """Dry run of restore_backup: the cells it would rewrite"""
+    try:
+        _, changes = diff_backup(backup, manager)
+        add_log(f"Restore preview: {len(changes)} cell(s) differ in {backup['sheet']}", "INFO")
+        return pd.DataFrame(changes, columns=['cell', 'current', 'backup'])
+    except Exception as e:
+        add_log(f"Restore preview failed: {str(e)}", "ERROR")
+        return pd.DataFrame()
+
 def restore_backup(backup: Dict, manager) -> bool:
-    """Restore data from a backup"""
+    """Restore a backup by rewriting only the cells that differ from the sheet now"""
     try:
-        workbook = manager.gc.open(backup['workbook'])
-        sheet = workbook.worksheet(backup['sheet'])
+        sheet, changes = diff_backup(backup, manager)
         
-        # Clear existing data
-        sheet.clear()
+        if not changes:
+            add_log(f"Backup restore: {backup['sheet']} already matches {backup['timestamp']}", "INFO")
+            return True
         
-        # Restore backup data
-        if backup['data']:
-            sheet.update(backup['data'], 'A1')
+        # Grow the grid first if the backup reaches past the sheet's current size; the cached
+        # handle may predate rows or columns added since, so re-read its grid first
+        sheet.spreadsheet.refresh_metadata()
+        last_row = max(change['row'] for change in changes)
+        last_col = max(change['col'] for change in changes)
+        if last_row > sheet.row_count:
+            sheet.add_rows(last_row - sheet.row_count)
+        if last_col > sheet.col_count:
+            sheet.add_cols(last_col - sheet.col_count)
         
-        add_log(f"Backup restored: {backup['sheet']} from {backup['timestamp']}", "SUCCESS")
+        request_count = manager._write_cell_ranges(
+            sheet,
+            [{'row': change['row'], 'col': change['col'], 'value': change['backup']} for change in changes]
+        )
+        
+        add_log(f"Backup restored: {backup['sheet']} from {backup['timestamp']} "
+                f"({len(changes)} cell(s) in {request_count} request(s))", "SUCCESS")
         return True
     except Exception as e:
         add_log(f"Restore failed: {str(e)}", "ERROR")
@@ -528,6 +1511,7 @@ def save_template(name: str, description: str, data: Dict):
         'usage_count': 0
     }
     st.session_state.templates.append(template)
+    get_local_store().save_item('templates', template['id'], template)
     add_log(f"Template saved: {name}", "SUCCESS")
     return template
 
@@ -546,6 +1530,7 @@ def apply_template(template: Dict, sheet, row_index: int, manager) -> bool:
         
         if manager.batch_update_cells(sheet, updates):
             template['usage_count'] += 1
+            get_local_store().save_item('templates', template['id'], template)
             add_log(f"Template applied: {template['name']} to row {row_index}", "SUCCESS")
             return True
         return False
@@ -553,6 +1538,101 @@ def apply_template(template: Dict, sheet, row_index: int, manager) -> bool:
         add_log(f"Template application failed: {str(e)}", "ERROR")
         return False
 
+class EmailDispatcher:
+    """Background worker that delivers queued emails over one persistent SMTP connection"""
+    
+    def __init__(self, max_queue: int = EMAIL_QUEUE_SIZE):
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.server = None
+        self.server_key = None
+        # Job ids queued or in flight in this process
+        self.pending = set()
+        self.worker = threading.Thread(target=self._run, name="email-dispatcher", daemon=True)
+        self.worker.start()
+    
+    def submit(self, config: Dict, to_email: str, message: str, job: Dict,
+               timeout: float = EMAIL_QUEUE_WAIT_SECONDS) -> bool:
+        """Queue a rendered message, waiting up to timeout for space; the job dict is updated in place"""
+        self.pending.add(job['job_id'])
+        try:
+            self.queue.put((dict(config), to_email, message, job), timeout=timeout)
+            return True
+        except queue.Full:
+            self.pending.discard(job['job_id'])
+            return False
+    
+    def _connect(self, config: Dict):
+        """Reuse the open session for this account, logging in again only when needed"""
+        key = (config['smtp_server'], config['smtp_port'], config['sender_email'], config['sender_password'])
+        if self.server is not None and self.server_key == key:
+            return self.server
+        
+        self._close()
+        server = smtplib.SMTP(config['smtp_server'], config['smtp_port'], timeout=30)
+        try:
+            server.starttls()
+            server.login(config['sender_email'], config['sender_password'])
+        except Exception:
+            # Don't leave the socket open behind a failed handshake (e.g. 535 bad credentials)
+            server.close()
+            raise
+        self.server, self.server_key = server, key
+        logger.info(f"SMTP session opened: {config['sender_email']} via {config['smtp_server']}")
+        return server
+    
+    def _close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except Exception:
+                pass
+        self.server, self.server_key = None, None
+    
+    def _deliver(self, config: Dict, to_email: str, message: str) -> str:
+        """Send one message, reconnecting when the pooled session has dropped"""
+        error = None
+        for attempt in range(SMTP_SEND_RETRIES + 1):
+            try:
+                self._connect(config).sendmail(config['sender_email'], to_email, message)
+                return 'Sent'
+            except smtplib.SMTPServerDisconnected as e:
+                error = e
+                self._close()
+            except smtplib.SMTPResponseException as e:
+                error = e
+                # 421 means the server is closing the session; anything else is final for this
+                # message but leaves the session usable for the next one
+                if e.smtp_code != 421:
+                    break
+                self._close()
+            except smtplib.SMTPException as e:
+                error = e
+                break
+            except OSError as e:
+                error = e
+                self._close()
+        return f'Failed: {str(error)}'
+    
+    def _run(self):
+        while True:
+            try:
+                config, to_email, message, job = self.queue.get(timeout=SMTP_IDLE_TIMEOUT_SECONDS)
+            except queue.Empty:
+                self._close()
+                continue
+            
+            job['status'] = 'Sending'
+            job['status'] = self._deliver(config, to_email, message)
+            job['sent_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            get_local_store().save_item('email_logs', job['job_id'], job)
+            self.pending.discard(job['job_id'])
+            self.queue.task_done()
+
+@st.cache_resource
+def get_email_dispatcher() -> EmailDispatcher:
+    """Process-wide dispatcher so every session shares one SMTP worker"""
+    return EmailDispatcher()
+
 class EmailManager:
     """Manages email sending functionality"""
     
@@ -571,12 +1651,12 @@ class EmailManager:
     
     @staticmethod
     def send_email(to_email: str, subject: str, body: str, attachment_data: Optional[bytes] = None, 
-                   attachment_name: Optional[str] = None) -> bool:
-        """Send email with optional attachment"""
+                   attachment_name: Optional[str] = None, campaign_id: Optional[str] = None) -> Optional[str]:
+        """Queue email with optional attachment, returning the job id (None if it could not be queued)"""
         try:
             if not st.session_state.email_config.get('configured'):
                 add_log("Email not configured. Please configure email settings first.", "ERROR")
-                return False
+                return None
             
             config = st.session_state.email_config
             
@@ -598,78 +1678,615 @@ class EmailManager:
                 msg.attach(part)
                 add_log(f"Attached file: {attachment_name}", "EMAIL")
             
-            add_log(f"Connecting to SMTP server {config['smtp_server']}:{config['smtp_port']}", "EMAIL")
-            
-            server = smtplib.SMTP(config['smtp_server'], config['smtp_port'])
-            server.starttls()
-            server.login(config['sender_email'], config['sender_password'])
-            
-            text = msg.as_string()
-            server.sendmail(config['sender_email'], to_email, text)
-            server.quit()
-            
             email_log = {
+                'job_id': uuid.uuid4().hex[:12],
                 'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 'to': to_email,
                 'subject': subject,
-                'status': 'Sent',
+                'status': 'Queued',
                 'has_attachment': attachment_name is not None
             }
-            st.session_state.email_logs.append(email_log)
+            if campaign_id:
+                email_log['campaign_id'] = campaign_id
             
-            add_log(f"✅ Email sent successfully to {to_email}", "SUCCESS")
-            st.session_state.notification_count += 1
-            return True
+            if not get_email_dispatcher().submit(config, to_email, msg.as_string(), email_log):
+                raise RuntimeError(f"outbound email queue stayed full for {EMAIL_QUEUE_WAIT_SECONDS}s")
+            
+            st.session_state.email_logs.append(email_log)
+            get_local_store().save_item('email_logs', email_log['job_id'], email_log)
+            add_log(f"📤 Email to {to_email} queued (job {email_log['job_id']})", "EMAIL")
+            return email_log['job_id']
             
         except Exception as e:
             add_log(f"❌ Failed to send email: {str(e)}", "ERROR")
-            email_log = {
-                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                'to': to_email,
-                'subject': subject,
-                'status': f'Failed: {str(e)}',
-                'has_attachment': False
-            }
-            st.session_state.email_logs.append(email_log)
-            return False
+            EmailManager.record_failure(to_email, subject, str(e), campaign_id)
+            return None
+    
+    @staticmethod
+    def record_failure(to_email: str, subject: str, error: str, campaign_id: Optional[str] = None):
+        """Add a failed entry to the email log for a message that was never queued"""
+        email_log = {
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'to': to_email,
+            'subject': subject,
+            'status': f'Failed: {error}',
+            'has_attachment': False
+        }
+        if campaign_id:
+            email_log['campaign_id'] = campaign_id
+        st.session_state.email_logs.append(email_log)
+        get_local_store().save_item('email_logs', state_item_key(email_log), email_log)
+    
+    @staticmethod
+    def collect_results():
+        """Log queued emails the dispatcher has finished with since the last run"""
+        for email_log in st.session_state.email_logs:
+            if not email_log.get('job_id') or email_log.get('reported'):
+                continue
+            status = email_log.get('status', '')
+            if status == 'Sent':
+                add_log(f"✅ Email sent successfully to {email_log['to']}", "SUCCESS")
+                st.session_state.notification_count += 1
+            elif status.startswith('Failed'):
+                add_log(f"❌ Email to {email_log['to']} {status.lower()}", "ERROR")
+            else:
+                continue
+            email_log['reported'] = True
+            get_local_store().save_item('email_logs', email_log['job_id'], email_log)
+    
+    @staticmethod
+    def render_booking_summary(workbook_name: str, summary_data: pd.DataFrame, generated: str) -> str:
+        """Fill the shared summary template for one client"""
+        return BOOKING_SUMMARY_TEMPLATE.substitute(
+            client_name=workbook_name,
+            generated=generated,
+            total_bookings=len(summary_data),
+            table=summary_data.to_html(index=False, escape=False)
+        )
+    
+    @staticmethod
+    def build_attachment(summary_data: pd.DataFrame, attachment_format: str = 'csv') -> bytes:
+        """Serialize bookings to CSV or XLSX bytes in memory"""
+        if attachment_format == 'xlsx':
+            output = BytesIO()
+            with pd.ExcelWriter(output, engine='openpyxl') as writer:
+                summary_data.to_excel(writer, index=False, sheet_name='Bookings')
+            return output.getvalue()
+        return summary_data.to_csv(index=False).encode()
     
     @staticmethod
-    def send_booking_summary(to_email: str, workbook_name: str, summary_data: pd.DataFrame) -> bool:
-        """Send booking summary as email"""
+    def send_booking_summary(to_email: str, workbook_name: str, summary_data: pd.DataFrame) -> Optional[str]:
+        """Queue booking summary as email, returning the job id"""
         subject = f"Booking Summary - {workbook_name}"
+        body = EmailManager.render_booking_summary(workbook_name, summary_data, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
         
-        body = f"""
-        <html>
-            <head>
-                <style>
-                    body {{ font-family: Arial, sans-serif; }}
-                    table {{ border-collapse: collapse; width: 100%; margin-top: 20px; }}
-                    th, td {{ border: 1px solid #ddd; padding: 12px; text-align: left; }}
-                    th {{ background-color: #667eea; color: white; }}
-                    tr:nth-child(even) {{ background-color: #f2f2f2; }}
-                    h2 {{ color: #667eea; }}
-                </style>
-            </head>
-            <body>
-                <h2>📊 Booking Summary Report</h2>
-                <p><strong>Client:</strong> {workbook_name}</p>
-                <p><strong>Generated:</strong> {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
-                <p><strong>Total Bookings:</strong> {len(summary_data)}</p>
-                
-                {summary_data.to_html(index=False, escape=False)}
-                
-                <br>
-                <p style="color: #666; font-size: 0.9em;">
-                    This is an automated report from the Professional Booking Management System.
-                </p>
-            </body>
-        </html>
-        """
-        
-        csv_data = summary_data.to_csv(index=False).encode()
+        csv_data = EmailManager.build_attachment(summary_data, 'csv')
         filename = f"booking_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
         
         return EmailManager.send_email(to_email, subject, body, csv_data, filename)
+    
+    @staticmethod
+    def send_booking_campaign(manager, recipients: List[Dict], attachment_format: str = 'csv',
+                              max_workers: int = CAMPAIGN_MAX_WORKERS) -> str:
+        """Queue a booking summary to every recipient across the portfolio
+        
+        recipients are dicts with workbook_id, workbook_name and email. Each workbook is read
+        once (in parallel) and its body and attachment are rendered once, however many
+        recipients share it. Delivery goes through the pooled dispatcher; per-recipient
+        status lands in email_logs tagged with the returned campaign id.
+        """
+        campaign_id = uuid.uuid4().hex[:8]
+        generated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        workbook_ids = list(dict.fromkeys(r['workbook_id'] for r in recipients))
+        add_log(f"📣 Campaign {campaign_id}: preparing {len(workbook_ids)} workbook(s) for {len(recipients)} recipient(s)", "EMAIL")
+        
+        ctx = get_script_run_ctx()
+        
+        def load_bookings(workbook_id: str) -> pd.DataFrame:
+            add_script_run_ctx(threading.current_thread(), ctx)
+            return manager.read_all_bookings(manager.get_workbook(workbook_id))
+        
+        bookings, errors = {}, {}
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {executor.submit(load_bookings, workbook_id): workbook_id for workbook_id in workbook_ids}
+            for future in as_completed(futures):
+                try:
+                    bookings[futures[future]] = future.result()
+                except Exception as e:
+                    errors[futures[future]] = str(e)
+                    add_log(f"Campaign {campaign_id}: could not read workbook {futures[future]}: {str(e)}", "ERROR")
+        
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        rendered = {}
+        for recipient in recipients:
+            workbook_id = recipient['workbook_id']
+            if workbook_id in errors:
+                # Never mail a client an empty report because their workbook couldn't be read
+                EmailManager.record_failure(
+                    recipient['email'],
+                    f"Booking Summary - {recipient['workbook_name']}",
+                    f"could not read workbook: {errors[workbook_id]}",
+                    campaign_id
+                )
+                continue
+            if workbook_id not in rendered:
+                df = bookings[workbook_id].drop(columns=['Row#'], errors='ignore')
+                rendered[workbook_id] = (
+                    EmailManager.render_booking_summary(recipient['workbook_name'], df, generated),
+                    EmailManager.build_attachment(df, attachment_format)
+                )
+            body, attachment_data = rendered[workbook_id]
+            EmailManager.send_email(
+                recipient['email'],
+                f"Booking Summary - {recipient['workbook_name']}",
+                body,
+                attachment_data,
+                f"booking_summary_{stamp}.{attachment_format}",
+                campaign_id=campaign_id
+            )
+        
+        skipped = sum(1 for recipient in recipients if recipient['workbook_id'] in errors)
+        add_log(f"📣 Campaign {campaign_id}: {len(recipients) - skipped} email(s) handed to the dispatcher, "
+                f"{skipped} skipped on unreadable workbooks", "EMAIL")
+        return campaign_id
+
+class BookingSearchIndex:
+    """Inverted index over the text fields of every booking loaded in this session
+    
+    Documents are keyed by (spreadsheet id, sheet id, row). A sheet is re-synced only when
+    its parsed frame changes, and then only rows whose values differ are re-tokenized.
+    Query terms match whole tokens, token prefixes and, failing those, close misspellings.
+    """
+    
+    def __init__(self):
+        self.docs = {}
+        self.doc_tokens = {}
+        self.sheet_docs = defaultdict(set)
+        self.sheet_frames = {}
+        self.postings = defaultdict(lambda: defaultdict(set))
+        self.token_refs = Counter()
+        self.vocabulary = []
+        self.by_length = defaultdict(set)
+        # Drive modifiedTime each workbook was last indexed at
+        self.versions = {}
+        self.lock = threading.Lock()
+    
+    @staticmethod
+    def tokenize(text) -> List[str]:
+        return re.findall(r'\w+', str(text).lower())
+    
+    @classmethod
+    def _field_tokens(cls, record: Dict) -> Dict[str, set]:
+        fields = {}
+        for field in SEARCH_FIELDS:
+            value = record.get(field, '')
+            tokens = set(cls.tokenize(value))
+            if field == 'RESERVATION STATUS' and str(value).strip() in STATUS_CODES:
+                tokens.update(cls.tokenize(STATUS_CODES[str(value).strip()]['name']))
+            fields[field] = tokens
+        return fields
+    
+    def _add(self, doc_key: tuple, record: Dict):
+        fields = self._field_tokens(record)
+        self.docs[doc_key] = record
+        self.doc_tokens[doc_key] = fields
+        for field, tokens in fields.items():
+            for token in tokens:
+                self.postings[field][token].add(doc_key)
+                if not self.token_refs[token]:
+                    bisect.insort(self.vocabulary, token)
+                    self.by_length[len(token)].add(token)
+                self.token_refs[token] += 1
+    
+    def _remove(self, doc_key: tuple):
+        del self.docs[doc_key]
+        for field, tokens in self.doc_tokens.pop(doc_key).items():
+            for token in tokens:
+                postings = self.postings[field][token]
+                postings.discard(doc_key)
+                if not postings:
+                    del self.postings[field][token]
+                self.token_refs[token] -= 1
+                if not self.token_refs[token]:
+                    del self.token_refs[token]
+                    del self.vocabulary[bisect.bisect_left(self.vocabulary, token)]
+                    self.by_length[len(token)].discard(token)
+    
+    def _sync_sheet(self, key: tuple, workbook: str, calendar: str, df: pd.DataFrame) -> int:
+        """Bring one sheet's documents in line with its parsed frame; returns rows re-indexed"""
+        if self.sheet_frames.get(key) is df:
+            return 0
+        
+        records = {}
+        for record in df.to_dict('records'):
+            record = dict(record, workbook=workbook, calendar_source=calendar)
+            records[(key[0], key[1], int(record['Row#']))] = record
+        
+        current = self.sheet_docs[key]
+        changed = 0
+        for doc_key in current - records.keys():
+            self._remove(doc_key)
+            changed += 1
+        for doc_key, record in records.items():
+            if self.docs.get(doc_key) == record:
+                continue
+            if doc_key in self.docs:
+                self._remove(doc_key)
+            self._add(doc_key, record)
+            changed += 1
+        
+        self.sheet_docs[key] = set(records)
+        self.sheet_frames[key] = df
+        return changed
+    
+    def _drop_sheet(self, key: tuple) -> int:
+        doc_keys = self.sheet_docs.pop(key, set())
+        for doc_key in doc_keys:
+            self._remove(doc_key)
+        self.sheet_frames.pop(key, None)
+        return len(doc_keys)
+    
+    def sync_workbook(self, workbook_id: str, workbook: str, calendars: Dict[tuple, tuple]) -> int:
+        """Sync a workbook's calendars, given as {sheet key: (title, frame)}; returns rows re-indexed"""
+        with self.lock:
+            changed = 0
+            for key in [k for k in self.sheet_docs if k[0] == workbook_id and k not in calendars]:
+                changed += self._drop_sheet(key)
+            for key, (calendar, df) in calendars.items():
+                changed += self._sync_sheet(key, workbook, calendar, df)
+            return changed
+    
+    def drop_workbook(self, workbook_id: Optional[str] = None):
+        """Forget one workbook's documents, or everything"""
+        with self.lock:
+            for key in [k for k in self.sheet_docs if workbook_id is None or k[0] == workbook_id]:
+                self._drop_sheet(key)
+            if workbook_id is None:
+                self.versions.clear()
+            else:
+                self.versions.pop(workbook_id, None)
+    
+    def prune(self, listed_ids) -> int:
+        """Forget every workbook not among listed_ids; returns how many were dropped"""
+        with self.lock:
+            unlisted = {k[0] for k in self.sheet_docs} - set(listed_ids)
+        for workbook_id in unlisted:
+            self.drop_workbook(workbook_id)
+        return len(unlisted)
+    
+    def stale(self, workbooks: List[Dict]) -> List[Dict]:
+        """Listed workbooks whose Drive modifiedTime differs from the one they were indexed at"""
+        with self.lock:
+            return [wb for wb in workbooks
+                    if wb['id'] not in self.versions or self.versions[wb['id']] != wb.get('modified')]
+    
+    def mark_indexed(self, workbook_id: str, modified: Optional[str]):
+        with self.lock:
+            self.versions[workbook_id] = modified
+    
+    def expire(self, workbook_id: str):
+        """Have the next index pass re-read a workbook, keeping its documents until then"""
+        with self.lock:
+            self.versions.pop(workbook_id, None)
+    
+    def _expand(self, term: str, fuzzy: bool) -> Dict[str, int]:
+        """Vocabulary tokens a query term matches, scored exact 3, prefix 2, fuzzy 1
+        
+        Close misspellings are only tried when nothing in the vocabulary starts with the term.
+        """
+        matches = {}
+        start = bisect.bisect_left(self.vocabulary, term)
+        for token in self.vocabulary[start:]:
+            if not token.startswith(term):
+                break
+            matches[token] = 3 if token == term else 2
+        
+        if fuzzy and not matches and len(term) >= SEARCH_FUZZY_MIN_LENGTH:
+            candidates = set()
+            for length in range(len(term) - 2, len(term) + 3):
+                candidates |= self.by_length.get(length, set())
+            for token in difflib.get_close_matches(term, candidates, n=10, cutoff=SEARCH_FUZZY_CUTOFF):
+                matches[token] = 1
+        return matches
+    
+    def search(self, query: str, fields: Optional[List[str]] = None, workbook_ids: Optional[List[str]] = None,
+               sheet_keys: Optional[List[tuple]] = None, fuzzy: bool = True) -> pd.DataFrame:
+        """Bookings matching every query term in any of the fields, best matches first"""
+        terms = self.tokenize(query)
+        fields = [f for f in (fields or SEARCH_FIELDS) if f in SEARCH_FIELDS]
+        if not terms or not fields:
+            return pd.DataFrame()
+        
+        with self.lock:
+            return self._search(terms, fields, workbook_ids, sheet_keys, fuzzy)
+    
+    def _search(self, terms: List[str], fields: List[str], workbook_ids, sheet_keys, fuzzy: bool) -> pd.DataFrame:
+        scores = None
+        for term in terms:
+            term_scores = {}
+            for token, score in self._expand(term, fuzzy).items():
+                for field in fields:
+                    for doc_key in self.postings[field].get(token, ()):
+                        if term_scores.get(doc_key, 0) < score:
+                            term_scores[doc_key] = score
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {doc_key: scores[doc_key] + s for doc_key, s in term_scores.items() if doc_key in scores}
+            if not scores:
+                return pd.DataFrame()
+        
+        if workbook_ids is not None:
+            workbook_ids = set(workbook_ids)
+            scores = {k: s for k, s in scores.items() if k[0] in workbook_ids}
+        if sheet_keys is not None:
+            sheet_keys = set(sheet_keys)
+            scores = {k: s for k, s in scores.items() if k[:2] in sheet_keys}
+        
+        ranked = sorted(scores, key=lambda k: (-scores[k], k))
+        return pd.DataFrame([self.docs[doc_key] for doc_key in ranked])
+    
+    def stats(self) -> Dict:
+        with self.lock:
+            return {'bookings': len(self.docs), 'terms': len(self.vocabulary),
+                    'sheets': len(self.sheet_docs), 'workbooks': len({k[0] for k in self.sheet_docs})}
+
+class BookingDateIndex:
+    """Bookings sorted by DATE, answering range, overlap and next-N queries by binary search
+    
+    Each booking occupies its whole DATE day. An index is immutable once built: sheet
+    indexes are merged into a workbook index, and workbook indexes into a portfolio one.
+    `parts` records the source objects an index was built from, to tell when it is stale.
+    """
+    
+    def __init__(self, bookings: pd.DataFrame, dates: np.ndarray, parts: tuple = ()):
+        self.bookings = bookings
+        self.dates = dates
+        self.parts = parts
+    
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, dates: pd.Series, **labels) -> 'BookingDateIndex':
+        """Index the dated rows of a calendar frame, given its parsed DATE column"""
+        dated = dates.notna().to_numpy()
+        bookings = df[dated].assign(booking_date=dates[dated], **labels)
+        order = np.argsort(bookings['booking_date'].to_numpy(), kind='stable')
+        bookings = bookings.iloc[order].reset_index(drop=True)
+        return cls(bookings, bookings['booking_date'].to_numpy())
+    
+    @classmethod
+    def merge(cls, indexes: List['BookingDateIndex'], parts: tuple = ()) -> 'BookingDateIndex':
+        indexes = [index for index in indexes if len(index)]
+        if not indexes:
+            return cls(pd.DataFrame(), np.array([], dtype='datetime64[ns]'), parts)
+        dates = np.concatenate([index.dates for index in indexes])
+        # Stable sort of already-sorted runs is a linear-time merge
+        order = np.argsort(dates, kind='stable')
+        bookings = pd.concat([index.bookings for index in indexes], ignore_index=True).iloc[order]
+        return cls(bookings.reset_index(drop=True), dates[order], parts)
+    
+    def __len__(self) -> int:
+        return len(self.dates)
+    
+    def _position(self, when, side: str = 'left') -> int:
+        return int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(when)), side=side))
+    
+    def between(self, start, end) -> pd.DataFrame:
+        """Bookings dated from start to end, both inclusive"""
+        return self.bookings.iloc[self._position(start):self._position(end, 'right')]
+    
+    def overlapping(self, start, end) -> pd.DataFrame:
+        """Bookings whose day intersects the half-open interval [start, end)"""
+        day_before = pd.Timestamp(start) - pd.Timedelta(days=1)
+        return self.bookings.iloc[self._position(day_before, 'right'):self._position(end)]
+    
+    def next(self, n: int, after=None) -> pd.DataFrame:
+        """The first n bookings dated on or after a day (today by default)"""
+        start = self._position(pd.Timestamp(after or datetime.now()).normalize())
+        return self.bookings.iloc[start:start + n]
+    
+    def count_from(self, day) -> int:
+        return len(self) - self._position(pd.Timestamp(day).normalize())
+
+class SharedCredentials(Credentials):
+    """Service account credentials that can be shared between sessions and worker threads
+    
+    An expired token is refreshed by one thread while the others wait and reuse it,
+    instead of every caller fetching its own.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._refresh_lock = threading.Lock()
+    
+    def before_request(self, request, method, url, headers):
+        if not self.valid:
+            with self._refresh_lock:
+                if not self.valid:
+                    self.refresh(request)
+        super().before_request(request, method, url, headers)
+
+class AuthorizedHttpPool:
+    """Reusable authorized httplib2 connections; httplib2 is not thread-safe, so each request checks one out"""
+    
+    def __init__(self, creds, size: int = GOOGLE_HTTP_POOL_SIZE):
+        self.creds = creds
+        self.idle = queue.LifoQueue(maxsize=size)
+    
+    def checkout(self):
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            import httplib2
+            import google_auth_httplib2
+            return google_auth_httplib2.AuthorizedHttp(self.creds, http=httplib2.Http())
+    
+    def checkin(self, http):
+        try:
+            self.idle.put_nowait(http)
+        except queue.Full:
+            pass
+
+class RateLimiter:
+    """Thread-safe token bucket shared by every caller of one API"""
+    
+    def __init__(self, rate_per_minute: int, burst: int):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a request token is available"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+@st.cache_resource
+def get_sheets_rate_limiter() -> RateLimiter:
+    """One Sheets limiter per server process, shared by every session and the backup scheduler"""
+    return RateLimiter(SHEETS_REQUESTS_PER_MINUTE, SHEETS_REQUEST_BURST)
+
+class PacedHTTPClient(gspread.HTTPClient):
+    """gspread HTTP client that takes a token from the shared Sheets limiter before every request"""
+    
+    def request(self, *args, **kwargs):
+        get_sheets_rate_limiter().acquire()
+        return super().request(*args, **kwargs)
+
+class GoogleClientPool:
+    """Process-wide Google clients keyed by service account email
+    
+    Every session of the same service account shares one set of credentials (and so one
+    access token), one gspread client with its connection pool, and one Drive service
+    built from the bundled discovery document.
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clients = {}
+    
+    def get(self, credentials_dict: Dict, scopes: List[str]) -> tuple:
+        """Return (clients, reused) for a service account, rebuilding them if its key changed"""
+        email = credentials_dict.get('client_email', 'Unknown')
+        key_id = credentials_dict.get('private_key_id')
+        
+        with self.lock:
+            clients = self.clients.get(email)
+            if clients and clients['key_id'] == key_id and clients['scopes'] == list(scopes):
+                return clients, True
+            
+            creds = SharedCredentials.from_service_account_info(credentials_dict, scopes=scopes)
+            clients = {
+                'email': email,
+                'key_id': key_id,
+                'scopes': list(scopes),
+                'creds': creds,
+                'gc': gspread.authorize(creds, http_client=PacedHTTPClient),
+                'drive': self._build_drive(creds),
+                'created_at': time.time()
+            }
+            self.clients[email] = clients
+            logger.info(f"Google clients created for {email}")
+            return clients, False
+    
+    @staticmethod
+    def _build_drive(creds):
+        try:
+            import httplib2
+            import google_auth_httplib2
+            from googleapiclient.discovery import build
+            from googleapiclient.http import HttpRequest
+        except ImportError:
+            return None
+        
+        http_pool = AuthorizedHttpPool(creds)
+        
+        class PooledHttpRequest(HttpRequest):
+            """Runs on a pooled connection unless the caller supplies one"""
+            
+            def execute(self, http=None, num_retries=0):
+                if http is not None:
+                    return super().execute(http=http, num_retries=num_retries)
+                http = http_pool.checkout()
+                try:
+                    return super().execute(http=http, num_retries=num_retries)
+                finally:
+                    http_pool.checkin(http)
+        
+        return build(
+            'drive', 'v3',
+            http=google_auth_httplib2.AuthorizedHttp(creds, http=httplib2.Http()),
+            requestBuilder=PooledHttpRequest,
+            static_discovery=True,
+            cache_discovery=False
+        )
+
+@st.cache_resource
+def get_google_client_pool() -> GoogleClientPool:
+    """One client pool per server process, shared by every session"""
+    return GoogleClientPool()
+
+class CachedSpreadsheet(gspread.Spreadsheet):
+    """Spreadsheet whose sheet properties are fetched once, with a fields mask
+    
+    worksheets(), get_worksheet() and get_worksheet_by_id() hand out the same worksheet
+    handles built from that metadata, so listing tabs costs no API calls. A handle only
+    reaches the API when its values are read or written.
+    """
+    
+    def __init__(self, http_client, properties: Dict):
+        self.client = http_client
+        self._properties = properties
+        self.metadata_modified = None
+        self._worksheets = []
+        self.refresh_metadata()
+    
+    def refresh_metadata(self):
+        """Re-read the sheet properties, updating handles already handed out in place"""
+        metadata = self.fetch_sheet_metadata(params={'fields': WORKBOOK_METADATA_FIELDS})
+        self._properties.update(metadata['properties'])
+        handles = {sheet.id: sheet for sheet in self._worksheets}
+        # Readers on other threads keep iterating the old list until the new one is complete
+        worksheets = []
+        for sheet in metadata.get('sheets', []):
+            handle = handles.get(sheet['properties']['sheetId'])
+            if handle:
+                handle._properties = sheet['properties']
+            else:
+                handle = gspread.Worksheet(self, sheet['properties'], self.id, self.client)
+            worksheets.append(handle)
+        self._worksheets = worksheets
+        self.metadata_fetched_at = time.time()
+    
+    def expire_metadata(self):
+        """Make the next get_workbook re-read the sheet properties, e.g. after a write grew a grid"""
+        self.metadata_fetched_at = 0
+        self.metadata_modified = None
+    
+    def worksheets(self, exclude_hidden: bool = False) -> List[gspread.Worksheet]:
+        if exclude_hidden:
+            return [sheet for sheet in self._worksheets if not sheet.isSheetHidden]
+        return list(self._worksheets)
+    
+    def get_worksheet(self, index: int) -> gspread.Worksheet:
+        try:
+            return self._worksheets[index]
+        except IndexError:
+            raise gspread.exceptions.WorksheetNotFound(f"index {index} not found")
+    
+    def get_worksheet_by_id(self, id) -> gspread.Worksheet:
+        for sheet in self._worksheets:
+            if sheet.id == int(id):
+                return sheet
+        raise gspread.exceptions.WorksheetNotFound(f"id {id} not found")
 
 class BookingManager:
     """Manages Google Sheets operations for booking system"""
@@ -687,21 +2304,39 @@ class BookingManager:
                 'https://www.googleapis.com/auth/drive.metadata.readonly'
             ]
             
-            self.creds = Credentials.from_service_account_info(credentials_dict, scopes=self.scopes)
+            self.clients, reused = get_google_client_pool().get(credentials_dict, self.scopes)
+            self.creds = self.clients['creds']
+            self.gc = self.clients['gc']
+            self.drive_service = self.clients['drive']
+            # Local store rows are scoped to the service account
+            self.account = self.clients['email']
             
-            add_log("Creating Google Sheets client...", "INFO")
-            self.gc = gspread.authorize(self.creds)
+            if reused:
+                add_log("Reusing shared Google Sheets and Drive clients", "INFO")
+            else:
+                add_log("Created Google Sheets client", "INFO")
             
-            try:
-                from googleapiclient.discovery import build
-                self.drive_service = build('drive', 'v3', credentials=self.creds)
+            if self.drive_service:
                 add_log("✅ Drive API service initialized", "SUCCESS")
-            except ImportError:
-                self.drive_service = None
+            else:
                 add_log("⚠️ google-api-python-client not installed", "WARNING")
             
             st.session_state.service_account_email = credentials_dict.get('client_email', 'Unknown')
             
+            # Worksheet snapshots keyed by (spreadsheet id, sheet id), warmed from the local store
+            self._snapshots = get_local_store().load_snapshots(self.account)
+            # Background refreshes and workers add and drop snapshots while the render thread reads
+            self._snapshots_lock = threading.Lock()
+            # Last Drive modifiedTime seen per spreadsheet id, with when it was checked
+            self._drive_modified = {}
+            # Full-text index over every calendar loaded in this session
+            self._search_index = BookingSearchIndex()
+            # Date indexes per spreadsheet id, and the merged portfolio-wide one
+            self._date_indexes = {}
+            self._portfolio_dates = None
+            # Opened workbooks with their sheet metadata, keyed by spreadsheet id
+            self._workbooks = {}
+            
             add_log(f"Successfully authenticated as: {st.session_state.service_account_email}", "SUCCESS")
             add_log("Booking Manager initialized successfully", "SUCCESS")
             
@@ -709,6 +2344,222 @@ class BookingManager:
             add_log(f"Failed to initialize Booking Manager: {str(e)}", "ERROR")
             raise
     
+    @staticmethod
+    def _sheet_key(sheet) -> tuple:
+        """Snapshot key for a worksheet, stable across reopened workbook handles"""
+        return (sheet.spreadsheet.id, sheet.id)
+    
+    def _record_modified_time(self, workbook_id: str, modified: Optional[str]):
+        """Remember the Drive modifiedTime reported for a spreadsheet"""
+        if modified and modified != 'Unknown':
+            self._drive_modified[workbook_id] = {'modified': modified, 'checked_at': time.time()}
+    
+    def _current_modified_time(self, workbook_id: str) -> Optional[str]:
+        """Drive modifiedTime of a spreadsheet, asking Drive at most once per refresh window"""
+        record = self._drive_modified.get(workbook_id)
+        if record and time.time() - record['checked_at'] < SNAPSHOT_TTL_SECONDS:
+            return record['modified']
+        
+        if not self.drive_service:
+            return None
+        try:
+            file = self.drive_service.files().get(
+                fileId=workbook_id,
+                fields='modifiedTime',
+                supportsAllDrives=True
+            ).execute()
+            self._record_modified_time(workbook_id, file.get('modifiedTime'))
+            return file.get('modifiedTime')
+        except Exception as e:
+            add_log(f"Could not check modifiedTime for {workbook_id}: {str(e)}", "WARNING")
+            return None
+    
+    def _is_fresh(self, key: tuple, entry: Dict) -> bool:
+        """A snapshot is fresh inside the refresh window, or while Drive reports no newer modifiedTime"""
+        if time.time() - entry['fetched_at'] < SNAPSHOT_TTL_SECONDS:
+            return True
+        if not entry['fetched_at'] or not entry.get('modified'):
+            return False
+        if self._current_modified_time(key[0]) == entry['modified']:
+            entry['fetched_at'] = time.time()
+            return True
+        return False
+    
+    def _get_snapshot(self, sheet) -> Optional[Dict]:
+        """Return the snapshot entry for a worksheet if it is still fresh"""
+        key = self._sheet_key(sheet)
+        entry = self._snapshots.get(key)
+        if entry and self._is_fresh(key, entry):
+            return entry
+        return None
+    
+    @staticmethod
+    def _rows_hash(rows: List[List[str]]) -> str:
+        """Content hash of sheet rows that ignores trailing blanks the API may trim"""
+        normalized = []
+        for row in rows:
+            row = list(row)
+            while row and row[-1] == '':
+                row.pop()
+            normalized.append(row)
+        while normalized and not normalized[-1]:
+            normalized.pop()
+        return hashlib.md5(json.dumps(normalized).encode()).hexdigest()
+    
+    def _store_snapshot(self, sheet, values: List[List[str]], first_row: int,
+                        synced_at: Optional[float] = None) -> Dict:
+        """Store sheet rows (starting at first_row) with their row-count watermark and tail hash"""
+        now = time.time()
+        record = self._drive_modified.get(sheet.spreadsheet.id)
+        entry = {
+            'fetched_at': now,
+            'synced_at': synced_at or now,
+            'modified': record['modified'] if record else None,
+            'first_row': first_row,
+            'values': values,
+            'row_count': first_row + len(values) - 1,
+            'tail_hash': self._rows_hash(values[-SYNC_OVERLAP_ROWS:]),
+            'frame': None,
+            'months': None,
+            'dates': None
+        }
+        key = self._sheet_key(sheet)
+        with self._snapshots_lock:
+            self._snapshots[key] = entry
+        get_local_store().save_snapshot(self.account, key, entry)
+        return entry
+    
+    def _open_range(self, sheet, first_row: int) -> str:
+        """A1 range from first_row to the bottom of the sheet, whatever its current length"""
+        last_col = re.sub(r'\d', '', rowcol_to_a1(1, max(sheet.col_count, 1)))
+        return f"{self._quote_title(sheet.title)}!A{first_row}:{last_col}"
+    
+    def _refresh_grid(self, workbook, force: bool = False):
+        """Re-read a cached workbook's sheet properties if Drive reports a change since they were fetched"""
+        if not isinstance(workbook, CachedSpreadsheet):
+            return
+        record = self._drive_modified.get(workbook.id)
+        modified = record['modified'] if record else None
+        if force or (modified and modified != workbook.metadata_modified):
+            workbook.refresh_metadata()
+            workbook.metadata_modified = modified
+    
+    def _tail_request(self, sheet, entry: Optional[Dict], first_row: int) -> Optional[tuple]:
+        """Range covering the overlap window plus everything past the watermark
+        
+        Returns (range, start_row), or None when the sheet needs a full read. The range is
+        built from current grid properties; a grid that shrank below the watermark means
+        rows were deleted, which only a full read can reconcile.
+        """
+        if not entry or entry['first_row'] > first_row:
+            return None
+        if time.time() - entry['synced_at'] > FULL_RESYNC_SECONDS:
+            return None
+        self._refresh_grid(sheet.spreadsheet)
+        if entry['row_count'] > sheet.row_count:
+            return None
+        start = max(entry['first_row'], entry['row_count'] - SYNC_OVERLAP_ROWS + 1)
+        return self._open_range(sheet, start), start
+    
+    def _drop_snapshot(self, sheet):
+        """Forget a sheet's snapshot so its next read is a full one"""
+        key = self._sheet_key(sheet)
+        with self._snapshots_lock:
+            self._snapshots.pop(key, None)
+        get_local_store().delete_snapshots(self.account, *key)
+    
+    def _apply_tail(self, sheet, entry: Dict, start: int, tail: List[List[str]]) -> Optional[Dict]:
+        """Splice freshly fetched tail rows onto a snapshot if the overlap window is unchanged"""
+        offset = start - entry['first_row']
+        overlap = len(entry['values']) - offset
+        if self._rows_hash(tail[:overlap]) != entry['tail_hash']:
+            return None
+        
+        values = self._fill_gaps(entry['values'][:offset] + tail)
+        if values == entry['values']:
+            # Nothing changed: keep the parsed frames and only bump the sync metadata
+            record = self._drive_modified.get(sheet.spreadsheet.id)
+            entry['fetched_at'] = time.time()
+            entry['modified'] = record['modified'] if record else None
+            get_local_store().touch_snapshot(self.account, self._sheet_key(sheet), entry['fetched_at'], entry['modified'])
+            return entry
+        
+        added = len(values) - len(entry['values'])
+        if added:
+            add_log(f"Synced {added} new row(s) in {sheet.title}", "INFO")
+        return self._store_snapshot(sheet, values, entry['first_row'], entry['synced_at'])
+    
+    def _sync_values(self, sheet, first_row: int = 1) -> Dict:
+        """Return a fresh snapshot covering first_row onwards
+        
+        A stale snapshot is refreshed by fetching only the rows past its watermark plus a
+        small overlap window. The sheet is re-read in full when the overlap no longer
+        matches the stored tail hash, or after FULL_RESYNC_SECONDS.
+        """
+        key = self._sheet_key(sheet)
+        entry = self._snapshots.get(key)
+        if entry and entry['first_row'] <= first_row:
+            if self._is_fresh(key, entry):
+                return entry
+            
+            request = self._tail_request(sheet, entry, first_row)
+            if request:
+                tail_range, start = request
+                try:
+                    tail = sheet.spreadsheet.values_get(tail_range).get('values', [])
+                except Exception as e:
+                    # The range may fall outside a grid changed elsewhere; don't retry it
+                    add_log(f"Tail read of {sheet.title} failed ({str(e)}), re-reading full sheet", "WARNING")
+                    self._drop_snapshot(sheet)
+                    self._refresh_grid(sheet.spreadsheet, force=True)
+                    return self._store_snapshot(sheet, sheet.get_all_values(), 1)
+                refreshed = self._apply_tail(sheet, entry, start, tail)
+                if refreshed:
+                    return refreshed
+                add_log(f"Rows changed near the end of {sheet.title}, re-reading full sheet", "INFO")
+        
+        return self._store_snapshot(sheet, sheet.get_all_values(), 1)
+    
+    def get_sheet_values(self, sheet) -> List[List[str]]:
+        """Get all values of a worksheet, fetching it at most once per refresh window"""
+        return self._sync_values(sheet, 1)['values']
+    
+    def invalidate_sheet(self, sheet, appended: bool = False):
+        """Mark a worksheet snapshot stale after it has been written to
+        
+        Appends keep the cached rows so the next read only fetches the new tail;
+        any other write drops the snapshot entirely.
+        """
+        key = self._sheet_key(sheet)
+        self._search_index.expire(key[0])
+        self._date_indexes.pop(key[0], None)
+        if key[0] in self._workbooks:
+            self._workbooks[key[0]].expire_metadata()
+        with self._snapshots_lock:
+            entry = self._snapshots.get(key) if appended else self._snapshots.pop(key, None)
+        if appended and entry:
+            entry['fetched_at'] = 0
+            get_local_store().touch_snapshot(self.account, key, 0)
+        else:
+            get_local_store().delete_snapshots(self.account, *key)
+    
+    def invalidate_snapshots(self, workbook_id: Optional[str] = None):
+        """Drop cached snapshots for one workbook, or for all workbooks"""
+        self._search_index.drop_workbook(workbook_id)
+        with self._snapshots_lock:
+            if workbook_id is None:
+                self._snapshots.clear()
+            else:
+                for key in [k for k in self._snapshots if k[0] == workbook_id]:
+                    del self._snapshots[key]
+        if workbook_id is None:
+            self._date_indexes.clear()
+            self._workbooks.clear()
+        else:
+            self._date_indexes.pop(workbook_id, None)
+            self._workbooks.pop(workbook_id, None)
+        get_local_store().delete_snapshots(self.account, workbook_id)
+    
     def list_workbooks_from_folder(self, folder_id: str) -> List[Dict]:
         """List all spreadsheets from a specific Google Drive folder"""
         try:
@@ -747,12 +2598,14 @@ class BookingManager:
                                 'url': file.get('webViewLink', f"https://docs.google.com/spreadsheets/d/{file['id']}"),
                                 'modified': file.get('modifiedTime', 'Unknown')
                             })
+                            self._record_modified_time(file['id'], file.get('modifiedTime'))
                         
                         page_token = results.get('nextPageToken')
                         if not page_token:
                             break
                     
                     add_log(f"✅ Found {total_files} spreadsheet(s)", "SUCCESS")
+                    get_local_store().save_workbooks(self.account, folder_id, workbooks)
                     return workbooks
                     
                 except Exception as e:
@@ -766,12 +2619,136 @@ class BookingManager:
             add_log(f"❌ CRITICAL ERROR: {str(e)}", "ERROR")
             return []
     
+    def _fetch_drive_changes(self, page_token: str) -> tuple:
+        """All Drive changes since a page token, and the token to resume from next time"""
+        changes = []
+        while True:
+            response = self.drive_service.changes().list(
+                pageToken=page_token,
+                pageSize=1000,
+                spaces='drive',
+                fields="nextPageToken, newStartPageToken, "
+                       "changes(fileId, removed, file(id, name, mimeType, parents, trashed, webViewLink, modifiedTime))",
+                supportsAllDrives=True,
+                includeItemsFromAllDrives=True
+            ).execute()
+            changes.extend(response.get('changes', []))
+            if 'newStartPageToken' in response:
+                return changes, response['newStartPageToken']
+            page_token = response['nextPageToken']
+    
+    def _apply_drive_changes(self, folder_id: str, workbooks: List[Dict], changes: List[Dict]) -> tuple:
+        """Apply changes to a folder listing; returns (workbooks, number of listing entries touched)
+        
+        Spreadsheets that changed have their snapshots marked stale; ones that left the folder
+        (deleted, trashed or moved) are dropped along with their snapshots.
+        """
+        listing = {wb['id']: wb for wb in workbooks}
+        touched = 0
+        
+        for change in changes:
+            file_id = change.get('fileId')
+            file = change.get('file') or {}
+            in_folder = (
+                not change.get('removed')
+                and not file.get('trashed')
+                and file.get('mimeType') == 'application/vnd.google-apps.spreadsheet'
+                and folder_id in file.get('parents', [])
+            )
+            
+            if in_folder:
+                entry = {
+                    'id': file_id,
+                    'name': file.get('name', ''),
+                    'url': file.get('webViewLink', f"https://docs.google.com/spreadsheets/d/{file_id}"),
+                    'modified': file.get('modifiedTime', 'Unknown')
+                }
+                if listing.get(file_id) == entry:
+                    continue
+                listing[file_id] = entry
+                self._record_modified_time(file_id, file.get('modifiedTime'))
+                with self._snapshots_lock:
+                    stale = [snapshot for key, snapshot in self._snapshots.items() if key[0] == file_id]
+                for snapshot in stale:
+                    snapshot['fetched_at'] = 0
+                if file_id in self._workbooks:
+                    self._workbooks[file_id].expire_metadata()
+                touched += 1
+            elif file_id in listing:
+                del listing[file_id]
+                self.invalidate_snapshots(file_id)
+                touched += 1
+        
+        return list(listing.values()), touched
+    
+    def refresh_workbooks(self, folder_id: str) -> List[Dict]:
+        """Bring the stored folder listing up to date from the Drive changes feed
+        
+        Once a full scan has been stored with its start page token, a refresh fetches only
+        the changes since that token (normally a single small request) and applies the
+        spreadsheets added to, removed from, renamed or modified in the folder. Without a
+        token, or when the feed fails (e.g. an expired token), the folder is rescanned.
+        """
+        token_key = f"drive_changes_token:{self.account}:{folder_id}"
+        if not self.drive_service:
+            return self.list_workbooks_from_folder(folder_id)
+        
+        page_token = get_local_store().load_state(token_key)
+        workbooks = get_local_store().load_workbooks(self.account, folder_id)
+        if page_token and workbooks:
+            try:
+                changes, page_token = self._fetch_drive_changes(page_token)
+                workbooks, touched = self._apply_drive_changes(folder_id, workbooks, changes)
+                if touched:
+                    get_local_store().save_workbooks(self.account, folder_id, workbooks)
+                get_local_store().save_state(token_key, page_token)
+                add_log(f"Drive changes: {len(changes)} change(s), {touched} listed spreadsheet(s) updated", "INFO")
+                return workbooks
+            except Exception as e:
+                add_log(f"Drive changes feed unavailable, rescanning folder: {str(e)}", "WARNING")
+        
+        # Take the token before scanning so changes made during the scan are not missed
+        try:
+            start_token = self.drive_service.changes().getStartPageToken(supportsAllDrives=True).execute().get('startPageToken')
+        except Exception as e:
+            add_log(f"Could not start Drive change tracking: {str(e)}", "WARNING")
+            start_token = None
+        
+        workbooks = self.list_workbooks_from_folder(folder_id)
+        if workbooks and start_token:
+            get_local_store().save_state(token_key, start_token)
+        return workbooks
+    
+    def get_workbook(self, workbook_id: str) -> CachedSpreadsheet:
+        """Workbook handle with cached sheet metadata
+        
+        The metadata is re-fetched only after the refresh window, and then only when
+        Drive reports the workbook changed, so switching views costs no API calls.
+        """
+        workbook = self._workbooks.get(workbook_id)
+        if workbook:
+            if time.time() - workbook.metadata_fetched_at < SNAPSHOT_TTL_SECONDS:
+                return workbook
+            modified = self._current_modified_time(workbook_id)
+            if modified and modified == workbook.metadata_modified:
+                workbook.metadata_fetched_at = time.time()
+                return workbook
+            workbook.refresh_metadata()
+        else:
+            workbook = CachedSpreadsheet(self.gc.http_client, {'id': workbook_id})
+            self._workbooks[workbook_id] = workbook
+        
+        record = self._drive_modified.get(workbook_id)
+        workbook.metadata_modified = record['modified'] if record else None
+        return workbook
+    
     def open_workbook(self, workbook_id: str):
         """Open a specific workbook by ID"""
         try:
-            add_log(f"Opening workbook ID: {workbook_id}", "INFO")
-            workbook = self.gc.open_by_key(workbook_id)
-            add_log(f"Successfully opened: {workbook.title}", "SUCCESS")
+            opened = workbook_id in self._workbooks
+            workbook = self.get_workbook(workbook_id)
+            if not opened:
+                add_log(f"Successfully opened: {workbook.title}", "SUCCESS")
             
             all_sheets = workbook.worksheets()
             st.session_state.all_sheets = [
@@ -784,7 +2761,8 @@ class BookingManager:
                 for i, sheet in enumerate(all_sheets)
             ]
             
-            add_log(f"Workbook contains {len(all_sheets)} sheet(s)", "INFO")
+            if not opened:
+                add_log(f"Workbook contains {len(all_sheets)} sheet(s)", "INFO")
             
             return workbook
         except Exception as e:
@@ -795,7 +2773,7 @@ class BookingManager:
         """Extract client profile from first sheet"""
         try:
             sheet = workbook.get_worksheet(0)
-            all_values = sheet.get_all_values()
+            all_values = self.get_sheet_values(sheet)
             
             profile = {
                 'client_name': all_values[0][0] if len(all_values) > 0 else 'Unknown',
@@ -842,43 +2820,214 @@ class BookingManager:
             add_log(f"Error listing calendar sheets: {str(e)}", "ERROR")
             return []
     
+    @staticmethod
+    def _fill_gaps(values: List[List[str]]) -> List[List[str]]:
+        """Pad ragged API rows to a rectangle, like gspread's get_all_values does"""
+        width = max((len(row) for row in values), default=0)
+        return [row + [''] * (width - len(row)) for row in values]
+    
+    @staticmethod
+    def _parse_calendar_rows(rows: List[List[str]]) -> pd.DataFrame:
+        """Build a booking frame from sheet rows starting at the header row (row 13)
+        
+        Blank rows and trailing all-empty columns are dropped with NumPy masks
+        instead of a per-row apply; Row# keeps each booking's real sheet row.
+        """
+        if not rows:
+            return pd.DataFrame()
+        
+        headers = np.array(rows[0], dtype=str)
+        data = np.array(rows[1:], dtype=str).reshape(len(rows) - 1, len(headers))
+        filled = np.char.strip(data) != ''
+        
+        # Trim trailing columns that have neither a header nor any data
+        used_cols = np.flatnonzero((np.char.strip(headers) != '') | filled.any(axis=0))
+        width = used_cols[-1] + 1 if len(used_cols) else 0
+        headers, data, filled = headers[:width], data[:, :width], filled[:, :width]
+        
+        # Clean headers and handle duplicates
+        seen = {}
+        unique_headers = []
+        for header in headers:
+            clean_header = header.strip()
+            if clean_header in seen:
+                seen[clean_header] += 1
+                unique_headers.append(f"{clean_header}_{seen[clean_header]}")
+            else:
+                seen[clean_header] = 0
+                unique_headers.append(clean_header)
+        
+        # Keep rows with at least one non-blank cell and build the frame column-wise
+        keep = filled.any(axis=1)
+        columns = {'Row#': np.flatnonzero(keep) + DATA_START_ROW}
+        for i, header in enumerate(unique_headers):
+            columns[header] = data[keep, i].astype(object)
+        
+        return pd.DataFrame(columns)
+    
+    def load_workbook_calendars(self, workbook) -> Dict[str, pd.DataFrame]:
+        """Load the client info tab and every calendar tab; returns {} if the workbook can't be read"""
+        try:
+            return self.read_workbook_calendars(workbook)
+        except Exception as e:
+            add_log(f"Error batch loading calendars: {str(e)}", "ERROR")
+            return {}
+    
+    def read_workbook_calendars(self, workbook) -> Dict[str, pd.DataFrame]:
+        """Load the client info tab and every calendar tab in a single values:batchGet request
+        
+        Returns calendar frames keyed by sheet title. The client info values are stored in
+        the snapshot cache so get_client_profile does not need its own read. Fresh sheets
+        are not fetched at all, and stale ones only fetch the rows past their watermark.
+        Read errors propagate, for callers that must tell a failed read from an empty workbook.
+        """
+        worksheets = workbook.worksheets()
+        if not worksheets:
+            return {}
+        
+        info_sheet, calendar_sheets = worksheets[0], worksheets[1:]
+        needed = [(info_sheet, 1)] + [(sheet, HEADER_ROW) for sheet in calendar_sheets]
+        
+        requests = []
+        for sheet, first_row in needed:
+            key = self._sheet_key(sheet)
+            entry = self._snapshots.get(key)
+            if entry and entry['first_row'] <= first_row and self._is_fresh(key, entry):
+                continue
+            tail = self._tail_request(sheet, entry, first_row)
+            requests.append((sheet, first_row, entry if tail else None, tail))
+        
+        if requests:
+            add_log(f"Batch loading {len(requests)} range(s) from {workbook.title}", "INFO")
+            ranges = [
+                tail[0] if tail else self._full_range(sheet, first_row)
+                for sheet, first_row, _, tail in requests
+            ]
+            try:
+                value_ranges = workbook.values_batch_get(ranges).get('valueRanges', [])
+            except Exception as e:
+                if not any(tail for _, _, _, tail in requests):
+                    raise
+                # One tail range outside a grid changed elsewhere fails the whole batch; drop the
+                # tail-synced snapshots so the bad ranges aren't retried, and read everything in full
+                add_log(f"Tail read of {workbook.title} failed ({str(e)}), re-reading in full", "WARNING")
+                for sheet, _, _, tail in requests:
+                    if tail:
+                        self._drop_snapshot(sheet)
+                self._refresh_grid(workbook, force=True)
+                requests = [(sheet, first_row, None, None) for sheet, first_row, _, _ in requests]
+                ranges = [self._full_range(sheet, first_row) for sheet, first_row, _, _ in requests]
+                value_ranges = workbook.values_batch_get(ranges).get('valueRanges', [])
+            
+            mismatched = []
+            for (sheet, first_row, entry, tail), value_range in zip(requests, value_ranges):
+                values = value_range.get('values', [])
+                if tail is None:
+                    self._store_snapshot(sheet, self._fill_gaps(values), first_row)
+                elif self._apply_tail(sheet, entry, tail[1], values) is None:
+                    mismatched.append((sheet, first_row))
+            
+            if mismatched:
+                add_log(f"Re-reading {len(mismatched)} changed sheet(s) in full", "INFO")
+                ranges = [self._full_range(sheet, first_row) for sheet, first_row in mismatched]
+                value_ranges = workbook.values_batch_get(ranges).get('valueRanges', [])
+                for (sheet, first_row), value_range in zip(mismatched, value_ranges):
+                    self._store_snapshot(sheet, self._fill_gaps(value_range.get('values', [])), first_row)
+        
+        calendars = {
+            self._sheet_key(sheet): (sheet.title, self._calendar_frame(self._snapshots[self._sheet_key(sheet)]))
+            for sheet in calendar_sheets
+        }
+        self._search_index.sync_workbook(workbook.id, workbook.title, calendars)
+        self._index_dates(workbook, calendars)
+        frames = {title: df.copy() for title, df in calendars.values()}
+        add_log(f"Loaded {len(frames)} calendar(s) from {workbook.title}", "SUCCESS")
+        return frames
+    
+    def _full_range(self, sheet, first_row: int) -> str:
+        """A1 range for reading a sheet from first_row, or the whole sheet"""
+        if first_row == 1:
+            return self._quote_title(sheet.title)
+        return self._open_range(sheet, first_row)
+    
+    def _calendar_frame(self, entry: Dict) -> pd.DataFrame:
+        """Parsed booking frame for a snapshot, built once and kept on the entry"""
+        if entry.get('frame') is None:
+            entry['frame'] = self._parse_calendar_rows(entry['values'][HEADER_ROW - entry['first_row']:])
+        return entry['frame']
+    
+    def _index_dates(self, workbook, calendars: Dict[tuple, tuple]) -> BookingDateIndex:
+        """Merge per-snapshot sheet date indexes into the workbook's, unless no calendar changed"""
+        parts = tuple((key, df) for key, (_, df) in calendars.items())
+        index = self._date_indexes.get(workbook.id)
+        if index is not None and len(index.parts) == len(parts) and all(
+            a[0] == b[0] and a[1] is b[1] for a, b in zip(index.parts, parts)
+        ):
+            return index
+        
+        sheet_indexes = []
+        for key, (title, df) in calendars.items():
+            entry = self._snapshots[key]
+            if entry.get('dates') is None:
+                dates = self.parse_booking_dates(df['DATE']) if 'DATE' in df.columns else pd.Series(pd.NaT, index=df.index)
+                entry['dates'] = BookingDateIndex.from_frame(df, dates, workbook=workbook.title, calendar_source=title)
+            sheet_indexes.append(entry['dates'])
+        
+        index = BookingDateIndex.merge(sheet_indexes, parts)
+        self._date_indexes[workbook.id] = index
+        return index
+    
+    def get_date_index(self, workbook, sheet=None) -> BookingDateIndex:
+        """Date index for a workbook, or one of its calendars
+        
+        Served from memory while every calendar snapshot it was built from is still fresh;
+        otherwise the calendars are reloaded (only stale rows are fetched) and re-indexed.
+        """
+        index = self._date_indexes.get(workbook.id)
+        fresh = index is not None and all(
+            self._snapshots.get(key) is not None
+            and self._snapshots[key].get('frame') is df
+            and self._is_fresh(key, self._snapshots[key])
+            for key, df in index.parts
+        )
+        if not fresh:
+            self.load_workbook_calendars(workbook)
+            index = self._date_indexes.get(workbook.id, BookingDateIndex.merge([]))
+        
+        if sheet is None:
+            return index
+        entry = self._snapshots.get(self._sheet_key(sheet))
+        return entry['dates'] if entry and entry.get('dates') is not None else BookingDateIndex.merge([])
+    
+    def get_portfolio_date_index(self, workbooks: List[Dict]) -> BookingDateIndex:
+        """One date index over every listed workbook, re-merged only when a workbook's index changed"""
+        self.index_portfolio(workbooks)
+        parts = tuple(self._date_indexes[wb['id']] for wb in workbooks if wb['id'] in self._date_indexes)
+        current = self._portfolio_dates
+        if current is None or len(current.parts) != len(parts) or any(a is not b for a, b in zip(current.parts, parts)):
+            self._portfolio_dates = BookingDateIndex.merge(list(parts), parts)
+        return self._portfolio_dates
+    
+    @staticmethod
+    def _quote_title(title: str) -> str:
+        """Quote a sheet title for use in an A1 range"""
+        return "'" + title.replace("'", "''") + "'"
+    
     def read_calendar(self, sheet, start_row: int = DATA_START_ROW) -> pd.DataFrame:
-        """Read booking calendar starting from row 14 (data), with headers from row 13"""
+        """Read booking calendar starting from row 14 (data), with headers from row 13
+        
+        The parsed frame is kept in the sheet snapshot; every caller gets its own copy
+        so in-place column conversions never leak into other views.
+        """
         try:
-            all_values = sheet.get_all_values()
-            
-            if len(all_values) < HEADER_ROW:
-                return pd.DataFrame()
-            
-            # Get headers from row 13 (index 12)
-            headers = all_values[HEADER_ROW - 1]
-            
-            # Clean headers and handle duplicates
-            seen = {}
-            unique_headers = []
-            for header in headers:
-                clean_header = header.strip()
-                if clean_header in seen:
-                    seen[clean_header] += 1
-                    unique_headers.append(f"{clean_header}_{seen[clean_header]}")
-                else:
-                    seen[clean_header] = 0
-                    unique_headers.append(clean_header)
-            
-            # Get data starting from row 14 (index 13)
-            data = all_values[DATA_START_ROW - 1:]
-            
-            # Create DataFrame
-            df = pd.DataFrame(data, columns=unique_headers)
-            
-            # Remove completely empty rows
-            df = df[df.apply(lambda row: row.astype(str).str.strip().any(), axis=1)]
+            entry = self._get_snapshot(sheet)
+            if entry and entry.get('frame') is not None:
+                return entry['frame'].copy()
             
-            # Add actual row numbers for reference (starting from 14)
-            df.insert(0, 'Row#', range(DATA_START_ROW, DATA_START_ROW + len(df)))
+            df = self._calendar_frame(self._sync_values(sheet, HEADER_ROW))
             
             add_log(f"Read {len(df)} bookings from {sheet.title}", "INFO")
-            return df
+            return df.copy()
         except Exception as e:
             add_log(f"Error reading calendar: {str(e)}", "ERROR")
             return pd.DataFrame()
@@ -899,6 +3048,7 @@ class BookingManager:
             
             # Append to sheet
             sheet.append_row(new_row)
+            self.invalidate_sheet(sheet, appended=True)
             
             add_edit_history("Create Booking", {
                 'sheet': sheet.title,
@@ -938,54 +3088,91 @@ class BookingManager:
             add_log(f"Error updating booking: {str(e)}", "ERROR")
             return False
     
+    @staticmethod
+    def _detect_date_format(dates: pd.Series, sample_size: int = 50) -> Optional[str]:
+        """Pick the DATE format that parses most of a sample of the sheet's dates"""
+        sample = dates[dates != ''].head(sample_size)
+        best_format, best_hits = None, 0
+        
+        for fmt in DATE_FORMATS:
+            hits = pd.to_datetime(sample, format=fmt, errors='coerce').notna().sum()
+            if hits > best_hits:
+                best_format, best_hits = fmt, hits
+        
+        return best_format
+    
+    def parse_booking_dates(self, dates: pd.Series) -> pd.Series:
+        """Parse a DATE column with the sheet's detected format, falling back per row only for misses"""
+        dates = dates.astype(str).str.strip()
+        detected = self._detect_date_format(dates)
+        
+        if detected:
+            parsed = pd.to_datetime(dates, format=detected, errors='coerce')
+        else:
+            parsed = pd.Series(pd.NaT, index=dates.index, dtype='datetime64[ns]')
+        
+        for fmt in DATE_FORMATS:
+            missing = parsed.isna() & (dates != '')
+            if not missing.any():
+                break
+            if fmt != detected:
+                parsed[missing] = pd.to_datetime(dates[missing], format=fmt, errors='coerce')
+        
+        return parsed
+    
+    def _build_month_index(self, df: pd.DataFrame) -> Dict[tuple, Dict[str, List[Dict]]]:
+        """Group a calendar's bookings by (year, month) and then by day"""
+        if df.empty or 'DATE' not in df.columns:
+            return {}
+        
+        def column(name):
+            return df[name] if name in df.columns else ''
+        
+        bookings = pd.DataFrame({
+            'row': column('Row#'),
+            'date': df['DATE'].astype(str).str.strip(),
+            'villa': column('VILLA'),
+            'type_clean': column('TYPE CLEAN'),
+            'pax': column('PAX'),
+            'start_time': column('START TIME'),
+            'status': column('RESERVATION STATUS'),
+            'laundry': column('LAUNDRY'),
+            'comments': column('COMMENTS')
+        }, index=df.index)
+        
+        parsed = self.parse_booking_dates(df['DATE'])
+        dated = parsed.notna()
+        bookings, parsed = bookings[dated], parsed[dated]
+        day_keys = parsed.dt.strftime('%Y-%m-%d')
+        
+        month_index = {}
+        for (year, month), month_bookings in bookings.groupby([parsed.dt.year, parsed.dt.month]):
+            month_index[(int(year), int(month))] = {
+                date_key: day_bookings.to_dict('records')
+                for date_key, day_bookings in month_bookings.groupby(day_keys[month_bookings.index])
+            }
+        
+        return month_index
+    
     def get_calendar_data_for_month(self, sheet, year: int, month: int) -> Dict:
-        """Get all bookings for a specific month organized by date"""
+        """Get all bookings for a specific month organized by date
+        
+        The whole sheet is indexed by month once per snapshot, so navigating between
+        months is a dictionary lookup.
+        """
         try:
-            df = self.read_calendar(sheet)
+            entry = self._get_snapshot(sheet)
+            if entry and entry.get('months') is not None:
+                return entry['months'].get((year, month), {})
             
-            if df.empty:
-                return {}
-            
-            calendar_data = {}
+            df = self.read_calendar(sheet)
+            month_index = self._build_month_index(df)
             
-            for _, row in df.iterrows():
-                date_str = str(row.get('DATE', '')).strip()
-                if not date_str:
-                    continue
-                
-                try:
-                    # Try multiple date formats
-                    for fmt in ['%d/%m/%Y', '%m/%d/%Y', '%Y-%m-%d', '%d-%m-%Y']:
-                        try:
-                            booking_date = datetime.strptime(date_str, fmt)
-                            break
-                        except ValueError:
-                            continue
-                    else:
-                        continue
-                    
-                    # Check if booking is in the requested month
-                    if booking_date.year == year and booking_date.month == month:
-                        date_key = booking_date.strftime('%Y-%m-%d')
-                        
-                        if date_key not in calendar_data:
-                            calendar_data[date_key] = []
-                        
-                        calendar_data[date_key].append({
-                            'row': row.get('Row#', ''),
-                            'date': date_str,
-                            'villa': row.get('VILLA', ''),
-                            'type_clean': row.get('TYPE CLEAN', ''),
-                            'pax': row.get('PAX', ''),
-                            'start_time': row.get('START TIME', ''),
-                            'status': row.get('RESERVATION STATUS', ''),
-                            'laundry': row.get('LAUNDRY', ''),
-                            'comments': row.get('COMMENTS', '')
-                        })
-                except Exception as e:
-                    continue
+            entry = self._get_snapshot(sheet)
+            if entry:
+                entry['months'] = month_index
             
-            return calendar_data
+            return month_index.get((year, month), {})
         except Exception as e:
             add_log(f"Error getting calendar data: {str(e)}", "ERROR")
             return {}
@@ -996,6 +3183,7 @@ class BookingManager:
         try:
             old_value = sheet.cell(row, col).value
             sheet.update_cell(row, col, value)
+            self.invalidate_sheet(sheet)
             
             if log_edit:
                 add_edit_history("Cell Update", {
@@ -1012,21 +3200,100 @@ class BookingManager:
             add_log(f"Error updating cell: {str(e)}", "ERROR")
             return False
     
+    @staticmethod
+    def _coalesce_cell_updates(updates: List[Dict]) -> List[Dict]:
+        """Merge single-cell updates into contiguous rectangular blocks
+        
+        Returns blocks as {'row': top, 'col': left, 'values': [[...], ...]}. When the same
+        cell is updated twice the last value wins, matching the old one-by-one writes.
+        """
+        cells = {}
+        for update in updates:
+            cells[(int(update['row']), int(update['col']))] = update['value']
+        
+        # Horizontal runs of adjacent columns within a row
+        runs = []
+        for row, col in sorted(cells):
+            last = runs[-1] if runs else None
+            if last and last['row'] == row and last['col'] + len(last['values'][0]) == col:
+                last['values'][0].append(cells[(row, col)])
+            else:
+                runs.append({'row': row, 'col': col, 'values': [[cells[(row, col)]]]})
+        
+        # Stack runs covering the same columns on consecutive rows
+        blocks = []
+        open_blocks = {}
+        for run in runs:
+            span = (run['col'], len(run['values'][0]))
+            block = open_blocks.get(span)
+            if block and block['row'] + len(block['values']) == run['row']:
+                block['values'].append(run['values'][0])
+            else:
+                blocks.append(run)
+                open_blocks[span] = run
+        return blocks
+    
+    def _write_cell_ranges(self, sheet, updates: List[Dict]) -> int:
+        """Write cell updates as values:batchUpdate requests chunked under the payload limit
+        
+        Returns the number of API requests sent. The sheet's snapshot is invalidated once any
+        request has gone out, even if a later chunk fails, so reads never serve pre-write values.
+        """
+        sheet_prefix = self._quote_title(sheet.title)
+        request_count = 0
+        data = []
+        payload_size = 0
+        attempted = False
+        
+        def flush():
+            nonlocal attempted
+            attempted = True
+            sheet.spreadsheet.values_batch_update({
+                'valueInputOption': 'USER_ENTERED',
+                'data': data
+            })
+        
+        try:
+            for block in self._coalesce_cell_updates(updates):
+                last_row = block['row'] + len(block['values']) - 1
+                last_col = block['col'] + len(block['values'][0]) - 1
+                entry = {
+                    'range': f"{sheet_prefix}!{rowcol_to_a1(block['row'], block['col'])}:{rowcol_to_a1(last_row, last_col)}",
+                    'values': block['values']
+                }
+                entry_size = len(json.dumps(entry, default=str))
+                
+                if data and payload_size + entry_size > WRITE_BATCH_MAX_BYTES:
+                    flush()
+                    request_count += 1
+                    data = []
+                    payload_size = 0
+                
+                data.append(entry)
+                payload_size += entry_size
+            
+            if data:
+                flush()
+                request_count += 1
+        finally:
+            if attempted:
+                self.invalidate_sheet(sheet)
+        
+        return request_count
+    
     def batch_update_cells(self, sheet, updates: List[Dict]) -> bool:
         """Batch update multiple cells at once"""
         try:
             add_log(f"Batch updating {len(updates)} cells in {sheet.title}", "INFO")
             
-            # Group updates by row for efficiency
-            for update in updates:
-                sheet.update_cell(update['row'], update['col'], update['value'])
+            request_count = self._write_cell_ranges(sheet, updates)
             
             add_edit_history("Batch Update", {
                 'sheet': sheet.title,
                 'cell_count': len(updates)
             })
             
-            add_log(f"✅ Batch update completed: {len(updates)} cells", "SUCCESS")
+            add_log(f"✅ Batch update completed: {len(updates)} cells in {request_count} request(s)", "SUCCESS")
             return True
         except Exception as e:
             add_log(f"Error in batch update: {str(e)}", "ERROR")
@@ -1056,6 +3323,7 @@ class BookingManager:
         """Append a new row to the sheet"""
         try:
             sheet.append_row(data)
+            self.invalidate_sheet(sheet, appended=True)
             
             add_edit_history("Row Appended", {
                 'sheet': sheet.title,
@@ -1072,6 +3340,7 @@ class BookingManager:
         """Delete a row from the sheet"""
         try:
             sheet.delete_rows(row_index)
+            self.invalidate_sheet(sheet)
             
             add_edit_history("Row Deleted", {
                 'sheet': sheet.title,
@@ -1087,10 +3356,10 @@ class BookingManager:
     def copy_row(self, sheet, row_index: int) -> List:
         """Copy a row from the sheet"""
         try:
-            all_values = sheet.get_all_values()
+            all_values = self.get_sheet_values(sheet)
             
             if row_index < len(all_values):
-                row_data = all_values[row_index]
+                row_data = list(all_values[row_index])
                 add_log(f"Row {row_index} copied: {len(row_data)} cells", "SUCCESS")
                 return row_data
             else:
@@ -1100,82 +3369,38 @@ class BookingManager:
             add_log(f"Error copying row: {str(e)}", "ERROR")
             return []
     
-    def search_bookings(self, sheet, search_term: str, columns: List[str] = None) -> pd.DataFrame:
-        """Search for bookings matching a term"""
-        try:
-            df = self.read_calendar(sheet)
-            
-            if df.empty:
-                return pd.DataFrame()
-            
-            if columns:
-                search_df = df[columns]
-            else:
-                search_df = df
-            
-            mask = search_df.astype(str).apply(
-                lambda row: row.str.contains(search_term, case=False, na=False).any(), 
-                axis=1
-            )
-            
-            result = df[mask]
-            add_log(f"Search '{search_term}' found {len(result)} results", "INFO")
-            return result
-            
-        except Exception as e:
-            add_log(f"Error searching bookings: {str(e)}", "ERROR")
-            return pd.DataFrame()
-    
-    def get_bookings_by_date_range(self, sheet, start_date: datetime, end_date: datetime, 
-                                   date_column: str = 'Date') -> pd.DataFrame:
-        """Get bookings within a date range"""
-        try:
-            df = self.read_calendar(sheet)
-            
-            if df.empty or date_column not in df.columns:
-                return df
-            
-            df[date_column] = pd.to_datetime(df[date_column], errors='coerce')
-            
-            mask = (df[date_column] >= start_date) & (df[date_column] <= end_date)
-            result = df[mask]
-            
-            add_log(f"Found {len(result)} bookings between {start_date.date()} and {end_date.date()}", "INFO")
-            return result
-            
-        except Exception as e:
-            add_log(f"Error filtering by date range: {str(e)}", "ERROR")
-            return pd.DataFrame()
-
     # Added new BookingManager methods for new features
     def get_all_bookings_combined(self, workbook) -> pd.DataFrame:
         """Get all bookings from all calendar sheets combined"""
         try:
-            calendars = self.get_calendar_sheets(workbook)
-            all_bookings = []
-            
-            for cal in calendars:
-                df = self.read_calendar(cal['sheet'])
-                if not df.empty:
-                    df['calendar_source'] = cal['name']
-                    all_bookings.append(df)
-            
-            if all_bookings:
-                combined = pd.concat(all_bookings, ignore_index=True)
-                add_log(f"Combined {len(combined)} bookings from {len(calendars)} calendars", "SUCCESS")
-                return combined
-            return pd.DataFrame()
+            return self.read_all_bookings(workbook)
         except Exception as e:
             add_log(f"Error combining bookings: {str(e)}", "ERROR")
             return pd.DataFrame()
     
+    def read_all_bookings(self, workbook) -> pd.DataFrame:
+        """Like get_all_bookings_combined, but a workbook that can't be read raises"""
+        frames = self.read_workbook_calendars(workbook)
+        all_bookings = []
+        
+        for name, df in frames.items():
+            if not df.empty:
+                df['calendar_source'] = name
+                all_bookings.append(df)
+        
+        if all_bookings:
+            combined = pd.concat(all_bookings, ignore_index=True)
+            add_log(f"Combined {len(combined)} bookings from {len(frames)} calendars", "SUCCESS")
+            return combined
+        return pd.DataFrame()
+    
     def create_full_booking(self, sheet, booking_data: Dict) -> bool:
         """Create a complete booking with all fields"""
         try:
             add_log(f"Creating full booking in {sheet.title}", "INFO")
             
             # Get current headers to match data structure
-            all_values = sheet.get_all_values()
+            all_values = self.get_sheet_values(sheet)
             if len(all_values) < 12:
                 add_log("Sheet structure invalid for booking creation", "ERROR")
                 return False
@@ -1216,6 +3441,7 @@ class BookingManager:
             
             # Append the booking
             sheet.append_row(row_data)
+            self.invalidate_sheet(sheet, appended=True)
             
             add_edit_history("Create Full Booking", {
                 'sheet': sheet.title,
@@ -1234,16 +3460,14 @@ class BookingManager:
         try:
             add_log(f"Bulk updating {len(updates)} cells in {sheet.title}", "INFO")
             
-            # Group updates by row for efficiency
-            for update in updates:
-                sheet.update_cell(update['row'], update['col'], update['value'])
+            request_count = self._write_cell_ranges(sheet, updates)
             
             add_edit_history("Bulk Update", {
                 'sheet': sheet.title,
                 'cell_count': len(updates)
             })
             
-            add_log(f"✅ Bulk update completed: {len(updates)} cells", "SUCCESS")
+            add_log(f"✅ Bulk update completed: {len(updates)} cells in {request_count} request(s)", "SUCCESS")
             return True
         except Exception as e:
             add_log(f"Error in bulk update: {str(e)}", "ERROR")
@@ -1259,7 +3483,7 @@ class BookingManager:
             # Update date if provided
             if new_date:
                 # Find date column and update
-                all_values = sheet.get_all_values()
+                all_values = self.get_sheet_values(sheet)
                 headers = all_values[11] if len(all_values) > 11 else []
                 for i, header in enumerate(headers):
                     if 'date' in header.lower():
@@ -1284,6 +3508,7 @@ class BookingManager:
         """Delete a booking row"""
         try:
             sheet.delete_rows(row_index)
+            self.invalidate_sheet(sheet)
             
             add_edit_history("Delete Booking", {
                 'sheet': sheet.title,
@@ -1296,56 +3521,82 @@ class BookingManager:
             add_log(f"Error deleting booking: {str(e)}", "ERROR")
             return False
     
-    def search_bookings(self, workbook, search_term: str, search_columns: List[str] = None) -> pd.DataFrame:
-        """Search across all bookings"""
+    def search_bookings(self, workbook, search_term: str, search_columns: List[str] = None,
+                        sheet=None, fuzzy: bool = True) -> pd.DataFrame:
+        """Search a workbook's bookings, or one calendar's, through the full-text index"""
         try:
-            all_bookings = self.get_all_bookings_combined(workbook)
-            
-            if all_bookings.empty:
-                return pd.DataFrame()
-            
-            if search_columns:
-                # Search specific columns
-                mask = False
-                for col in search_columns:
-                    if col in all_bookings.columns:
-                        mask |= all_bookings[col].astype(str).str.contains(search_term, case=False, na=False)
-            else:
-                # Search all columns
-                mask = all_bookings.astype(str).apply(
-                    lambda row: row.str.contains(search_term, case=False, na=False).any(), 
-                    axis=1
-                )
-            
-            results = all_bookings[mask]
-            add_log(f"Search '{search_term}' found {len(results)} results", "SUCCESS")
+            started = time.perf_counter()
+            self.load_workbook_calendars(workbook)
+            results = self._search_index.search(
+                search_term,
+                search_columns,
+                workbook_ids=[workbook.id],
+                sheet_keys=[self._sheet_key(sheet)] if sheet is not None else None,
+                fuzzy=fuzzy
+            )
+            add_log(f"Search '{search_term}' found {len(results)} results in {(time.perf_counter() - started) * 1000:.0f} ms", "SUCCESS")
             return results
             
         except Exception as e:
             add_log(f"Error searching bookings: {str(e)}", "ERROR")
             return pd.DataFrame()
     
-    def get_bookings_by_date_range(self, workbook, start_date: datetime, end_date: datetime) -> pd.DataFrame:
-        """Get bookings within a date range"""
+    def index_portfolio(self, workbooks: List[Dict], max_workers: int = SEARCH_INDEX_MAX_WORKERS) -> int:
+        """Index every listed workbook whose Drive modifiedTime changed since it was last indexed
+        
+        Unchanged workbooks cost no API calls; stale ones are read in parallel through the
+        snapshot cache. Returns the number of workbooks read.
+        """
+        self.prune_index(wb['id'] for wb in workbooks)
+        stale = self._search_index.stale(workbooks)
+        if not stale:
+            return 0
+        
+        add_log(f"Indexing {len(stale)} workbook(s) for search", "INFO")
+        ctx = get_script_run_ctx()
+        
+        def index_workbook(wb: Dict) -> Dict:
+            add_script_run_ctx(threading.current_thread(), ctx)
+            self.read_workbook_calendars(self.get_workbook(wb['id']))
+            return wb
+        
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {executor.submit(index_workbook, wb): wb for wb in stale}
+            for future in as_completed(futures):
+                try:
+                    wb = future.result()
+                    self._search_index.mark_indexed(wb['id'], wb.get('modified'))
+                except Exception as e:
+                    add_log(f"Could not index workbook {futures[future]['name']}: {str(e)}", "ERROR")
+        
+        return len(stale)
+    
+    def prune_index(self, listed_ids) -> int:
+        """Drop search documents of workbooks no longer in the listing; returns how many were dropped"""
+        return self._search_index.prune(listed_ids)
+    
+    def search_stats(self) -> Dict:
+        """Size of the search index: bookings, terms, calendars and workbooks"""
+        return self._search_index.stats()
+    
+    def search_portfolio(self, workbooks: List[Dict], search_term: str, search_columns: List[str] = None,
+                         fuzzy: bool = True) -> pd.DataFrame:
+        """Search bookings across every listed workbook"""
+        try:
+            self.index_portfolio(workbooks)
+            started = time.perf_counter()
+            results = self._search_index.search(search_term, search_columns, fuzzy=fuzzy)
+            add_log(f"Portfolio search '{search_term}' found {len(results)} results in {(time.perf_counter() - started) * 1000:.0f} ms", "SUCCESS")
+            return results
+        except Exception as e:
+            add_log(f"Error searching portfolio: {str(e)}", "ERROR")
+            return pd.DataFrame()
+    
+    def get_bookings_by_date_range(self, workbook, start_date: datetime, end_date: datetime,
+                                   sheet=None) -> pd.DataFrame:
+        """Get a workbook's (or one calendar's) bookings dated within a range, from its date index"""
         try:
-            all_bookings = self.get_all_bookings_combined(workbook)
-            
-            if all_bookings.empty:
-                return pd.DataFrame()
-            
-            # Find date columns
-            date_cols = [col for col in all_bookings.columns if 'date' in col.lower()]
-            
-            if not date_cols:
-                return all_bookings
-            
-            # Filter by date range
-            date_col = date_cols[0]
-            all_bookings[date_col] = pd.to_datetime(all_bookings[date_col], errors='coerce')
-            
-            mask = (all_bookings[date_col] >= start_date) & (all_bookings[date_col] <= end_date)
-            results = all_bookings[mask]
-            
+            results = self.get_date_index(workbook, sheet).between(start_date, end_date)
             add_log(f"Found {len(results)} bookings between {start_date.date()} and {end_date.date()}", "SUCCESS")
             return results
             
@@ -1419,8 +3670,14 @@ def authenticate():
                         st.success("✅ Successfully connected to Google Sheets!")
                         st.info(f"📧 Service Account: {st.session_state.service_account_email}")
                         
-                        with st.spinner(f"Scanning folder for spreadsheets..."):
-                            st.session_state.workbooks = manager.list_workbooks_from_folder(DRIVE_FOLDER_ID)
+                        # Start from the last known listing and catch up on Drive changes in the background
+                        cached_workbooks = get_local_store().load_workbooks(manager.account, DRIVE_FOLDER_ID)
+                        if cached_workbooks:
+                            st.session_state.workbooks = cached_workbooks
+                            st.session_state.workbooks_refresh = start_workbook_refresh(manager)
+                        else:
+                            with st.spinner(f"Scanning folder for spreadsheets..."):
+                                st.session_state.workbooks = manager.refresh_workbooks(DRIVE_FOLDER_ID)
                         
                         if len(st.session_state.workbooks) > 0:
                             st.success(f"✅ Found {len(st.session_state.workbooks)} spreadsheet(s)!")
@@ -1440,6 +3697,8 @@ def render_dashboard(manager, workbook):
     """Render enhanced dashboard view with interactive cards"""
     st.markdown('<div class="section-header">📊 Interactive Dashboard</div>', unsafe_allow_html=True)
     
+    # One batched read primes the client profile and every calendar
+    frames = manager.load_workbook_calendars(workbook)
     profile = manager.get_client_profile(workbook)
     calendars = manager.get_calendar_sheets(workbook)
     
@@ -1466,12 +3725,13 @@ def render_dashboard(manager, workbook):
     
     # Quick stats with enhanced metrics
     total_bookings = 0
-    upcoming_bookings = 0
     today = datetime.now().date()
+    date_index = manager.get_date_index(workbook)
+    upcoming_bookings = date_index.count_from(today)
     status_counts = {}
     
     for cal in calendars:
-        df = manager.read_calendar(cal['sheet'])
+        df = frames.get(cal['name'], pd.DataFrame())
         if not df.empty:
             total_bookings += len(df)
             
@@ -1480,11 +3740,6 @@ def render_dashboard(manager, workbook):
                 if 'status' in col.lower() or 'code' in col.lower():
                     for status in df[col]:
                         status_counts[status] = status_counts.get(status, 0) + 1
-            
-            for col in df.columns:
-                if 'date' in col.lower():
-                    dates = pd.to_datetime(df[col], errors='coerce')
-                    upcoming_bookings += (dates >= pd.Timestamp(today)).sum()
     
     col1, col2, col3, col4, col5 = st.columns(5)
     
@@ -1508,7 +3763,7 @@ def render_dashboard(manager, workbook):
         st.markdown(f"""
         <div class="metric-card">
             <h4 style="color: #f093fb;">✏️ Edits Today</h4>
-            <h2>{len([e for e in st.session_state.edit_history if e['timestamp'].startswith(today.strftime('%Y-%m-%d'))])}</h2>
+            <h2>{get_audit_store().count(today.strftime('%Y-%m-%d'))}</h2>
         </div>
         """, unsafe_allow_html=True)
     
@@ -1524,7 +3779,7 @@ def render_dashboard(manager, workbook):
         st.markdown(f"""
         <div class="metric-card">
             <h4 style="color: #e91e63;">💾 Backups</h4>
-            <h2>{len(st.session_state.backup_history)}</h2>
+            <h2>{get_backup_store().count()}</h2>
         </div>
         """, unsafe_allow_html=True)
     
@@ -1538,6 +3793,15 @@ def render_dashboard(manager, workbook):
                      color_discrete_sequence=px.colors.qualitative.Set3)
         st.plotly_chart(fig, use_container_width=True)
     
+    next_bookings = date_index.next(5)
+    if not next_bookings.empty:
+        st.markdown("### ⏭️ Next Bookings")
+        st.dataframe(
+            next_bookings.reindex(columns=['booking_date', 'calendar_source', 'VILLA', 'TYPE CLEAN', 'START TIME', 'RESERVATION STATUS']),
+            use_container_width=True,
+            hide_index=True
+        )
+    
     st.markdown("### 🏘️ Property Portfolio - Click to View Details")
     
     if profile.get('properties'):
@@ -1572,7 +3836,7 @@ def render_dashboard(manager, workbook):
     
     for idx, cal in enumerate(calendars):
         with cal_cols[idx % 4]:
-            df = manager.read_calendar(cal['sheet'])
+            df = frames.get(cal['name'], pd.DataFrame())
             booking_count = len(df) if not df.empty else 0
             
             st.markdown(f"""
@@ -1596,14 +3860,13 @@ def render_dashboard(manager, workbook):
     # Recent activity with enhanced display
     st.markdown("### 📊 Recent Activity")
     
-    if st.session_state.edit_history:
-        recent_edits = st.session_state.edit_history[-10:]
-        
-        for edit in reversed(recent_edits):
+    recent_edits = get_audit_store().recent(10)
+    if recent_edits:
+        for edit in recent_edits:
             st.markdown(f"""
             <div class="log-entry log-success">
-                <strong>[{edit['timestamp']}]</strong> {edit['action']} by {edit['user'][:30]}...
-                <br><small>{str(edit['details'])[:100]}...</small>
+                <strong>[{edit['timestamp']}]</strong> {edit['action']} by {str(edit['user'])[:30]}...
+                <br><small>{edit['details'][:100]}...</small>
             </div>
             """, unsafe_allow_html=True)
     else:
@@ -2268,64 +4531,55 @@ def render_calendar_view(manager, workbook):
         st.warning("No calendars found")
         return
     
-    selected_calendar = st.selectbox("Select Calendar", [cal['name'] for cal in calendars])
-    selected_cal = next((cal for cal in calendars if cal['name'] == selected_calendar), None)
+    col1, col2 = st.columns([2, 1])
     
-    if selected_cal:
-        sheet = selected_cal['sheet']
-        df = manager.read_calendar(sheet)
+    with col1:
+        selected_calendar = st.selectbox("Select Calendar", [cal['name'] for cal in calendars])
+        selected_cal = next((cal for cal in calendars if cal['name'] == selected_calendar), None)
+    
+    with col2:
+        scope = st.selectbox("Show", ["This calendar", "This workbook", "All workbooks"], key="calendar_view_scope")
+    
+    # Date range selector
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        start_date = st.date_input("Start Date", datetime.now().date())
+    
+    with col2:
+        end_date = st.date_input("End Date", datetime.now().date() + timedelta(days=30))
+    
+    # Range queries are binary searches over the in-memory date index
+    start = datetime.combine(start_date, datetime.min.time())
+    end = datetime.combine(end_date, datetime.max.time())
+    if scope == "All workbooks":
+        filtered_df = manager.get_portfolio_date_index(st.session_state.workbooks).between(start, end)
+    else:
+        filtered_df = manager.get_bookings_by_date_range(
+            workbook,
+            start,
+            end,
+            sheet=selected_cal['sheet'] if scope == "This calendar" and selected_cal else None
+        )
+    
+    if not filtered_df.empty:
+        st.markdown(f"### Bookings: {start_date} to {end_date}")
+        st.markdown(f"**Total:** {len(filtered_df)} bookings")
         
-        if not df.empty:
-            # Find date column
-            date_col = None
-            for col in df.columns:
-                if 'date' in col.lower():
-                    date_col = col
-                    break
-            
-            if date_col:
-                # Date range selector
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    start_date = st.date_input("Start Date", datetime.now().date())
-                
-                with col2:
-                    end_date = st.date_input("End Date", datetime.now().date() + timedelta(days=30))
-                
-                # Filter bookings by date range
-                filtered_df = manager.get_bookings_by_date_range(
-                    sheet, 
-                    datetime.combine(start_date, datetime.min.time()),
-                    datetime.combine(end_date, datetime.max.time()),
-                    date_col
-                )
-                
-                if not filtered_df.empty:
-                    st.markdown(f"### Bookings: {start_date} to {end_date}")
-                    st.markdown(f"**Total:** {len(filtered_df)} bookings")
-                    
-                    # Create timeline visualization
-                    if date_col in filtered_df.columns:
-                        filtered_df[date_col] = pd.to_datetime(filtered_df[date_col], errors='coerce')
-                        
-                        # Group by date
-                        daily_counts = filtered_df.groupby(filtered_df[date_col].dt.date).size().reset_index()
-                        daily_counts.columns = ['Date', 'Bookings']
-                        
-                        fig = px.bar(daily_counts, x='Date', y='Bookings',
-                                    title='Daily Booking Count',
-                                    color='Bookings',
-                                    color_continuous_scale='Blues')
-                        st.plotly_chart(fig, use_container_width=True)
-                    
-                    # Display bookings
-                    st.dataframe(filtered_df, use_container_width=True)
-                else:
-                    st.info("No bookings in selected date range")
-            else:
-                st.warning("No date column found in this calendar")
-                st.dataframe(df, use_container_width=True)
+        # Create timeline visualization
+        daily_counts = filtered_df.groupby(filtered_df['booking_date'].dt.date).size().reset_index()
+        daily_counts.columns = ['Date', 'Bookings']
+        
+        fig = px.bar(daily_counts, x='Date', y='Bookings',
+                    title='Daily Booking Count',
+                    color='Bookings',
+                    color_continuous_scale='Blues')
+        st.plotly_chart(fig, use_container_width=True)
+        
+        # Display bookings
+        st.dataframe(filtered_df, use_container_width=True)
+    else:
+        st.info("No bookings in selected date range")
 
 # Modal for editing booking
 def render_edit_booking_modal(manager):
@@ -2384,7 +4638,7 @@ def render_email_center(manager):
     """Render email management center"""
     st.markdown('<div class="section-header">📧 Email Center</div>', unsafe_allow_html=True)
     
-    tab1, tab2, tab3 = st.tabs(["⚙️ Configuration", "📤 Send Email", "📊 Email Log"])
+    tab1, tab2, tab_campaign, tab3 = st.tabs(["⚙️ Configuration", "📤 Send Email", "📣 Campaign", "📊 Email Log"])
     
     with tab1:
         st.markdown("### Email Configuration")
@@ -2472,10 +4726,9 @@ def render_email_center(manager):
                                 profile.get('client_name', 'Unknown'), 
                                 df
                             ):
-                                st.success("✅ Email sent successfully!")
-                                st.balloons()
+                                st.success("📤 Booking summary queued for delivery - check the Email Log for status")
                             else:
-                                st.error("❌ Failed to send email")
+                                st.error("❌ Failed to queue email")
             else:
                 st.info("👈 Select a workbook first")
         
@@ -2498,9 +4751,77 @@ def render_email_center(manager):
                         attachment_name = attachment.name
                     
                     if EmailManager.send_email(recipient, subject, body, attachment_data, attachment_name):
-                        st.success("✅ Email sent!")
+                        st.success("📤 Email queued for delivery")
                     else:
-                        st.error("❌ Failed to send")
+                        st.error("❌ Failed to queue email")
+    
+    with tab_campaign:
+        st.markdown("### Bulk Booking Summaries")
+        
+        if not st.session_state.workbooks:
+            st.info("No workbooks loaded - refresh the workbook list first")
+        else:
+            recipients_df = pd.DataFrame([
+                {
+                    'Send': bool(st.session_state.campaign_recipients.get(wb['id'])),
+                    'Client': wb['name'],
+                    'Email': st.session_state.campaign_recipients.get(wb['id'], ''),
+                    'Workbook ID': wb['id']
+                }
+                for wb in st.session_state.workbooks
+            ])
+            
+            edited = st.data_editor(
+                recipients_df,
+                disabled=['Client', 'Workbook ID'],
+                hide_index=True,
+                use_container_width=True,
+                key="campaign_recipients_editor"
+            )
+            
+            # A cleared cell comes back as None or NaN
+            edited['Email'] = edited['Email'].fillna('').astype(str).str.strip()
+            recipients = {
+                row['Workbook ID']: row['Email']
+                for _, row in edited.iterrows()
+                if row['Email']
+            }
+            for workbook_id in st.session_state.campaign_recipients.keys() - recipients.keys():
+                get_local_store().delete_item('campaign_recipients', workbook_id)
+            for workbook_id, email in recipients.items():
+                if st.session_state.campaign_recipients.get(workbook_id) != email:
+                    get_local_store().save_item('campaign_recipients', workbook_id, email)
+            st.session_state.campaign_recipients = recipients
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                attachment_format = st.radio("Attachment", ["csv", "xlsx"], horizontal=True)
+            with col2:
+                max_workers = st.slider("Workbooks read in parallel", 1, 8, CAMPAIGN_MAX_WORKERS)
+            
+            selected = [
+                {'workbook_id': row['Workbook ID'], 'workbook_name': row['Client'], 'email': row['Email']}
+                for _, row in edited.iterrows()
+                if row['Send'] and row['Email']
+            ]
+            
+            if st.button(f"📣 Send to {len(selected)} recipient(s)", type="primary", disabled=not selected):
+                with st.spinner("Preparing summaries..."):
+                    st.session_state.last_campaign_id = EmailManager.send_booking_campaign(
+                        manager, selected, attachment_format, max_workers
+                    )
+                st.success(f"📤 Campaign {st.session_state.last_campaign_id} queued")
+            
+            campaign_id = st.session_state.get('last_campaign_id')
+            if campaign_id:
+                campaign_logs = [log for log in st.session_state.email_logs if log.get('campaign_id') == campaign_id]
+                if campaign_logs:
+                    st.markdown(f"#### Campaign {campaign_id}")
+                    status_counts = pd.Series([log['status'].split(':')[0] for log in campaign_logs]).value_counts()
+                    status_cols = st.columns(len(status_counts))
+                    for status_col, (status, count) in zip(status_cols, status_counts.items()):
+                        status_col.metric(status, count)
+                    st.dataframe(pd.DataFrame(campaign_logs)[['to', 'subject', 'status']], use_container_width=True)
     
     with tab3:
         st.markdown("### Email Log")
@@ -2532,47 +4853,64 @@ def render_search_analytics(manager, workbook):
     tab1, tab2, tab3 = st.tabs(["🔍 Advanced Search", "📊 Analytics Dashboard", "📈 Trends"])
     
     with tab1:
-        selected_calendar = st.selectbox("Calendar", [cal['name'] for cal in calendars])
-        selected_cal = next((cal for cal in calendars if cal['name'] == selected_calendar), None)
+        col1, col2 = st.columns([2, 1])
         
-        if selected_cal:
-            sheet = selected_cal['sheet']
-            df = manager.read_calendar(sheet)
-            
-            if not df.empty:
-                col1, col2 = st.columns([2, 1])
-                
-                with col1:
-                    search_term = st.text_input("🔍 Search", placeholder="Enter search term...")
-                
-                with col2:
-                    search_columns = st.multiselect("Search in columns", df.columns.tolist())
+        with col1:
+            search_term = st.text_input("🔍 Search", placeholder="Villa, status, clean type, comment...")
+        
+        with col2:
+            search_scope = st.selectbox("Scope", ["This calendar", "This workbook", "All workbooks"])
+        
+        col1, col2, col3 = st.columns([2, 1, 1])
+        
+        with col1:
+            search_columns = st.multiselect("Search in fields", SEARCH_FIELDS)
+        
+        with col2:
+            selected_calendar = st.selectbox("Calendar", [cal['name'] for cal in calendars],
+                                             disabled=search_scope != "This calendar")
+            selected_cal = next((cal for cal in calendars if cal['name'] == selected_calendar), None)
+        
+        with col3:
+            fuzzy = st.checkbox("Match typos", value=True)
+        
+        if st.button("🔍 Search", type="primary"):
+            if search_term:
+                if search_scope == "All workbooks":
+                    result = manager.search_portfolio(
+                        st.session_state.workbooks,
+                        search_term,
+                        search_columns if search_columns else None,
+                        fuzzy=fuzzy
+                    )
+                else:
+                    result = manager.search_bookings(
+                        workbook,
+                        search_term,
+                        search_columns if search_columns else None,
+                        sheet=selected_cal['sheet'] if search_scope == "This calendar" and selected_cal else None,
+                        fuzzy=fuzzy
+                    )
                 
-                if st.button("🔍 Search", type="primary"):
-                    if search_term:
-                        result = manager.search_bookings(
-                            sheet,
-                            search_term,
-                            search_columns if search_columns else None
-                        )
-                        
-                        if not result.empty:
-                            st.success(f"✅ Found {len(result)} matching records")
-                            st.dataframe(result, use_container_width=True)
-                            
-                            csv = result.to_csv(index=False)
-                            st.download_button(
-                                "📥 Download Results",
-                                data=csv,
-                                file_name=f"search_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                                mime="text/csv"
-                            )
-                        else:
-                            st.warning("No results found")
-                    else:
-                        st.warning("Please enter a search term")
+                if not result.empty:
+                    st.success(f"✅ Found {len(result)} matching records")
+                    st.dataframe(result, use_container_width=True)
+                    
+                    csv = result.to_csv(index=False)
+                    st.download_button(
+                        "📥 Download Results",
+                        data=csv,
+                        file_name=f"search_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                        mime="text/csv"
+                    )
+                else:
+                    st.warning("No results found")
             else:
-                st.info("No data available")
+                st.warning("Please enter a search term")
+        
+        stats = manager.search_stats()
+        st.caption(f"Search index: {stats['bookings']} bookings, {stats['terms']} terms "
+                   f"across {stats['sheets']} calendar(s) in {stats['workbooks']} workbook(s)")
     
     with tab2:
         st.markdown("### 📊 Analytics Dashboard")
@@ -2696,6 +5034,7 @@ def render_templates(manager):
                     with col1:
                         if st.button(f"🗑️ Delete", key=f"del_{template['id']}"):
                             st.session_state.templates = [t for t in st.session_state.templates if t['id'] != template['id']]
+                            get_local_store().delete_item('templates', template['id'])
                             st.success("✅ Template deleted")
                             st.rerun()
                     
@@ -2755,6 +5094,45 @@ def render_backup_restore(manager, workbook):
     else:
         st.warning("⚠️ Auto-backup is disabled - you'll need to create backups manually")
     
+    st.markdown("### ⏰ Scheduled Backups")
+    scheduler = get_backup_scheduler()
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        interval = st.number_input(
+            "Back up every (minutes)",
+            min_value=5,
+            max_value=1440,
+            value=scheduler.interval_minutes,
+            step=5
+        )
+        
+        if scheduler.is_running():
+            if interval != scheduler.interval_minutes:
+                scheduler.start(manager.clients, DRIVE_FOLDER_ID, interval)
+            if st.button("⏹️ Stop Scheduled Backups", use_container_width=True):
+                scheduler.stop()
+                add_log("Scheduled backups stopped", "INFO")
+                st.rerun()
+        else:
+            if st.button("▶️ Start Scheduled Backups", type="primary", use_container_width=True):
+                scheduler.start(manager.clients, DRIVE_FOLDER_ID, interval)
+                add_log(f"Scheduled backups started: every {interval} minute(s)", "SUCCESS")
+                st.rerun()
+    
+    with col2:
+        status = scheduler.status
+        st.markdown(f"""
+        <div class="info-box">
+            <p><strong>Status:</strong> {"🟢 Running" if scheduler.is_running() else "⚪ Stopped"}</p>
+            <p><strong>Last run:</strong> {status['last_run'] or 'Never'}</p>
+            <p><strong>Next run:</strong> {status['next_run'] or '-'}</p>
+            <p><strong>Last pass:</strong> {status['workbooks_backed_up']} workbook(s), {status['sheets_backed_up']} sheet(s) backed up, {status['workbooks_skipped']} unchanged, {status.get('workbooks_failed', 0)} failed</p>
+        </div>
+        """, unsafe_allow_html=True)
+        if status['last_error']:
+            st.error(f"Last pass failed: {status['last_error']}")
+    
     st.markdown("---")
     
     tab1, tab2 = st.tabs(["💾 Create Backup", "↩️ Restore Backup"])
@@ -2776,7 +5154,9 @@ def render_backup_restore(manager, workbook):
                             'timestamp': backup['timestamp'],
                             'sheet': backup['sheet'],
                             'rows': backup['row_count'],
-                            'columns': backup['col_count']
+                            'columns': backup['col_count'],
+                            'stored_as': backup['kind'],
+                            'changed_cells': backup['changed_cells']
                         })
                     else:
                         st.error("❌ Backup failed")
@@ -2786,11 +5166,13 @@ def render_backup_restore(manager, workbook):
     with tab2:
         st.markdown("### Restore from Backup")
         
-        if st.session_state.backup_history:
-            st.markdown(f"**{len(st.session_state.backup_history)} backups available**")
+        backups = get_backup_store().list_backups()
+        
+        if backups:
+            st.markdown(f"**{len(backups)} backups available** ({get_backup_store().disk_usage() / 1024:.1f} KB on disk)")
             
-            for idx, backup in enumerate(reversed(st.session_state.backup_history)):
-                with st.expander(f"💾 Backup #{len(st.session_state.backup_history) - idx} - {backup['timestamp']}"):
+            for idx, backup in enumerate(backups):
+                with st.expander(f"💾 Backup #{backup['id']} - {backup['sheet']} - {backup['timestamp']}"):
                     col1, col2 = st.columns(2)
                     
                     with col1:
@@ -2800,28 +5182,37 @@ def render_backup_restore(manager, workbook):
                     with col2:
                         st.markdown(f"**Rows:** {backup['row_count']}")
                         st.markdown(f"**Columns:** {backup['col_count']}")
+                        st.markdown(f"**Stored as:** {backup['kind']} ({backup['changed_cells']} cells)")
+                    
+                    if st.button("🔍 Preview Changes", key=f"preview_{idx}"):
+                        with st.spinner("Comparing with current sheet..."):
+                            changes = preview_restore(backup, manager)
+                        if changes.empty:
+                            st.info("Sheet already matches this backup")
+                        else:
+                            st.markdown(f"**{len(changes)} cell(s) would change**")
+                            st.dataframe(changes.head(500), use_container_width=True, hide_index=True)
                     
-                    st.warning("⚠️ Restoring will overwrite current data!")
+                    st.warning("⚠️ Restoring will overwrite the cells that differ from this backup!")
                     
-                    if st.button(f"↩️ Restore This Backup", key=f"restore_{idx}"):
-                        confirm = st.checkbox(f"I confirm restoration", key=f"confirm_{idx}")
-                        if confirm:
-                            with st.spinner("Restoring backup..."):
-                                if restore_backup(backup, manager):
-                                    st.success("✅ Backup restored successfully!")
-                                    st.balloons()
-                                else:
-                                    st.error("❌ Restore failed")
+                    confirm = st.checkbox("I confirm restoration", key=f"confirm_{idx}")
+                    if st.button(f"↩️ Restore This Backup", key=f"restore_{idx}", disabled=not confirm):
+                        with st.spinner("Restoring backup..."):
+                            if restore_backup(backup, manager):
+                                st.success("✅ Backup restored successfully!")
+                                st.balloons()
+                            else:
+                                st.error("❌ Restore failed")
         else:
             st.info("No backups available yet. Create your first backup in the 'Create Backup' tab!")
         
         st.markdown("---")
         
-        if st.session_state.backup_history:
+        if backups:
             if st.button("🗑️ Clear All Backups", type="secondary"):
                 confirm_clear = st.checkbox("I confirm clearing all backups")
                 if confirm_clear:
-                    st.session_state.backup_history = []
+                    get_backup_store().clear()
                     st.success("✅ All backups cleared")
                     st.rerun()
 
@@ -2829,47 +5220,57 @@ def render_edit_history():
     """Render edit history log"""
     st.markdown('<div class="section-header">📜 Edit History</div>', unsafe_allow_html=True)
     
-    if not st.session_state.edit_history:
+    total_edits = get_audit_store().count()
+    if not total_edits:
         st.info("No edit history available")
         return
     
     # Filter options
-    col1, col2, col3 = st.columns(3)
+    col1, col2, col3, col4, col5 = st.columns([2, 1, 1, 1, 1])
+    
+    actions = get_audit_store().actions()
     
     with col1:
-        filter_action = st.multiselect(
-            "Filter by Action",
-            list(set([e['action'] for e in st.session_state.edit_history])),
-            default=list(set([e['action'] for e in st.session_state.edit_history]))
-        )
+        filter_action = st.multiselect("Filter by Action", actions, default=actions)
     
     with col2:
         date_filter = st.date_input("Filter by Date", datetime.now().date())
     
+    day = date_filter.strftime('%Y-%m-%d')
+    activity = get_audit_store().sheet_activity(day)
+    
     with col3:
+        sheet_filter = st.selectbox("Filter by Sheet", ["All sheets"] + list(activity.index))
+    
+    with col4:
+        search_text = st.text_input("Search details", placeholder="Value, row...")
+    
+    with col5:
         if st.button("🗑️ Clear History", type="secondary"):
-            st.session_state.edit_history = []
+            get_audit_store().clear()
             st.rerun()
     
-    # Display filtered history
-    filtered_history = [
-        e for e in st.session_state.edit_history 
-        if e['action'] in filter_action and e['timestamp'].startswith(date_filter.strftime('%Y-%m-%d'))
-    ]
+    # Filtering and paging run in the audit store; only the visible page is fetched
+    sheet = None if sheet_filter == "All sheets" else sheet_filter
+    _, matched = get_audit_store().query(filter_action, day, sheet, search_text, limit=0)
+    offset = render_page_selector(matched, "edit_history_page")
+    page, matched = get_audit_store().query(filter_action, day, sheet, search_text, offset=offset)
     
-    st.markdown(f"### Showing {len(filtered_history)} of {len(st.session_state.edit_history)} edits")
+    st.markdown(f"### Showing {offset + 1 if page else 0}-{offset + len(page)} of {matched} matching edits ({total_edits} total)")
+    
+    st.dataframe(
+        pd.DataFrame(page, columns=AuditStore.COLUMNS).drop(columns=['id']),
+        use_container_width=True,
+        hide_index=True
+    )
     
-    for idx, edit in enumerate(reversed(filtered_history)):
-        with st.expander(f"Edit #{len(filtered_history) - idx} - {edit['timestamp']} - {edit['action']}"):
-            st.markdown(f"**User:** {edit['user']}")
-            st.markdown(f"**Action:** {edit['action']}")
-            st.markdown(f"**Timestamp:** {edit['timestamp']}")
-            st.markdown("**Details:**")
-            st.json(edit['details'])
+    if not activity.empty:
+        with st.expander(f"📊 Sheet activity on {day}"):
+            st.dataframe(activity, use_container_width=True)
     
     # Export history
     if st.button("📥 Export Edit History"):
-        df_history = pd.DataFrame(st.session_state.edit_history)
+        df_history = get_audit_store().to_frame()
         csv = df_history.to_csv(index=False)
         st.download_button(
             "Download CSV",
@@ -2887,7 +5288,7 @@ def render_system_logs():
         return
     
     # Filter options
-    col1, col2, col3 = st.columns([2, 1, 1])
+    col1, col2, col3, col4 = st.columns([2, 2, 1, 1])
     
     with col1:
         filter_level = st.multiselect(
@@ -2897,34 +5298,39 @@ def render_system_logs():
         )
     
     with col2:
-        log_limit = st.number_input("Show Last N Logs", min_value=10, max_value=500, value=100)
+        search_text = st.text_input("Search messages", placeholder="Type to filter...")
     
     with col3:
+        time_window = st.selectbox("Time", list(LOG_TIME_WINDOWS))
+    
+    with col4:
         if st.button("🗑️ Clear Logs"):
-            st.session_state.logs = []
+            st.session_state.logs.clear()
             st.rerun()
     
-    # Display filtered logs
-    filtered_logs = [log for log in st.session_state.logs if log['level'] in filter_level]
-    displayed_logs = filtered_logs[-log_limit:]
-    
-    st.markdown(f"### Showing {len(displayed_logs)} of {len(st.session_state.logs)} logs")
-    
-    for log in reversed(displayed_logs):
-        level_class = f"log-{log['level'].lower()}"
-        st.markdown(
-            f'<div class="log-entry {level_class}">'
-            f'<strong>[{log["timestamp"]}]</strong> '
-            f'<span style="color: #666;">[{log["level"]}]</span> '
-            f'{log["message"]}'
-            f'</div>',
-            unsafe_allow_html=True
-        )
+    minutes = LOG_TIME_WINDOWS[time_window]
+    since = (datetime.now() - timedelta(minutes=minutes)).strftime("%Y-%m-%d %H:%M:%S") if minutes else None
+    
+    # Fetch the page the picker is on together with the match count, re-reading only if
+    # the filters shrank the results below that page
+    requested = (st.session_state.get("system_logs_page", 1) - 1) * LOG_PAGE_SIZE
+    page, matched = st.session_state.logs.query(filter_level, search_text, since, offset=requested)
+    offset = render_page_selector(matched, "system_logs_page")
+    if offset != requested:
+        page, matched = st.session_state.logs.query(filter_level, search_text, since, offset=offset)
+    
+    st.markdown(f"### Showing {offset + 1 if page else 0}-{offset + len(page)} of {matched} matching logs ({len(st.session_state.logs)} total)")
+    
+    st.dataframe(
+        pd.DataFrame(page, columns=LogRecord._fields).drop(columns=['seq']),
+        use_container_width=True,
+        hide_index=True
+    )
     
     # Export logs
     st.markdown("---")
     if st.button("📥 Export System Logs"):
-        df_logs = pd.DataFrame(st.session_state.logs)
+        df_logs = st.session_state.logs.to_frame()
         csv = df_logs.to_csv(index=False)
         st.download_button(
             "Download CSV",
@@ -3081,9 +5487,9 @@ def render_full_booking_creator(manager, workbook):
                     """
                     
                     if EmailManager.send_email(guest_email, subject, body):
-                        st.success("✅ Booking created and confirmation email sent!")
+                        st.success("✅ Booking created and confirmation email queued!")
                     else:
-                        st.warning("⚠️ Booking created but email failed to send")
+                        st.warning("⚠️ Booking created but email could not be queued")
                 else:
                     st.warning("⚠️ No email address provided")
 
@@ -3125,10 +5531,9 @@ def render_interactive_calendar_grid(manager, workbook):
 
     # Fetch bookings from all calendars for the range
     all_bookings_for_range = pd.DataFrame()
-    calendars = manager.get_calendar_sheets(workbook)
-    if calendars:
-        for cal in calendars:
-            df = manager.read_calendar(cal['sheet'])
+    frames = manager.load_workbook_calendars(workbook)
+    if frames:
+        for df in frames.values():
             if not df.empty:
                 # Ensure date column exists and is in datetime format
                 date_cols = [col for col in df.columns if 'date' in col.lower()]
@@ -3296,15 +5701,16 @@ def render_advanced_bulk_editor(manager, workbook):
         if st.button("✅ Apply Find & Replace", type="primary"):
             if find_text:
                 updates = []
+                sheet_columns = [col for col in df.columns if col != 'Row#']
                 
-                for row_idx, row in df.iterrows():
-                    for col_idx, col_name in enumerate(df.columns):
+                for _, row in df.iterrows():
+                    for col_idx, col_name in enumerate(sheet_columns):
                         if target_column == 'All Columns' or col_name == target_column:
                             cell_value = str(row[col_name])
                             if find_text in cell_value:
                                 new_value = cell_value.replace(find_text, replace_text)
                                 updates.append({
-                                    'row': row_idx + 13,  # Adjust for header rows
+                                    'row': int(row['Row#']),
                                     'col': col_idx + 1,
                                     'value': new_value
                                 })
@@ -3346,6 +5752,7 @@ def render_advanced_bulk_editor(manager, workbook):
                     # Delete rows (from end to start to maintain indices)
                     for row in range(delete_end, delete_start - 1, -1):
                         sheet.delete_rows(row)
+                    manager.invalidate_sheet(sheet)
                     
                     st.success(f"✅ Deleted rows {delete_start} to {delete_end}!")
                     st.rerun()
@@ -3413,6 +5820,16 @@ def main_app():
     
     st.markdown('<div class="main-header">🏠 Booking Management Dashboard</div>', unsafe_allow_html=True)
     
+    EmailManager.collect_results()
+    
+    # Swap in the listing refreshed in the background once the worker has finished
+    refresh = st.session_state.get('workbooks_refresh')
+    if refresh is not None and refresh.done():
+        st.session_state.workbooks_refresh = None
+        workbooks = refresh.result()
+        if workbooks:
+            st.session_state.workbooks = workbooks
+    
     # Sidebar
     with st.sidebar:
         st.header("🗂️ Workbook Selection")
@@ -3425,7 +5842,7 @@ def main_app():
         with col1:
             if st.button("🔄 Refresh", use_container_width=True):
                 with st.spinner("Refreshing..."):
-                    st.session_state.workbooks = manager.list_workbooks_from_folder(DRIVE_FOLDER_ID)
+                    st.session_state.workbooks = manager.refresh_workbooks(DRIVE_FOLDER_ID)
                 st.rerun()
         
         with col2:
@@ -3505,6 +5922,8 @@ def main_app():
 
 # Main entry point
 if __name__ == "__main__":
+    warm_session_state()
+    
     if not st.session_state.authenticated:
         authenticate()
     else:
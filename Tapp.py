@@ -1,5 +1,6 @@
 import streamlit as st
 import gspread
+from gspread.utils import rowcol_to_a1
 from google.oauth2.service_account import Credentials
 import pandas as pd
 from datetime import datetime, timedelta
@@ -16,6 +17,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Keep each values:batchUpdate request comfortably under the Sheets API payload limit
+WRITE_BATCH_MAX_BYTES = 1_000_000
+
 DRIVE_FOLDER_ID = "1Fk5dJGkm5dNMZkfsITe5Lt9x-yCsBiF2"
 EXAMPLE_SPREADSHEET_IDS = [
     "1ge6-Rzor5jbQ7zaaQk3B7I0Vx31Nv80QH6zW2NfBUz8",
@@ -694,6 +698,79 @@ class BookingManager:
             add_log(f"Error updating cell: {str(e)}", "ERROR")
             return False
     
+    @staticmethod
+    def _coalesce_cell_updates(updates: List[Dict]) -> List[Dict]:
+        """Merge single-cell updates into contiguous rectangular blocks
+        
+        Returns blocks as {'row': top, 'col': left, 'values': [[...], ...]}. When the same
+        cell is updated twice the last value wins, matching the old one-by-one writes.
+        """
+        cells = {}
+        for update in updates:
+            cells[(int(update['row']), int(update['col']))] = update['value']
+        
+        # Horizontal runs of adjacent columns within a row
+        runs = []
+        for row, col in sorted(cells):
+            last = runs[-1] if runs else None
+            if last and last['row'] == row and last['col'] + len(last['values'][0]) == col:
+                last['values'][0].append(cells[(row, col)])
+            else:
+                runs.append({'row': row, 'col': col, 'values': [[cells[(row, col)]]]})
+        
+        # Stack runs covering the same columns on consecutive rows
+        blocks = []
+        open_blocks = {}
+        for run in runs:
+            span = (run['col'], len(run['values'][0]))
+            block = open_blocks.get(span)
+            if block and block['row'] + len(block['values']) == run['row']:
+                block['values'].append(run['values'][0])
+            else:
+                blocks.append(run)
+                open_blocks[span] = run
+        return blocks
+    
+    def _write_cell_ranges(self, sheet, updates: List[Dict]) -> int:
+        """Write cell updates as values:batchUpdate requests chunked under the payload limit
+        
+        Returns the number of API requests sent.
+        """
+        sheet_prefix = "'" + sheet.title.replace("'", "''") + "'"
+        request_count = 0
+        data = []
+        payload_size = 0
+        
+        def flush():
+            sheet.spreadsheet.values_batch_update({
+                'valueInputOption': 'USER_ENTERED',
+                'data': data
+            })
+        
+        for block in self._coalesce_cell_updates(updates):
+            last_row = block['row'] + len(block['values']) - 1
+            last_col = block['col'] + len(block['values'][0]) - 1
+            entry = {
+                'range': f"{sheet_prefix}!{rowcol_to_a1(block['row'], block['col'])}:{rowcol_to_a1(last_row, last_col)}",
+                'values': block['values']
+            }
+            entry_size = len(json.dumps(entry, default=str))
+            
+            if data and payload_size + entry_size > WRITE_BATCH_MAX_BYTES:
+                flush()
+                request_count += 1
+                data = []
+                payload_size = 0
+            
+            data.append(entry)
+            payload_size += entry_size
+        
+        if data:
+            flush()
+            request_count += 1
+        
+        return request_count
+    
     def batch_update_cells(self, sheet, cell_list: List[Dict]) -> bool:
         """Batch update multiple cells at once
         cell_list format: [{'row': 1, 'col': 1, 'value': 'text'}, ...]
@@ -701,10 +778,9 @@ class BookingManager:
         try:
             add_log(f"Batch updating {len(cell_list)} cells in {sheet.title}", "INFO")
             
-            for cell_data in cell_list:
-                sheet.update_cell(cell_data['row'], cell_data['col'], cell_data['value'])
+            request_count = self._write_cell_ranges(sheet, cell_list)
             
-            add_log(f"Batch update completed: {len(cell_list)} cells updated", "SUCCESS")
+            add_log(f"Batch update completed: {len(cell_list)} cells updated in {request_count} request(s)", "SUCCESS")
             return True
         except Exception as e:
             add_log(f"Error in batch update: {str(e)}", "ERROR")
@@ -1,5 +1,6 @@
 import streamlit as st
 import gspread
+from gspread.utils import rowcol_to_a1
 from google.oauth2.service_account import Credentials
 import pandas as pd
 from datetime import datetime, timedelta
@@ -9,6 +10,9 @@ import re
 import logging
 from io import StringIO, BytesIO
 import smtplib
+import queue
+import threading
+import uuid
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
@@ -26,6 +30,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Outbound email queue is bounded so a stalled SMTP server pushes back on the UI instead of piling up
+EMAIL_QUEUE_SIZE = 500
+# Pooled SMTP connection is closed after this long without messages
+SMTP_IDLE_TIMEOUT_SECONDS = 60
+SMTP_SEND_RETRIES = 2
+
+# Keep each values:batchUpdate request comfortably under the Sheets API payload limit
+WRITE_BATCH_MAX_BYTES = 1_000_000
+
 DRIVE_FOLDER_ID = "1Fk5dJGkm5dNMZkfsITe5Lt9x-yCsBiF2"
 
 # Page Configuration
@@ -495,6 +508,94 @@ def apply_template(template: Dict, sheet, row_index: int, manager) -> bool:
         add_log(f"Template application failed: {str(e)}", "ERROR")
         return False
 
+class EmailDispatcher:
+    """Background worker that delivers queued emails over one persistent SMTP connection"""
+    
+    def __init__(self, max_queue: int = EMAIL_QUEUE_SIZE):
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.server = None
+        self.server_key = None
+        self.worker = threading.Thread(target=self._run, name="email-dispatcher", daemon=True)
+        self.worker.start()
+    
+    def submit(self, config: Dict, to_email: str, message: str, job: Dict) -> bool:
+        """Queue a rendered message; the job dict is updated in place as delivery progresses"""
+        try:
+            self.queue.put_nowait((dict(config), to_email, message, job))
+            return True
+        except queue.Full:
+            return False
+    
+    def _connect(self, config: Dict):
+        """Reuse the open session for this account, logging in again only when needed"""
+        key = (config['smtp_server'], config['smtp_port'], config['sender_email'], config['sender_password'])
+        if self.server is not None and self.server_key == key:
+            return self.server
+        
+        self._close()
+        server = smtplib.SMTP(config['smtp_server'], config['smtp_port'], timeout=30)
+        try:
+            server.starttls()
+            server.login(config['sender_email'], config['sender_password'])
+        except Exception:
+            # Don't leave the socket open behind a failed handshake (e.g. 535 bad credentials)
+            server.close()
+            raise
+        self.server, self.server_key = server, key
+        logger.info(f"SMTP session opened: {config['sender_email']} via {config['smtp_server']}")
+        return server
+    
+    def _close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except Exception:
+                pass
+        self.server, self.server_key = None, None
+    
+    def _deliver(self, config: Dict, to_email: str, message: str) -> str:
+        """Send one message, reconnecting when the pooled session has dropped"""
+        error = None
+        for attempt in range(SMTP_SEND_RETRIES + 1):
+            try:
+                self._connect(config).sendmail(config['sender_email'], to_email, message)
+                return 'Sent'
+            except smtplib.SMTPServerDisconnected as e:
+                error = e
+                self._close()
+            except smtplib.SMTPResponseException as e:
+                error = e
+                # 421 means the server is closing the session; anything else is final for this
+                # message but leaves the session usable for the next one
+                if e.smtp_code != 421:
+                    break
+                self._close()
+            except smtplib.SMTPException as e:
+                error = e
+                break
+            except OSError as e:
+                error = e
+                self._close()
+        return f'Failed: {str(error)}'
+    
+    def _run(self):
+        while True:
+            try:
+                config, to_email, message, job = self.queue.get(timeout=SMTP_IDLE_TIMEOUT_SECONDS)
+            except queue.Empty:
+                self._close()
+                continue
+            
+            job['status'] = 'Sending'
+            job['status'] = self._deliver(config, to_email, message)
+            job['sent_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self.queue.task_done()
+
+@st.cache_resource
+def get_email_dispatcher() -> EmailDispatcher:
+    """Process-wide dispatcher so every session shares one SMTP worker"""
+    return EmailDispatcher()
+
 class EmailManager:
     """Manages email sending functionality"""
     
@@ -513,12 +614,12 @@ class EmailManager:
     
     @staticmethod
     def send_email(to_email: str, subject: str, body: str, attachment_data: Optional[bytes] = None, 
-                   attachment_name: Optional[str] = None) -> bool:
-        """Send email with optional attachment"""
+                   attachment_name: Optional[str] = None) -> Optional[str]:
+        """Queue email with optional attachment, returning the job id (None if it could not be queued)"""
         try:
             if not st.session_state.email_config.get('configured'):
                 add_log("Email not configured. Please configure email settings first.", "ERROR")
-                return False
+                return None
             
             config = st.session_state.email_config
             
@@ -540,28 +641,21 @@ class EmailManager:
                 msg.attach(part)
                 add_log(f"Attached file: {attachment_name}", "EMAIL")
             
-            add_log(f"Connecting to SMTP server {config['smtp_server']}:{config['smtp_port']}", "EMAIL")
-            
-            server = smtplib.SMTP(config['smtp_server'], config['smtp_port'])
-            server.starttls()
-            server.login(config['sender_email'], config['sender_password'])
-            
-            text = msg.as_string()
-            server.sendmail(config['sender_email'], to_email, text)
-            server.quit()
-            
             email_log = {
+                'job_id': uuid.uuid4().hex[:12],
                 'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 'to': to_email,
                 'subject': subject,
-                'status': 'Sent',
+                'status': 'Queued',
                 'has_attachment': attachment_name is not None
             }
-            st.session_state.email_logs.append(email_log)
             
-            add_log(f"✅ Email sent successfully to {to_email}", "SUCCESS")
-            st.session_state.notification_count += 1
-            return True
+            if not get_email_dispatcher().submit(config, to_email, msg.as_string(), email_log):
+                raise RuntimeError("outbound email queue is full")
+            
+            st.session_state.email_logs.append(email_log)
+            add_log(f"📤 Email to {to_email} queued (job {email_log['job_id']})", "EMAIL")
+            return email_log['job_id']
             
         except Exception as e:
             add_log(f"❌ Failed to send email: {str(e)}", "ERROR")
@@ -573,11 +667,27 @@ class EmailManager:
                 'has_attachment': False
             }
             st.session_state.email_logs.append(email_log)
-            return False
+            return None
+    
+    @staticmethod
+    def collect_results():
+        """Log queued emails the dispatcher has finished with since the last run"""
+        for email_log in st.session_state.email_logs:
+            if not email_log.get('job_id') or email_log.get('reported'):
+                continue
+            status = email_log.get('status', '')
+            if status == 'Sent':
+                add_log(f"✅ Email sent successfully to {email_log['to']}", "SUCCESS")
+                st.session_state.notification_count += 1
+            elif status.startswith('Failed'):
+                add_log(f"❌ Email to {email_log['to']} {status.lower()}", "ERROR")
+            else:
+                continue
+            email_log['reported'] = True
     
     @staticmethod
-    def send_booking_summary(to_email: str, workbook_name: str, summary_data: pd.DataFrame) -> bool:
-        """Send booking summary as email"""
+    def send_booking_summary(to_email: str, workbook_name: str, summary_data: pd.DataFrame) -> Optional[str]:
+        """Queue booking summary as email, returning the job id"""
         subject = f"Booking Summary - {workbook_name}"
         
         body = f"""
@@ -832,13 +942,85 @@ class BookingManager:
             add_log(f"Error updating cell: {str(e)}", "ERROR")
             return False
     
+    @staticmethod
+    def _coalesce_cell_updates(updates: List[Dict]) -> List[Dict]:
+        """Merge single-cell updates into contiguous rectangular blocks
+        
+        Returns blocks as {'row': top, 'col': left, 'values': [[...], ...]}. When the same
+        cell is updated twice the last value wins, matching the old one-by-one writes.
+        """
+        cells = {}
+        for update in updates:
+            cells[(int(update['row']), int(update['col']))] = update['value']
+        
+        # Horizontal runs of adjacent columns within a row
+        runs = []
+        for row, col in sorted(cells):
+            last = runs[-1] if runs else None
+            if last and last['row'] == row and last['col'] + len(last['values'][0]) == col:
+                last['values'][0].append(cells[(row, col)])
+            else:
+                runs.append({'row': row, 'col': col, 'values': [[cells[(row, col)]]]})
+        
+        # Stack runs covering the same columns on consecutive rows
+        blocks = []
+        open_blocks = {}
+        for run in runs:
+            span = (run['col'], len(run['values'][0]))
+            block = open_blocks.get(span)
+            if block and block['row'] + len(block['values']) == run['row']:
+                block['values'].append(run['values'][0])
+            else:
+                blocks.append(run)
+                open_blocks[span] = run
+        return blocks
+    
+    def _write_cell_ranges(self, sheet, updates: List[Dict]) -> int:
+        """Write cell updates as values:batchUpdate requests chunked under the payload limit
+        
+        Returns the number of API requests sent.
+        """
+        sheet_prefix = "'" + sheet.title.replace("'", "''") + "'"
+        request_count = 0
+        data = []
+        payload_size = 0
+        
+        def flush():
+            sheet.spreadsheet.values_batch_update({
+                'valueInputOption': 'USER_ENTERED',
+                'data': data
+            })
+        
+        for block in self._coalesce_cell_updates(updates):
+            last_row = block['row'] + len(block['values']) - 1
+            last_col = block['col'] + len(block['values'][0]) - 1
+            entry = {
+                'range': f"{sheet_prefix}!{rowcol_to_a1(block['row'], block['col'])}:{rowcol_to_a1(last_row, last_col)}",
+                'values': block['values']
+            }
+            entry_size = len(json.dumps(entry, default=str))
+            
+            if data and payload_size + entry_size > WRITE_BATCH_MAX_BYTES:
+                flush()
+                request_count += 1
+                data = []
+                payload_size = 0
+            
+            data.append(entry)
+            payload_size += entry_size
+        
+        if data:
+            flush()
+            request_count += 1
+        
+        return request_count
+    
     def batch_update_cells(self, sheet, updates: List[Dict]) -> bool:
         """Batch update multiple cells at once"""
         try:
             add_log(f"Batch updating {len(updates)} cells in {sheet.title}", "INFO")
             
-            for update in updates:
-                sheet.update_cell(update['row'], update['col'], update['value'])
+            request_count = self._write_cell_ranges(sheet, updates)
             
             add_edit_history("Batch Update", {
                 'sheet': sheet.title,
@@ -846,7 +1028,7 @@ class BookingManager:
                 'cells': updates
             })
             
-            add_log(f"✅ Batch update completed: {len(updates)} cells", "SUCCESS")
+            add_log(f"✅ Batch update completed: {len(updates)} cells in {request_count} request(s)", "SUCCESS")
             return True
         except Exception as e:
             add_log(f"Error in batch update: {str(e)}", "ERROR")
@@ -946,27 +1128,6 @@ class BookingManager:
             add_log(f"Error searching bookings: {str(e)}", "ERROR")
             return pd.DataFrame()
     
-    def get_bookings_by_date_range(self, sheet, start_date: datetime, end_date: datetime, 
-                                   date_column: str = 'Date') -> pd.DataFrame:
-        """Get bookings within a date range"""
-        try:
-            df = self.read_calendar(sheet)
-            
-            if df.empty or date_column not in df.columns:
-                return df
-            
-            df[date_column] = pd.to_datetime(df[date_column], errors='coerce')
-            
-            mask = (df[date_column] >= start_date) & (df[date_column] <= end_date)
-            result = df[mask]
-            
-            add_log(f"Found {len(result)} bookings between {start_date.date()} and {end_date.date()}", "INFO")
-            return result
-            
-        except Exception as e:
-            add_log(f"Error filtering by date range: {str(e)}", "ERROR")
-            return pd.DataFrame()
-
     # Added new BookingManager methods for new features
     def get_all_bookings_combined(self, workbook) -> pd.DataFrame:
         """Get all bookings from all calendar sheets combined"""
@@ -1054,16 +1215,14 @@ class BookingManager:
         try:
             add_log(f"Bulk updating {len(updates)} cells in {sheet.title}", "INFO")
             
-            # Group updates by row for efficiency
-            for update in updates:
-                sheet.update_cell(update['row'], update['col'], update['value'])
+            request_count = self._write_cell_ranges(sheet, updates)
             
             add_edit_history("Bulk Update", {
                 'sheet': sheet.title,
                 'cell_count': len(updates)
             })
             
-            add_log(f"✅ Bulk update completed: {len(updates)} cells", "SUCCESS")
+            add_log(f"✅ Bulk update completed: {len(updates)} cells in {request_count} request(s)", "SUCCESS")
             return True
         except Exception as e:
             add_log(f"Error in bulk update: {str(e)}", "ERROR")
@@ -1824,13 +1983,12 @@ def render_calendar_view(manager, workbook):
                 with col2:
                     end_date = st.date_input("End Date", datetime.now().date() + timedelta(days=30))
                 
-                # Filter bookings by date range
-                filtered_df = manager.get_bookings_by_date_range(
-                    sheet, 
-                    datetime.combine(start_date, datetime.min.time()),
-                    datetime.combine(end_date, datetime.max.time()),
-                    date_col
-                )
+                # Filter the calendar loaded above by date range
+                dates = pd.to_datetime(df[date_col], errors='coerce')
+                filtered_df = df[
+                    (dates >= datetime.combine(start_date, datetime.min.time())) &
+                    (dates <= datetime.combine(end_date, datetime.max.time()))
+                ].copy()
                 
                 if not filtered_df.empty:
                     st.markdown(f"### Bookings: {start_date} to {end_date}")
@@ -1951,10 +2109,9 @@ def render_email_center(manager):
                                 profile.get('client_name', 'Unknown'), 
                                 df
                             ):
-                                st.success("✅ Email sent successfully!")
-                                st.balloons()
+                                st.success("📤 Booking summary queued for delivery - check the Email Log for status")
                             else:
-                                st.error("❌ Failed to send email")
+                                st.error("❌ Failed to queue email")
             else:
                 st.info("👈 Select a workbook first")
         
@@ -1977,9 +2134,9 @@ def render_email_center(manager):
                         attachment_name = attachment.name
                     
                     if EmailManager.send_email(recipient, subject, body, attachment_data, attachment_name):
-                        st.success("✅ Email sent!")
+                        st.success("📤 Email queued for delivery")
                     else:
-                        st.error("❌ Failed to send")
+                        st.error("❌ Failed to queue email")
     
     with tab3:
         st.markdown("### Email Log")
@@ -2560,9 +2717,9 @@ def render_full_booking_creator(manager, workbook):
                     """
                     
                     if EmailManager.send_email(guest_email, subject, body):
-                        st.success("✅ Booking created and confirmation email sent!")
+                        st.success("✅ Booking created and confirmation email queued!")
                     else:
-                        st.warning("⚠️ Booking created but email failed to send")
+                        st.warning("⚠️ Booking created but email could not be queued")
                 else:
                     st.warning("⚠️ No email address provided")
 
@@ -2877,6 +3034,8 @@ def main_app():
     
     st.markdown('<div class="main-header">🏠 Booking Management Dashboard</div>', unsafe_allow_html=True)
     
+    EmailManager.collect_results()
+    
     # Sidebar
     with st.sidebar:
         st.header("🗂️ Workbook Selection")
@@ -9,6 +9,9 @@ import re
 import logging
 from io import StringIO, BytesIO
 import smtplib
+import queue
+import threading
+import uuid
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
@@ -25,6 +28,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Outbound email queue is bounded so a stalled SMTP server pushes back on the UI instead of piling up
+EMAIL_QUEUE_SIZE = 500
+# Pooled SMTP connection is closed after this long without messages
+SMTP_IDLE_TIMEOUT_SECONDS = 60
+SMTP_SEND_RETRIES = 2
+
 DRIVE_FOLDER_ID = "1Fk5dJGkm5dNMZkfsITe5Lt9x-yCsBiF2"
 
 # Page Configuration
@@ -480,6 +489,94 @@ def apply_template(template: Dict, sheet, row_index: int, manager) -> bool:
         add_log(f"Template application failed: {str(e)}", "ERROR")
         return False
 
+class EmailDispatcher:
+    """Background worker that delivers queued emails over one persistent SMTP connection"""
+    
+    def __init__(self, max_queue: int = EMAIL_QUEUE_SIZE):
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.server = None
+        self.server_key = None
+        self.worker = threading.Thread(target=self._run, name="email-dispatcher", daemon=True)
+        self.worker.start()
+    
+    def submit(self, config: Dict, to_email: str, message: str, job: Dict) -> bool:
+        """Queue a rendered message; the job dict is updated in place as delivery progresses"""
+        try:
+            self.queue.put_nowait((dict(config), to_email, message, job))
+            return True
+        except queue.Full:
+            return False
+    
+    def _connect(self, config: Dict):
+        """Reuse the open session for this account, logging in again only when needed"""
+        key = (config['smtp_server'], config['smtp_port'], config['sender_email'], config['sender_password'])
+        if self.server is not None and self.server_key == key:
+            return self.server
+        
+        self._close()
+        server = smtplib.SMTP(config['smtp_server'], config['smtp_port'], timeout=30)
+        try:
+            server.starttls()
+            server.login(config['sender_email'], config['sender_password'])
+        except Exception:
+            # Don't leave the socket open behind a failed handshake (e.g. 535 bad credentials)
+            server.close()
+            raise
+        self.server, self.server_key = server, key
+        logger.info(f"SMTP session opened: {config['sender_email']} via {config['smtp_server']}")
+        return server
+    
+    def _close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except Exception:
+                pass
+        self.server, self.server_key = None, None
+    
+    def _deliver(self, config: Dict, to_email: str, message: str) -> str:
+        """Send one message, reconnecting when the pooled session has dropped"""
+        error = None
+        for attempt in range(SMTP_SEND_RETRIES + 1):
+            try:
+                self._connect(config).sendmail(config['sender_email'], to_email, message)
+                return 'Sent'
+            except smtplib.SMTPServerDisconnected as e:
+                error = e
+                self._close()
+            except smtplib.SMTPResponseException as e:
+                error = e
+                # 421 means the server is closing the session; anything else is final for this
+                # message but leaves the session usable for the next one
+                if e.smtp_code != 421:
+                    break
+                self._close()
+            except smtplib.SMTPException as e:
+                error = e
+                break
+            except OSError as e:
+                error = e
+                self._close()
+        return f'Failed: {str(error)}'
+    
+    def _run(self):
+        while True:
+            try:
+                config, to_email, message, job = self.queue.get(timeout=SMTP_IDLE_TIMEOUT_SECONDS)
+            except queue.Empty:
+                self._close()
+                continue
+            
+            job['status'] = 'Sending'
+            job['status'] = self._deliver(config, to_email, message)
+            job['sent_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self.queue.task_done()
+
+@st.cache_resource
+def get_email_dispatcher() -> EmailDispatcher:
+    """Process-wide dispatcher so every session shares one SMTP worker"""
+    return EmailDispatcher()
+
 class EmailManager:
     """Manages email sending functionality"""
     
@@ -498,12 +595,12 @@ class EmailManager:
     
     @staticmethod
     def send_email(to_email: str, subject: str, body: str, attachment_data: Optional[bytes] = None, 
-                   attachment_name: Optional[str] = None) -> bool:
-        """Send email with optional attachment"""
+                   attachment_name: Optional[str] = None) -> Optional[str]:
+        """Queue email with optional attachment, returning the job id (None if it could not be queued)"""
         try:
             if not st.session_state.email_config.get('configured'):
                 add_log("Email not configured. Please configure email settings first.", "ERROR")
-                return False
+                return None
             
             config = st.session_state.email_config
             
@@ -525,28 +622,21 @@ class EmailManager:
                 msg.attach(part)
                 add_log(f"Attached file: {attachment_name}", "EMAIL")
             
-            add_log(f"Connecting to SMTP server {config['smtp_server']}:{config['smtp_port']}", "EMAIL")
-            
-            server = smtplib.SMTP(config['smtp_server'], config['smtp_port'])
-            server.starttls()
-            server.login(config['sender_email'], config['sender_password'])
-            
-            text = msg.as_string()
-            server.sendmail(config['sender_email'], to_email, text)
-            server.quit()
-            
             email_log = {
+                'job_id': uuid.uuid4().hex[:12],
                 'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 'to': to_email,
                 'subject': subject,
-                'status': 'Sent',
+                'status': 'Queued',
                 'has_attachment': attachment_name is not None
             }
-            st.session_state.email_logs.append(email_log)
             
-            add_log(f"✅ Email sent successfully to {to_email}", "SUCCESS")
-            st.session_state.notification_count += 1
-            return True
+            if not get_email_dispatcher().submit(config, to_email, msg.as_string(), email_log):
+                raise RuntimeError("outbound email queue is full")
+            
+            st.session_state.email_logs.append(email_log)
+            add_log(f"📤 Email to {to_email} queued (job {email_log['job_id']})", "EMAIL")
+            return email_log['job_id']
             
         except Exception as e:
             add_log(f"❌ Failed to send email: {str(e)}", "ERROR")
@@ -558,11 +648,27 @@ class EmailManager:
                 'has_attachment': False
             }
             st.session_state.email_logs.append(email_log)
-            return False
+            return None
     
     @staticmethod
-    def send_booking_summary(to_email: str, workbook_name: str, summary_data: pd.DataFrame) -> bool:
-        """Send booking summary as email"""
+    def collect_results():
+        """Log queued emails the dispatcher has finished with since the last run"""
+        for email_log in st.session_state.email_logs:
+            if not email_log.get('job_id') or email_log.get('reported'):
+                continue
+            status = email_log.get('status', '')
+            if status == 'Sent':
+                add_log(f"✅ Email sent successfully to {email_log['to']}", "SUCCESS")
+                st.session_state.notification_count += 1
+            elif status.startswith('Failed'):
+                add_log(f"❌ Email to {email_log['to']} {status.lower()}", "ERROR")
+            else:
+                continue
+            email_log['reported'] = True
+    
+    @staticmethod
+    def send_booking_summary(to_email: str, workbook_name: str, summary_data: pd.DataFrame) -> Optional[str]:
+        """Queue booking summary as email, returning the job id"""
         subject = f"Booking Summary - {workbook_name}"
         
         body = f"""
@@ -932,7 +1038,7 @@ class BookingManager:
             return pd.DataFrame()
     
     def get_bookings_by_date_range(self, sheet, start_date: datetime, end_date: datetime, 
-                                   date_column: str = 'Date') -> pd.DataFrame:
+                                   date_column: str = 'DATE') -> pd.DataFrame:
         """Get bookings within a date range"""
         try:
             df = self.read_calendar(sheet)
@@ -1041,6 +1147,8 @@ def main_app():
     
     st.markdown('<div class="main-header">🏠 Booking Management Dashboard</div>', unsafe_allow_html=True)
     
+    EmailManager.collect_results()
+    
     # Sidebar
     with st.sidebar:
         st.header("🗂️ Workbook Selection")
@@ -1823,10 +1931,9 @@ def render_email_center(manager):
                                 profile.get('client_name', 'Unknown'), 
                                 df
                             ):
-                                st.success("✅ Email sent successfully!")
-                                st.balloons()
+                                st.success("📤 Booking summary queued for delivery - check the Email Log for status")
                             else:
-                                st.error("❌ Failed to send email")
+                                st.error("❌ Failed to queue email")
             else:
                 st.info("👈 Select a workbook first")
         
@@ -1849,9 +1956,9 @@ def render_email_center(manager):
                         attachment_name = attachment.name
                     
                     if EmailManager.send_email(recipient, subject, body, attachment_data, attachment_name):
-                        st.success("✅ Email sent!")
+                        st.success("📤 Email queued for delivery")
                     else:
-                        st.error("❌ Failed to send")
+                        st.error("❌ Failed to queue email")
     
     with tab3:
         st.markdown("### Email Log")
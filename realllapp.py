@@ -1,5 +1,6 @@
 import streamlit as st
 import gspread
+from gspread.utils import rowcol_to_a1
 from google.oauth2.service_account import Credentials
 import pandas as pd
 from datetime import datetime, timedelta
@@ -7,6 +8,9 @@ import json
 from typing import List, Dict, Optional
 import re
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from io import StringIO
 
 # Configure logging
@@ -16,6 +20,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Keep each values:batchUpdate request comfortably under the Sheets API payload limit
+WRITE_BATCH_MAX_BYTES = 1_000_000
+
+# Sheets API read quota per service account (requests per minute) shared by concurrent scans
+SHEETS_READS_PER_MINUTE = 60
+PORTFOLIO_MAX_WORKERS = 8
+
 DRIVE_FOLDER_ID = "1Fk5dJGkm5dNMZkfsITe5Lt9x-yCsBiF2"
 EXAMPLE_SPREADSHEET_IDS = [
     "1ge6-Rzor5jbQ7zaaQk3B7I0Vx31Nv80QH6zW2NfBUz8",
@@ -236,6 +247,10 @@ if 'all_sheets' not in st.session_state:
     st.session_state.all_sheets = []
 if 'selected_sheet_index' not in st.session_state:
     st.session_state.selected_sheet_index = 0
+if 'portfolio' not in st.session_state:
+    st.session_state.portfolio = {}
+if 'portfolio_key' not in st.session_state:
+    st.session_state.portfolio_key = None
 
 # Status code definitions
 STATUS_CODES = {
@@ -300,6 +315,34 @@ def add_log(message: str, level: str = "INFO"):
     elif level == "ERROR":
         logger.error(message)
 
+class RateLimiter:
+    """Thread-safe token bucket that paces API calls across worker threads"""
+    
+    def __init__(self, rate_per_minute: int, burst: int = 10):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a request token is available"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+@st.cache_resource
+def get_sheets_rate_limiter() -> RateLimiter:
+    """Process-wide limiter so every session shares the service account's read quota"""
+    return RateLimiter(SHEETS_READS_PER_MINUTE)
+
 class BookingManager:
     """Manages Google Sheets operations for booking system"""
     
@@ -502,38 +545,41 @@ class BookingManager:
             all_values = sheet.get_all_values()
             add_log(f"Retrieved {len(all_values)} rows from profile sheet", "INFO")
             
-            profile = {
-                'client_name': all_values[0][0] if len(all_values) > 0 else 'Unknown',
-                'check_out_time': all_values[8][1] if len(all_values) > 8 else '',
-                'check_in_time': all_values[9][1] if len(all_values) > 9 else '',
-                'amenities': all_values[10][1] if len(all_values) > 10 else '',
-                'laundry_services': all_values[11][1] if len(all_values) > 11 else '',
-                'keys': all_values[12][1] if len(all_values) > 12 else '',
-                'codes': all_values[13][1] if len(all_values) > 13 else '',
-                'properties': []
-            }
-            
+            profile = self._parse_client_profile(all_values)
             add_log(f"Client: {profile['client_name']}", "INFO")
-            
-            # Extract properties (starting from row 18)
-            property_count = 0
-            for i in range(17, min(len(all_values), 30)):
-                if len(all_values[i]) > 1 and all_values[i][0]:
-                    property_count += 1
-                    profile['properties'].append({
-                        'name': all_values[i][0],
-                        'address': all_values[i][1] if len(all_values[i]) > 1 else '',
-                        'hours': all_values[i][2] if len(all_values[i]) > 2 else '',
-                        'so_hours': all_values[i][3] if len(all_values[i]) > 3 else ''
-                    })
-            
-            add_log(f"Found {property_count} propert(y/ies)", "SUCCESS")
+            add_log(f"Found {len(profile['properties'])} propert(y/ies)", "SUCCESS")
             
             return profile
         except Exception as e:
             add_log(f"Error reading client profile: {str(e)}", "ERROR")
             return {}
     
+    @staticmethod
+    def _parse_client_profile(all_values: List[List[str]]) -> Dict:
+        """Build the client profile dict from the profile sheet's values"""
+        profile = {
+            'client_name': all_values[0][0] if len(all_values) > 0 else 'Unknown',
+            'check_out_time': all_values[8][1] if len(all_values) > 8 else '',
+            'check_in_time': all_values[9][1] if len(all_values) > 9 else '',
+            'amenities': all_values[10][1] if len(all_values) > 10 else '',
+            'laundry_services': all_values[11][1] if len(all_values) > 11 else '',
+            'keys': all_values[12][1] if len(all_values) > 12 else '',
+            'codes': all_values[13][1] if len(all_values) > 13 else '',
+            'properties': []
+        }
+        
+        # Extract properties (starting from row 18)
+        for i in range(17, min(len(all_values), 30)):
+            if len(all_values[i]) > 1 and all_values[i][0]:
+                profile['properties'].append({
+                    'name': all_values[i][0],
+                    'address': all_values[i][1] if len(all_values[i]) > 1 else '',
+                    'hours': all_values[i][2] if len(all_values[i]) > 2 else '',
+                    'so_hours': all_values[i][3] if len(all_values[i]) > 3 else ''
+                })
+        
+        return profile
+    
     def get_calendar_sheets(self, workbook) -> List[Dict]:
         """Get all calendar sheets (excluding first sheet)"""
         try:
@@ -566,30 +612,10 @@ class BookingManager:
                 add_log(f"Sheet has insufficient rows (found {len(all_values)}, need {start_row})", "WARNING")
                 return pd.DataFrame()
             
-            # Get headers (row before start_row)
-            headers = all_values[start_row - 2] if start_row > 1 else all_values[0]
-            
-            seen = {}
-            unique_headers = []
-            for header in headers:
-                if header in seen:
-                    seen[header] += 1
-                    unique_headers.append(f"{header}_{seen[header]}")
-                else:
-                    seen[header] = 0
-                    unique_headers.append(header)
-            
-            add_log(f"Headers: {', '.join([h for h in unique_headers if h])}", "INFO")
-            
-            # Get data starting from start_row
-            data = all_values[start_row - 1:]
-            
-            df = pd.DataFrame(data, columns=unique_headers)
-            
-            # Clean empty rows
-            initial_rows = len(df)
-            df = df[df.apply(lambda row: row.astype(str).str.strip().any(), axis=1)]
+            df = self._calendar_frame(all_values, start_row)
+            add_log(f"Headers: {', '.join([h for h in df.columns if h])}", "INFO")
             
+            initial_rows = len(all_values) - start_row + 1
             add_log(f"Loaded {len(df)} booking rows (removed {initial_rows - len(df)} empty rows)", "SUCCESS")
             
             return df
@@ -598,6 +624,105 @@ class BookingManager:
             add_log(f"Error reading calendar: {str(e)}", "ERROR")
             return pd.DataFrame()
     
+    @staticmethod
+    def _calendar_frame(all_values: List[List[str]], start_row: int = 13) -> pd.DataFrame:
+        """Build the bookings DataFrame from a calendar sheet's values"""
+        if len(all_values) < start_row:
+            return pd.DataFrame()
+        
+        # Get headers (row before start_row)
+        headers = all_values[start_row - 2] if start_row > 1 else all_values[0]
+        
+        seen = {}
+        unique_headers = []
+        for header in headers:
+            if header in seen:
+                seen[header] += 1
+                unique_headers.append(f"{header}_{seen[header]}")
+            else:
+                seen[header] = 0
+                unique_headers.append(header)
+        
+        # Get data starting from start_row
+        data = all_values[start_row - 1:]
+        
+        df = pd.DataFrame(data, columns=unique_headers)
+        
+        # Clean empty rows
+        return df[df.apply(lambda row: row.astype(str).str.strip().any(), axis=1)]
+    
+    def _load_client_summary(self, workbook_info: Dict, limiter: RateLimiter) -> Dict:
+        """Read one workbook's profile and calendars (runs on a worker thread)
+        
+        Two rate-limited reads: the sheet titles from a masked metadata fetch, then every
+        tab in a single batchGet. Opening the workbook through gspread would fetch the
+        metadata a second time.
+        """
+        workbook_id = workbook_info['id']
+        limiter.acquire()
+        metadata = self.gc.http_client.fetch_sheet_metadata(workbook_id, params={'fields': 'sheets.properties(title)'})
+        titles = [sheet['properties']['title'] for sheet in metadata.get('sheets', [])]
+        
+        values = []
+        if titles:
+            limiter.acquire()
+            ranges = ["'{}'".format(title.replace("'", "''")) for title in titles]
+            response = self.gc.http_client.values_batch_get(workbook_id, ranges)
+            for value_range in response.get('valueRanges', []):
+                # batchGet trims trailing blanks; pad rows to a grid like get_all_values does
+                rows = value_range.get('values', [])
+                width = max((len(row) for row in rows), default=0)
+                values.append([row + [''] * (width - len(row)) for row in rows])
+        values += [[]] * (len(titles) - len(values))
+        
+        profile = self._parse_client_profile(values[0] if values else [])
+        status_counts = {code: 0 for code in STATUS_CODES.keys()}
+        calendars = []
+        
+        for title, rows in zip(titles[1:], values[1:]):
+            df = self._calendar_frame(rows)
+            calendars.append({'name': title, 'bookings': len(df)})
+            
+            for col in df.columns:
+                if 'status' in col.lower() or 'code' in col.lower():
+                    for status in STATUS_CODES.keys():
+                        status_counts[status] += int(df[col].astype(str).str.contains(status, case=False, na=False, regex=False).sum())
+        
+        return {
+            'id': workbook_id,
+            'name': workbook_info['name'],
+            'url': workbook_info.get('url', f"https://docs.google.com/spreadsheets/d/{workbook_id}"),
+            'profile': profile,
+            'calendars': calendars,
+            'total_properties': len(profile['properties']),
+            'total_bookings': sum(cal['bookings'] for cal in calendars),
+            'status_counts': status_counts
+        }
+    
+    def load_portfolio(self, workbooks: List[Dict]) -> Dict[str, Dict]:
+        """Load every client's summary concurrently, paced by the shared Sheets rate limiter"""
+        add_log(f"Loading portfolio summary for {len(workbooks)} workbook(s)...", "INFO")
+        limiter = get_sheets_rate_limiter()
+        portfolio = {}
+        
+        with ThreadPoolExecutor(max_workers=PORTFOLIO_MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(self._load_client_summary, workbook_info, limiter): workbook_info
+                for workbook_info in workbooks
+            }
+            for future in as_completed(futures):
+                workbook_info = futures[future]
+                try:
+                    portfolio[workbook_info['id']] = future.result()
+                except Exception as e:
+                    # Kept so the client grid can show an error card for this workbook
+                    portfolio[workbook_info['id']] = {'id': workbook_info['id'], 'name': workbook_info['name'], 'error': str(e)}
+                    add_log(f"Error loading workbook {workbook_info['name']}: {str(e)}", "ERROR")
+        
+        loaded = sum(1 for summary in portfolio.values() if 'error' not in summary)
+        add_log(f"Portfolio summary ready: {loaded}/{len(workbooks)} workbook(s)", "SUCCESS")
+        return portfolio
+    
     def read_sheet_all_data(self, sheet) -> pd.DataFrame:
         """Read all data from any sheet"""
         try:
@@ -694,6 +819,79 @@ class BookingManager:
             add_log(f"Error updating cell: {str(e)}", "ERROR")
             return False
     
+    @staticmethod
+    def _coalesce_cell_updates(updates: List[Dict]) -> List[Dict]:
+        """Merge single-cell updates into contiguous rectangular blocks
+        
+        Returns blocks as {'row': top, 'col': left, 'values': [[...], ...]}. When the same
+        cell is updated twice the last value wins, matching the old one-by-one writes.
+        """
+        cells = {}
+        for update in updates:
+            cells[(int(update['row']), int(update['col']))] = update['value']
+        
+        # Horizontal runs of adjacent columns within a row
+        runs = []
+        for row, col in sorted(cells):
+            last = runs[-1] if runs else None
+            if last and last['row'] == row and last['col'] + len(last['values'][0]) == col:
+                last['values'][0].append(cells[(row, col)])
+            else:
+                runs.append({'row': row, 'col': col, 'values': [[cells[(row, col)]]]})
+        
+        # Stack runs covering the same columns on consecutive rows
+        blocks = []
+        open_blocks = {}
+        for run in runs:
+            span = (run['col'], len(run['values'][0]))
+            block = open_blocks.get(span)
+            if block and block['row'] + len(block['values']) == run['row']:
+                block['values'].append(run['values'][0])
+            else:
+                blocks.append(run)
+                open_blocks[span] = run
+        return blocks
+    
+    def _write_cell_ranges(self, sheet, updates: List[Dict]) -> int:
+        """Write cell updates as values:batchUpdate requests chunked under the payload limit
+        
+        Returns the number of API requests sent.
+        """
+        sheet_prefix = "'" + sheet.title.replace("'", "''") + "'"
+        request_count = 0
+        data = []
+        payload_size = 0
+        
+        def flush():
+            sheet.spreadsheet.values_batch_update({
+                'valueInputOption': 'USER_ENTERED',
+                'data': data
+            })
+        
+        for block in self._coalesce_cell_updates(updates):
+            last_row = block['row'] + len(block['values']) - 1
+            last_col = block['col'] + len(block['values'][0]) - 1
+            entry = {
+                'range': f"{sheet_prefix}!{rowcol_to_a1(block['row'], block['col'])}:{rowcol_to_a1(last_row, last_col)}",
+                'values': block['values']
+            }
+            entry_size = len(json.dumps(entry, default=str))
+            
+            if data and payload_size + entry_size > WRITE_BATCH_MAX_BYTES:
+                flush()
+                request_count += 1
+                data = []
+                payload_size = 0
+            
+            data.append(entry)
+            payload_size += entry_size
+        
+        if data:
+            flush()
+            request_count += 1
+        
+        return request_count
+    
     def batch_update_cells(self, sheet, cell_list: List[Dict]) -> bool:
         """Batch update multiple cells at once
         cell_list format: [{'row': 1, 'col': 1, 'value': 'text'}, ...]
@@ -701,10 +899,9 @@ class BookingManager:
         try:
             add_log(f"Batch updating {len(cell_list)} cells in {sheet.title}", "INFO")
             
-            for cell_data in cell_list:
-                sheet.update_cell(cell_data['row'], cell_data['col'], cell_data['value'])
+            request_count = self._write_cell_ranges(sheet, cell_list)
             
-            add_log(f"Batch update completed: {len(cell_list)} cells updated", "SUCCESS")
+            add_log(f"Batch update completed: {len(cell_list)} cells updated in {request_count} request(s)", "SUCCESS")
             return True
         except Exception as e:
             add_log(f"Error in batch update: {str(e)}", "ERROR")
@@ -979,6 +1176,17 @@ def main_app():
     elif view_mode == "System Logs":
         render_system_logs()
 
+def get_portfolio(manager) -> Dict[str, Dict]:
+    """Return per-client summaries, reloading them only when the workbook listing changes"""
+    portfolio_key = tuple((wb['id'], wb.get('modified')) for wb in st.session_state.workbooks)
+    
+    if st.session_state.portfolio_key != portfolio_key:
+        with st.spinner(f"Loading {len(st.session_state.workbooks)} clients..."):
+            st.session_state.portfolio = manager.load_portfolio(st.session_state.workbooks)
+        st.session_state.portfolio_key = portfolio_key
+    
+    return st.session_state.portfolio
+
 def render_all_clients(manager):
     """Render comprehensive view of all clients/workbooks"""
     st.markdown('<div class="section-header">👥 All Clients Overview</div>', unsafe_allow_html=True)
@@ -996,6 +1204,8 @@ def render_all_clients(manager):
         """, unsafe_allow_html=True)
         return
     
+    portfolio = get_portfolio(manager)
+    
     # Summary metrics at the top
     st.markdown("### 📊 Portfolio Summary")
     col1, col2, col3, col4 = st.columns(4)
@@ -1028,6 +1238,7 @@ def render_all_clients(manager):
         if st.button("🔄 Refresh All", use_container_width=True, type="primary"):
             with st.spinner("Refreshing all clients..."):
                 st.session_state.workbooks = manager.list_workbooks_from_folder(DRIVE_FOLDER_ID)
+            st.session_state.portfolio_key = None
             st.success(f"✅ Refreshed! Found {len(st.session_state.workbooks)} clients")
             st.rerun()
     
@@ -1037,144 +1248,135 @@ def render_all_clients(manager):
     st.markdown("### 🏢 Client Details")
     
     for idx, workbook_info in enumerate(st.session_state.workbooks):
-        with st.spinner(f"Loading {workbook_info['name']}..."):
-            try:
-                # Open workbook to get details
-                wb = manager.open_workbook(workbook_info['id'])
-                if not wb:
-                    continue
+        try:
+            summary = portfolio.get(workbook_info['id'])
+            if not summary:
+                continue
+            if 'error' in summary:
+                st.error(f"❌ Error loading {workbook_info['name']}: {summary['error']}")
+                continue
+            
+            profile = summary['profile']
+            calendars = summary['calendars']
+            
+            total_bookings = summary['total_bookings']
+            total_properties = summary['total_properties']
+            
+            # Create expandable client card
+            with st.expander(f"🏢 {profile.get('client_name', workbook_info['name'])} - {total_properties} Properties, {len(calendars)} Calendars", expanded=(idx == 0)):
                 
-                # Get client profile
-                profile = manager.get_client_profile(wb)
+                # Client header with key info
+                col1, col2, col3, col4 = st.columns(4)
                 
-                # Get calendar sheets
-                calendars = manager.get_calendar_sheets(wb)
+                with col1:
+                    st.markdown(f"""
+                    <div class="metric-card">
+                        <h4 style="color: #667eea; margin: 0;">🏘️ Properties</h4>
+                        <h2 style="margin: 0.5rem 0;">{total_properties}</h2>
+                    </div>
+                    """, unsafe_allow_html=True)
                 
-                # Calculate total bookings across all calendars
-                total_bookings = 0
-                total_properties = len(profile.get('properties', []))
+                with col2:
+                    st.markdown(f"""
+                    <div class="metric-card">
+                        <h4 style="color: #11998e; margin: 0;">📅 Calendars</h4>
+                        <h2 style="margin: 0.5rem 0;">{len(calendars)}</h2>
+                    </div>
+                    """, unsafe_allow_html=True)
                 
-                for cal in calendars:
-                    df = manager.read_calendar(cal['sheet'])
-                    if not df.empty:
-                        total_bookings += len(df)
+                with col3:
+                    st.markdown(f"""
+                    <div class="metric-card">
+                        <h4 style="color: #f093fb; margin: 0;">📋 Bookings</h4>
+                        <h2 style="margin: 0.5rem 0;">{total_bookings}</h2>
+                    </div>
+                    """, unsafe_allow_html=True)
                 
-                # Create expandable client card
-                with st.expander(f"🏢 {profile.get('client_name', workbook_info['name'])} - {total_properties} Properties, {len(calendars)} Calendars", expanded=(idx == 0)):
-                    
-                    # Client header with key info
-                    col1, col2, col3, col4 = st.columns(4)
-                    
-                    with col1:
-                        st.markdown(f"""
-                        <div class="metric-card">
-                            <h4 style="color: #667eea; margin: 0;">🏘️ Properties</h4>
-                            <h2 style="margin: 0.5rem 0;">{total_properties}</h2>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    with col2:
-                        st.markdown(f"""
-                        <div class="metric-card">
-                            <h4 style="color: #11998e; margin: 0;">📅 Calendars</h4>
-                            <h2 style="margin: 0.5rem 0;">{len(calendars)}</h2>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    with col3:
-                        st.markdown(f"""
-                        <div class="metric-card">
-                            <h4 style="color: #f093fb; margin: 0;">📋 Bookings</h4>
-                            <h2 style="margin: 0.5rem 0;">{total_bookings}</h2>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    with col4:
-                        if st.button(f"📊 Open Dashboard", key=f"open_{workbook_info['id']}", use_container_width=True):
-                            st.session_state.current_workbook = workbook_info['id']
-                            st.rerun()
-                    
-                    st.markdown("---")
-                    
-                    # Client details section
-                    col_left, col_right = st.columns([1, 1])
+                with col4:
+                    if st.button(f"📊 Open Dashboard", key=f"open_{workbook_info['id']}", use_container_width=True):
+                        st.session_state.current_workbook = workbook_info['id']
+                        st.rerun()
+                
+                st.markdown("---")
+                
+                # Client details section
+                col_left, col_right = st.columns([1, 1])
+                
+                with col_left:
+                    st.markdown(f"""
+                    <div class="info-box">
+                        <h4 style="margin-top: 0;">⏰ Check-in/out Times</h4>
+                        <p><strong>Check-out:</strong> {profile.get('check_out_time', 'N/A')}</p>
+                        <p><strong>Check-in:</strong> {profile.get('check_in_time', 'N/A')}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
                     
-                    with col_left:
-                        st.markdown(f"""
-                        <div class="info-box">
-                            <h4 style="margin-top: 0;">⏰ Check-in/out Times</h4>
-                            <p><strong>Check-out:</strong> {profile.get('check_out_time', 'N/A')}</p>
-                            <p><strong>Check-in:</strong> {profile.get('check_in_time', 'N/A')}</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        
-                        st.markdown(f"""
-                        <div class="info-box">
-                            <h4 style="margin-top: 0;">🔑 Access Information</h4>
-                            <p><strong>Keys:</strong> {profile.get('keys', 'N/A')}</p>
-                            <p><strong>Codes:</strong> {profile.get('codes', 'N/A')}</p>
-                        </div>
-                        """, unsafe_allow_html=True)
+                    st.markdown(f"""
+                    <div class="info-box">
+                        <h4 style="margin-top: 0;">🔑 Access Information</h4>
+                        <p><strong>Keys:</strong> {profile.get('keys', 'N/A')}</p>
+                        <p><strong>Codes:</strong> {profile.get('codes', 'N/A')}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+                
+                with col_right:
+                    st.markdown(f"""
+                    <div class="info-box">
+                        <h4 style="margin-top: 0;">🧺 Services</h4>
+                        <p><strong>Amenities:</strong> {profile.get('amenities', 'N/A')}</p>
+                        <p><strong>Laundry:</strong> {profile.get('laundry_services', 'N/A')}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
                     
-                    with col_right:
-                        st.markdown(f"""
-                        <div class="info-box">
-                            <h4 style="margin-top: 0;">🧺 Services</h4>
-                            <p><strong>Amenities:</strong> {profile.get('amenities', 'N/A')}</p>
-                            <p><strong>Laundry:</strong> {profile.get('laundry_services', 'N/A')}</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        
-                        st.markdown(f"""
-                        <div class="info-box">
-                            <h4 style="margin-top: 0;">🔗 Spreadsheet</h4>
-                            <p><a href="{workbook_info['url']}" target="_blank">📊 Open in Google Sheets</a></p>
-                            <p style="font-size: 0.8rem; word-break: break-all;"><strong>ID:</strong> {workbook_info['id']}</p>
-                        </div>
-                        """, unsafe_allow_html=True)
+                    st.markdown(f"""
+                    <div class="info-box">
+                        <h4 style="margin-top: 0;">🔗 Spreadsheet</h4>
+                        <p><a href="{workbook_info['url']}" target="_blank">📊 Open in Google Sheets</a></p>
+                        <p style="font-size: 0.8rem; word-break: break-all;"><strong>ID:</strong> {workbook_info['id']}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+                
+                # Properties section
+                if profile.get('properties'):
+                    st.markdown("#### 🏘️ Property Portfolio")
                     
-                    # Properties section
-                    if profile.get('properties'):
-                        st.markdown("#### 🏘️ Property Portfolio")
-                        
-                        # Display properties in a grid
-                        prop_cols = st.columns(min(len(profile['properties']), 3))
-                        
-                        for prop_idx, prop in enumerate(profile['properties']):
-                            with prop_cols[prop_idx % 3]:
-                                st.markdown(f"""
-                                <div class="property-card">
-                                    <h4 style="margin-top: 0; color: #667eea;">🏠 {prop['name']}</h4>
-                                    <p style="font-size: 0.9rem;"><strong>📍 Address:</strong><br>{prop['address']}</p>
-                                    <p style="font-size: 0.9rem;"><strong>⏱️ Hours:</strong> {prop['hours']}</p>
-                                    <p style="font-size: 0.9rem;"><strong>🔄 SO Hours:</strong> {prop['so_hours']}</p>
-                                </div>
-                                """, unsafe_allow_html=True)
+                    # Display properties in a grid
+                    prop_cols = st.columns(min(len(profile['properties']), 3))
                     
-                    # Calendar sheets section
-                    if calendars:
-                        st.markdown("#### 📅 Calendar Sheets")
-                        
-                        cal_cols = st.columns(min(len(calendars), 4))
-                        
-                        for cal_idx, cal in enumerate(calendars):
-                            with cal_cols[cal_idx % 4]:
-                                df = manager.read_calendar(cal['sheet'])
-                                booking_count = len(df) if not df.empty else 0
-                                
-                                st.markdown(f"""
-                                <div class="metric-card">
-                                    <h4 style="margin: 0; color: #11998e;">📆 {cal['name']}</h4>
-                                    <h3 style="margin: 0.5rem 0;">{booking_count}</h3>
-                                    <p style="margin: 0; font-size: 0.85rem;">bookings</p>
-                                </div>
-                                """, unsafe_allow_html=True)
+                    for prop_idx, prop in enumerate(profile['properties']):
+                        with prop_cols[prop_idx % 3]:
+                            st.markdown(f"""
+                            <div class="property-card">
+                                <h4 style="margin-top: 0; color: #667eea;">🏠 {prop['name']}</h4>
+                                <p style="font-size: 0.9rem;"><strong>📍 Address:</strong><br>{prop['address']}</p>
+                                <p style="font-size: 0.9rem;"><strong>⏱️ Hours:</strong> {prop['hours']}</p>
+                                <p style="font-size: 0.9rem;"><strong>🔄 SO Hours:</strong> {prop['so_hours']}</p>
+                            </div>
+                            """, unsafe_allow_html=True)
+                
+                # Calendar sheets section
+                if calendars:
+                    st.markdown("#### 📅 Calendar Sheets")
                     
-                    st.markdown("---")
+                    cal_cols = st.columns(min(len(calendars), 4))
                     
-            except Exception as e:
-                st.error(f"❌ Error loading {workbook_info['name']}: {str(e)}")
-                add_log(f"Error loading workbook {workbook_info['name']}: {str(e)}", "ERROR")
+                    for cal_idx, cal in enumerate(calendars):
+                        with cal_cols[cal_idx % 4]:
+                            booking_count = cal['bookings']
+                            
+                            st.markdown(f"""
+                            <div class="metric-card">
+                                <h4 style="margin: 0; color: #11998e;">📆 {cal['name']}</h4>
+                                <h3 style="margin: 0.5rem 0;">{booking_count}</h3>
+                                <p style="margin: 0; font-size: 0.85rem;">bookings</p>
+                            </div>
+                            """, unsafe_allow_html=True)
+                
+                st.markdown("---")
+                
+        except Exception as e:
+            st.error(f"❌ Error loading {workbook_info['name']}: {str(e)}")
+            add_log(f"Error loading workbook {workbook_info['name']}: {str(e)}", "ERROR")
 
 def render_dashboard(manager, workbook):
     """Render dashboard view"""
@@ -1,15 +1,26 @@
 import streamlit as st
 import gspread
+from gspread.utils import rowcol_to_a1
 from google.oauth2.service_account import Credentials
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import json
-from typing import List, Dict, Optional, Callable
+from typing import List, Dict, Optional, Callable, NamedTuple
 import re
 import logging
+import logging.handlers
+import heapq
+import itertools
+import os
+import threading
+from collections import deque, Counter
 from io import StringIO
 import time
+import random
+from email.utils import parsedate_to_datetime
 from functools import wraps
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # Configure logging
 logging.basicConfig(
@@ -18,7 +29,43 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# System log ring buffer size per session; set BOOKING_LOG_FILE to also spill every
+# record to a size-rotated JSONL file
+LOG_BUFFER_SIZE = 100
+LOG_SPILL_PATH = os.environ.get("BOOKING_LOG_FILE")
+LOG_SPILL_MAX_BYTES = 5_000_000
+LOG_SPILL_BACKUPS = 3
+# Rows per page in the log and history viewers
+LOG_PAGE_SIZE = 50
+LOG_TIME_WINDOWS = {"All time": None, "Last 15 minutes": 15, "Last hour": 60, "Last 24 hours": 1440}
+
+# Keep each values:batchUpdate request comfortably under the Sheets API payload limit
+WRITE_BATCH_MAX_BYTES = 1_000_000
+
 DRIVE_FOLDER_ID = "1Fk5dJGkm5dNMZkfsITe5Lt9x-yCsBiF2"
+
+# Per-minute request quotas shared by every session (Sheets per user, Drive per user)
+SHEETS_REQUESTS_PER_MINUTE = 60
+DRIVE_REQUESTS_PER_MINUTE = 600
+# Adaptive pacing: each success adds this share of the quota back to the rate, a throttled
+# response multiplies it by the decrease factor (at most once per cooldown), never below the floor
+RATE_ADDITIVE_STEP = 0.02
+RATE_DECREASE_FACTOR = 0.5
+RATE_DECREASE_COOLDOWN_SECONDS = 2
+RATE_FLOOR_FRACTION = 0.05
+# Longest single wait between retries, unless the server's Retry-After asks for more
+RETRY_MAX_DELAY_SECONDS = 60
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+# Markers of a quota rejection in error bodies (Drive reports some of these as 403)
+RATE_LIMIT_MARKERS = ('rateLimitExceeded', 'userRateLimitExceeded', 'RESOURCE_EXHAUSTED', 'Quota exceeded')
+
+# Folder scans: folders fetched in parallel, and the page limit per folder
+FOLDER_SCAN_MAX_WORKERS = 8
+FOLDER_SCAN_MAX_PAGES = 100
+
+SPREADSHEET_MIME = 'application/vnd.google-apps.spreadsheet'
+FOLDER_MIME = 'application/vnd.google-apps.folder'
+SHORTCUT_MIME = 'application/vnd.google-apps.shortcut'
 EXAMPLE_SPREADSHEET_IDS = [
     "1ge6-Rzor5jbQ7zaaQk3B7I0Vx31Nv80QH6zW2NfBUz8",
     "1-I0lHMXrA16v07Qtc3BNqnjRux7PRf8fMxJhVlxAcME"
@@ -239,8 +286,6 @@ if 'current_workbook' not in st.session_state:
     st.session_state.current_workbook = None
 if 'current_sheet' not in st.session_state:
     st.session_state.current_sheet = None
-if 'logs' not in st.session_state:
-    st.session_state.logs = []
 if 'service_account_email' not in st.session_state:
     st.session_state.service_account_email = None
 if 'all_sheets' not in st.session_state:
@@ -253,6 +298,8 @@ if 'cache_timestamp' not in st.session_state:
     st.session_state.cache_timestamp = None
 if 'loading_progress' not in st.session_state:
     st.session_state.loading_progress = {'current': 0, 'total': 0, 'status': ''}
+if 'scan_subfolders' not in st.session_state:
+    st.session_state.scan_subfolders = True
 
 # Status code definitions
 STATUS_CODES = {
@@ -293,19 +340,127 @@ STATUS_CODES = {
     }
 }
 
+class LogRecord(NamedTuple):
+    seq: int
+    timestamp: str
+    level: str
+    message: str
+
+def get_log_spill() -> Optional[logging.Logger]:
+    """JSONL logger for the on-disk spill, set up once per process"""
+    if not LOG_SPILL_PATH:
+        return None
+    spill = logging.getLogger("booking.log_spill")
+    if not spill.handlers:
+        handler = logging.handlers.RotatingFileHandler(
+            LOG_SPILL_PATH, maxBytes=LOG_SPILL_MAX_BYTES, backupCount=LOG_SPILL_BACKUPS, encoding='utf-8'
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        spill.addHandler(handler)
+        spill.setLevel(logging.INFO)
+        spill.propagate = False
+    return spill
+
+class LogStore:
+    """Bounded ring buffer of log records with per-level counts kept up to date on append"""
+    
+    def __init__(self, maxlen: int = LOG_BUFFER_SIZE):
+        self.records = deque(maxlen=maxlen)
+        self.by_level = {}
+        self.level_counts = Counter()
+        self.next_seq = 0
+        self.spill = get_log_spill()
+        self.lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def __iter__(self):
+        return iter(self.records)
+    
+    def append(self, level: str, message: str) -> LogRecord:
+        with self.lock:
+            record = LogRecord(self.next_seq, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), level, message)
+            self.next_seq += 1
+            
+            if len(self.records) == self.records.maxlen:
+                evicted = self.records[0]
+                self.by_level[evicted.level].popleft()
+                self.level_counts[evicted.level] -= 1
+            
+            self.records.append(record)
+            self.by_level.setdefault(level, deque()).append(record)
+            self.level_counts[level] += 1
+        
+        if self.spill:
+            self.spill.info(json.dumps(record._asdict()))
+        return record
+    
+    def _newest(self, levels: Optional[List[str]]):
+        """Lazy newest-first iterator over the records of the given levels; hold the lock while iterating"""
+        if levels is None:
+            sources = [self.records]
+        else:
+            sources = [self.by_level[level] for level in levels if level in self.by_level]
+        return heapq.merge(*(reversed(source) for source in sources), key=lambda r: r.seq, reverse=True)
+    
+    def tail(self, levels: Optional[List[str]] = None, limit: int = 100) -> List[LogRecord]:
+        """Newest records first, touching only as many records as are returned"""
+        with self.lock:
+            return list(itertools.islice(self._newest(levels), limit))
+    
+    def query(self, levels: Optional[List[str]] = None, text: str = '', since: Optional[str] = None,
+              offset: int = 0, limit: int = LOG_PAGE_SIZE):
+        """One newest-first page of records matching the filters, plus the number of matches
+        
+        Without a text or time filter the count comes from the per-level counters and only
+        the first offset + limit records are visited. Filtered queries make a single pass
+        that stops at the time cutoff.
+        """
+        text = text.lower()
+        with self.lock:
+            if not text and not since:
+                if levels is None:
+                    matched = len(self.records)
+                else:
+                    matched = sum(self.level_counts[level] for level in levels)
+                return list(itertools.islice(self._newest(levels), offset, offset + limit)), matched
+            
+            page, matched = [], 0
+            for record in self._newest(levels):
+                if since and record.timestamp < since:
+                    break
+                if text and text not in record.message.lower():
+                    continue
+                if offset <= matched < offset + limit:
+                    page.append(record)
+                matched += 1
+            return page, matched
+    
+    def clear(self):
+        with self.lock:
+            self.records.clear()
+            self.by_level.clear()
+            self.level_counts.clear()
+    
+    def to_frame(self) -> pd.DataFrame:
+        with self.lock:
+            return pd.DataFrame(list(self.records), columns=LogRecord._fields)
+
+if 'logs' not in st.session_state:
+    st.session_state.logs = LogStore()
+
+def render_page_selector(total: int, key: str, page_size: int = LOG_PAGE_SIZE) -> int:
+    """Page picker for the paginated viewers; returns the offset of the chosen page"""
+    pages = max(1, -(-total // page_size))
+    if st.session_state.get(key, 1) > pages:
+        st.session_state[key] = pages
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key=key)
+    return (page - 1) * page_size
+
 def add_log(message: str, level: str = "INFO"):
     """Add a log entry with timestamp"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_entry = {
-        'timestamp': timestamp,
-        'level': level,
-        'message': message
-    }
-    st.session_state.logs.append(log_entry)
-    
-    # Keep only last 100 logs
-    if len(st.session_state.logs) > 100:
-        st.session_state.logs = st.session_state.logs[-100:]
+    st.session_state.logs.append(level, message)
     
     # Also log to Python logger
     if level == "INFO":
@@ -317,21 +472,135 @@ def add_log(message: str, level: str = "INFO"):
     elif level == "ERROR":
         logger.error(message)
 
-def retry_with_backoff(max_retries: int = 3, initial_delay: float = 1.0):
-    """Decorator for retrying functions with exponential backoff"""
+class RateLimiter:
+    """Thread-safe token bucket that paces API calls across worker threads
+    
+    The refill rate adapts AIMD-style: it creeps back towards the quota ceiling with every
+    success and is cut multiplicatively on a throttled response, so sustained throughput
+    sits just under the quota instead of swinging between idle waits and bursts of 429s.
+    """
+    
+    def __init__(self, rate_per_minute: int, burst: int = 10):
+        self.ceiling = rate_per_minute / 60.0
+        self.floor = self.ceiling * RATE_FLOOR_FRACTION
+        self.rate = self.ceiling
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a request token is available and no Retry-After pause is in force"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1 and now >= self.paused_until:
+                    self.tokens -= 1
+                    return
+                wait = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(wait)
+    
+    def on_success(self):
+        with self.lock:
+            self.rate = min(self.ceiling, self.rate + self.ceiling * RATE_ADDITIVE_STEP)
+    
+    def on_throttle(self, retry_after: Optional[float] = None):
+        """Back off after a quota rejection; concurrent rejections count as one"""
+        with self.lock:
+            now = time.monotonic()
+            if now - self.last_decrease >= RATE_DECREASE_COOLDOWN_SECONDS:
+                self.rate = max(self.floor, self.rate * RATE_DECREASE_FACTOR)
+                self.tokens = 0.0
+                self.last_decrease = now
+            if retry_after:
+                self.paused_until = max(self.paused_until, now + retry_after)
+    
+    def requests_per_minute(self) -> float:
+        return self.rate * 60
+
+@st.cache_resource
+def get_rate_limiters() -> Dict[str, RateLimiter]:
+    """Process-wide limiters so every session shares the service account's Sheets and Drive quotas"""
+    return {
+        'sheets': RateLimiter(SHEETS_REQUESTS_PER_MINUTE),
+        'drive': RateLimiter(DRIVE_REQUESTS_PER_MINUTE)
+    }
+
+def _parse_retry_after(value) -> Optional[float]:
+    """Seconds to wait from a Retry-After header given as seconds or an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(tz=timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def classify_api_error(error: Exception) -> tuple:
+    """Return (retryable, throttled, retry_after seconds) for an exception from a Google API call
+    
+    Quota rejections, server errors and connection failures are retryable. Auth,
+    permission and not-found errors are fatal, as is anything unrecognised.
+    """
+    status, retry_after = None, None
+    
+    response = getattr(error, 'response', None)  # gspread APIError wraps a requests response
+    resp = getattr(error, 'resp', None)  # googleapiclient HttpError wraps an httplib2 response
+    if response is not None and hasattr(response, 'status_code'):
+        status = response.status_code
+        retry_after = _parse_retry_after(response.headers.get('Retry-After'))
+    elif resp is not None:
+        status = getattr(resp, 'status', None)
+        retry_after = _parse_retry_after(resp.get('retry-after'))
+    
+    if status is None:
+        if type(error).__name__ == 'RefreshError':
+            return False, False, None
+        return isinstance(error, OSError), False, None
+    
+    throttled = status == 429 or (status == 403 and any(marker in str(error) for marker in RATE_LIMIT_MARKERS))
+    return throttled or status in RETRYABLE_STATUS_CODES, throttled, retry_after
+
+def retry_with_backoff(max_retries: int = 3, initial_delay: float = 1.0, api: Optional[str] = None,
+                       throttle_only: bool = False):
+    """Decorator for retrying Google API calls with decorrelated-jitter backoff
+    
+    With api set, each attempt first takes a token from the manager's limiter for that API
+    and reports successes and throttling back to it. Fatal errors are raised at once, and
+    throttle_only limits retries to quota rejections for writes that are unsafe to repeat.
+    """
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
+            limiter = getattr(args[0], 'limiters', {}).get(api) if api and args else None
             delay = initial_delay
             for attempt in range(max_retries):
+                if limiter:
+                    limiter.acquire()
                 try:
-                    return func(*args, **kwargs)
+                    result = func(*args, **kwargs)
                 except Exception as e:
-                    if attempt == max_retries - 1:
+                    retryable, throttled, retry_after = classify_api_error(e)
+                    if throttled and limiter:
+                        limiter.on_throttle(retry_after)
+                    if not retryable or (throttle_only and not throttled) or attempt == max_retries - 1:
                         raise
-                    add_log(f"Attempt {attempt + 1} failed: {str(e)}. Retrying in {delay}s...", "WARNING")
-                    time.sleep(delay)
-                    delay *= 2  # Exponential backoff
+                    # Decorrelated jitter: each wait is drawn between the base delay and three times the last
+                    delay = min(RETRY_MAX_DELAY_SECONDS, random.uniform(initial_delay, delay * 3))
+                    wait = max(delay, retry_after or 0)
+                    add_log(f"Attempt {attempt + 1} failed: {str(e)}. Retrying in {wait:.1f}s...", "WARNING")
+                    time.sleep(wait)
+                    continue
+                if limiter:
+                    limiter.on_success()
+                return result
             return None
         return wrapper
     return decorator
@@ -365,6 +634,7 @@ class EnhancedBookingManager:
             
             # Cache settings
             self.cache_ttl = 300  # 5 minutes
+            self.limiters = get_rate_limiters()
             
             add_log("Enhanced Booking Manager initialized successfully", "SUCCESS")
             
@@ -397,17 +667,116 @@ class EnhancedBookingManager:
             'status': status
         }
     
-    @retry_with_backoff(max_retries=3, initial_delay=2.0)
-    def _fetch_drive_files_page(self, drive_service, query: str, page_token: Optional[str] = None):
+    @retry_with_backoff(max_retries=4, initial_delay=1.0, api='sheets')
+    def _sheets_call(self, func: Callable, *args, **kwargs):
+        """Run one Sheets API call through the shared limiter and retry policy"""
+        return func(*args, **kwargs)
+    
+    @retry_with_backoff(max_retries=4, initial_delay=1.0, api='sheets', throttle_only=True)
+    def _sheets_write_once(self, func: Callable, *args, **kwargs):
+        """Run a non-idempotent Sheets write (row inserts), retrying only quota rejections"""
+        return func(*args, **kwargs)
+    
+    @retry_with_backoff(max_retries=4, initial_delay=1.0, api='drive')
+    def _drive_call(self, func: Callable, *args, **kwargs):
+        """Run one Drive API call through the shared limiter and retry policy"""
+        return func(*args, **kwargs)
+    
+    @retry_with_backoff(max_retries=4, initial_delay=2.0, api='drive')
+    def _fetch_drive_files_page(self, drive_service, query: str, page_token: Optional[str] = None, http=None):
         """Fetch a single page of files from Drive API with retry logic"""
         return drive_service.files().list(
             q=query,
             pageSize=1000,  # Maximum page size
-            fields="nextPageToken, files(id, name, webViewLink, modifiedTime, createdTime, owners, size, mimeType)",
+            fields="nextPageToken, files(id, name, webViewLink, modifiedTime, createdTime, owners, size, mimeType, "
+                   "shortcutDetails(targetId, targetMimeType))",
             supportsAllDrives=True,
             includeItemsFromAllDrives=True,
             pageToken=page_token
-        ).execute()
+        ).execute(http=http)
+    
+    def _scan_folders(self, drive_service, folder_id: str, recursive: bool, max_depth: int) -> List[Dict]:
+        """Breadth-first walk of a folder tree, fetching independent folders concurrently
+        
+        Each folder is listed with one query for its spreadsheets, subfolders and shortcuts.
+        Every page is handled as soon as it arrives: its subfolders are queued straight away
+        and its next page is requested alongside them. Shortcuts are followed to their
+        targets, and folders or spreadsheets reached twice (cycles, multiple parents) are
+        only visited once.
+        """
+        from google_auth_httplib2 import AuthorizedHttp
+        import httplib2
+        
+        # API client objects are not thread-safe, so each worker gets its own HTTP transport
+        local = threading.local()
+        ctx = get_script_run_ctx()
+        
+        def fetch(fid: str, page_token: Optional[str]):
+            add_script_run_ctx(threading.current_thread(), ctx)
+            if not hasattr(local, 'http'):
+                local.http = AuthorizedHttp(self.creds, http=httplib2.Http())
+            query = (f"'{fid}' in parents and trashed=false and (mimeType='{SPREADSHEET_MIME}' "
+                     f"or mimeType='{FOLDER_MIME}' or mimeType='{SHORTCUT_MIME}')")
+            return self._fetch_drive_files_page(drive_service, query, page_token, http=local.http)
+        
+        workbooks = []
+        seen_files = set()
+        visited = {folder_id}
+        pages = 0
+        
+        with ThreadPoolExecutor(max_workers=FOLDER_SCAN_MAX_WORKERS) as executor:
+            # future -> (folder id, folder path, depth, page number)
+            pending = {executor.submit(fetch, folder_id, None): (folder_id, '', 0, 1)}
+            
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    fid, path, depth, page = pending.pop(future)
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        add_log(f"Could not list folder {path or fid}: {str(e)}", "WARNING")
+                        continue
+                    pages += 1
+                    
+                    for file in results.get('files', []):
+                        mime_type = file.get('mimeType')
+                        target_id = file['id']
+                        url = file.get('webViewLink')
+                        if mime_type == SHORTCUT_MIME:
+                            details = file.get('shortcutDetails', {})
+                            mime_type, target_id = details.get('targetMimeType'), details.get('targetId', target_id)
+                            url = None
+                        
+                        if mime_type == FOLDER_MIME:
+                            if recursive and depth < max_depth and target_id not in visited:
+                                visited.add(target_id)
+                                subpath = f"{path}/{file['name']}" if path else file['name']
+                                pending[executor.submit(fetch, target_id, None)] = (target_id, subpath, depth + 1, 1)
+                        elif mime_type == SPREADSHEET_MIME and target_id not in seen_files:
+                            seen_files.add(target_id)
+                            workbooks.append({
+                                'id': target_id,
+                                'name': file['name'],
+                                'url': url or f"https://docs.google.com/spreadsheets/d/{target_id}",
+                                'modified': file.get('modifiedTime', 'Unknown'),
+                                'created': file.get('createdTime', 'Unknown'),
+                                'size': file.get('size', 'Unknown'),
+                                'owners': file.get('owners', []),
+                                'mimeType': SPREADSHEET_MIME,
+                                'folder': path or '/'
+                            })
+                    
+                    page_token = results.get('nextPageToken')
+                    if page_token and page < FOLDER_SCAN_MAX_PAGES:
+                        pending[executor.submit(fetch, fid, page_token)] = (fid, path, depth, page + 1)
+                    elif page_token:
+                        add_log(f"Reached maximum page limit ({FOLDER_SCAN_MAX_PAGES}) in {path or fid}. There may be more files.", "WARNING")
+                    
+                    self._update_progress(len(workbooks), -1, f"Scanned {pages} page(s) in {len(visited)} folder(s)...")
+        
+        add_log(f"Scanned {len(visited)} folder(s) in {pages} page(s): {len(workbooks)} spreadsheet(s)", "SUCCESS")
+        return workbooks
     
     def list_workbooks_from_folder_enhanced(
         self, 
@@ -420,7 +789,7 @@ class EnhancedBookingManager:
     ) -> List[Dict]:
         """Enhanced version with complete loading, caching, and progress tracking"""
         try:
-            cache_key = f"folder_{folder_id}_recursive_{recursive}"
+            cache_key = f"folder_{folder_id}_recursive_{recursive}_depth_{max_depth}"
             
             # Check cache first
             if use_cache and not force_refresh and self._is_cache_valid(cache_key):
@@ -442,59 +811,10 @@ class EnhancedBookingManager:
                 
                 drive_service = build('drive', 'v3', credentials=self.creds)
                 
-                # Query for all spreadsheets in the folder
-                query = f"'{folder_id}' in parents and mimeType='application/vnd.google-apps.spreadsheet' and trashed=false"
-                
-                page_token = None
-                page_count = 0
-                total_files = 0
-                max_pages = 100  # Safety limit
-                
-                add_log("Starting pagination loop (max 1000 files per page)...", "INFO")
-                
-                while page_count < max_pages:
-                    page_count += 1
-                    add_log(f"Fetching page {page_count}...", "INFO")
-                    
-                    self._update_progress(total_files, -1, f"Loading page {page_count}...")
-                    
-                    # Fetch page with retry logic
-                    results = self._fetch_drive_files_page(drive_service, query, page_token)
-                    
-                    files = results.get('files', [])
-                    add_log(f"Page {page_count}: Found {len(files)} file(s)", "INFO")
-                    
-                    for file in files:
-                        total_files += 1
-                        workbooks.append({
-                            'id': file['id'],
-                            'name': file['name'],
-                            'url': file.get('webViewLink', f"https://docs.google.com/spreadsheets/d/{file['id']}"),
-                            'modified': file.get('modifiedTime', 'Unknown'),
-                            'created': file.get('createdTime', 'Unknown'),
-                            'size': file.get('size', 'Unknown'),
-                            'owners': file.get('owners', []),
-                            'mimeType': file.get('mimeType', 'Unknown')
-                        })
-                        
-                        if total_files % 10 == 0:
-                            add_log(f"  Loaded {total_files} files so far...", "INFO")
-                            self._update_progress(total_files, -1, f"Loaded {total_files} files...")
-                    
-                    page_token = results.get('nextPageToken')
-                    
-                    if not page_token:
-                        add_log(f"No more pages. Total pages processed: {page_count}", "SUCCESS")
-                        break
-                    
-                    add_log(f"More pages available, continuing...", "INFO")
-                    time.sleep(0.5)  # Rate limiting
-                
-                if page_count >= max_pages:
-                    add_log(f"Reached maximum page limit ({max_pages}). There may be more files.", "WARNING")
+                workbooks = self._scan_folders(drive_service, folder_id, recursive, max_depth)
                 
                 if workbooks:
-                    add_log(f"Drive API method successful: {len(workbooks)} workbook(s) loaded across {page_count} page(s)", "SUCCESS")
+                    add_log(f"Drive API method successful: {len(workbooks)} workbook(s) loaded", "SUCCESS")
                     self._update_cache(cache_key, workbooks)
                     self._update_progress(len(workbooks), len(workbooks), "Complete")
                     return workbooks
@@ -508,7 +828,7 @@ class EnhancedBookingManager:
             add_log("Trying to open example spreadsheets from folder...", "INFO")
             for sheet_id in EXAMPLE_SPREADSHEET_IDS:
                 try:
-                    sheet = self.gc.open_by_key(sheet_id)
+                    sheet = self._sheets_call(self.gc.open_by_key, sheet_id)
                     workbooks.append({
                         'id': sheet.id,
                         'name': sheet.title,
@@ -531,7 +851,7 @@ class EnhancedBookingManager:
             # Method 3: List all accessible spreadsheets
             add_log("Trying to list all accessible spreadsheets...", "INFO")
             try:
-                all_spreadsheets = self.gc.openall()
+                all_spreadsheets = self._drive_call(self.gc.openall)
                 add_log(f"Found {len(all_spreadsheets)} accessible spreadsheet(s)", "INFO")
                 
                 for i, sheet in enumerate(all_spreadsheets, 1):
@@ -574,7 +894,7 @@ class EnhancedBookingManager:
         """Open a specific workbook by ID (for manual entry)"""
         try:
             add_log(f"Opening workbook by ID: {workbook_id}", "INFO")
-            workbook = self.gc.open_by_key(workbook_id)
+            workbook = self._sheets_call(self.gc.open_by_key, workbook_id)
             add_log(f"Successfully opened: {workbook.title}", "SUCCESS")
             
             # Add to workbooks list if not already there
@@ -600,10 +920,10 @@ class EnhancedBookingManager:
         """Open a specific workbook by ID"""
         try:
             add_log(f"Opening workbook ID: {workbook_id}", "INFO")
-            workbook = self.gc.open_by_key(workbook_id)
+            workbook = self._sheets_call(self.gc.open_by_key, workbook_id)
             add_log(f"Successfully opened: {workbook.title}", "SUCCESS")
             
-            all_sheets = workbook.worksheets()
+            all_sheets = self._sheets_call(workbook.worksheets)
             st.session_state.all_sheets = [
                 {
                     'index': i,
@@ -627,10 +947,10 @@ class EnhancedBookingManager:
         """Extract client profile from first sheet"""
         try:
             add_log(f"Reading client profile from: {workbook.title}", "INFO")
-            sheet = workbook.get_worksheet(0)
+            sheet = self._sheets_call(workbook.get_worksheet, 0)
             add_log(f"Accessing sheet: {sheet.title}", "INFO")
             
-            all_values = sheet.get_all_values()
+            all_values = self._sheets_call(sheet.get_all_values)
             
             profile = {
                 'client_name': all_values[0][0] if len(all_values) > 0 else 'Unknown',
@@ -668,7 +988,7 @@ class EnhancedBookingManager:
         """Get all calendar sheets (excluding first sheet)"""
         try:
             add_log("Retrieving calendar sheets...", "INFO")
-            worksheets = workbook.worksheets()
+            worksheets = self._sheets_call(workbook.worksheets)
             calendars = []
             
             for i, sheet in enumerate(worksheets[1:], start=1):
@@ -690,7 +1010,7 @@ class EnhancedBookingManager:
         """Read booking calendar starting from specified row"""
         try:
             add_log(f"Reading calendar: {sheet.title} (starting from row {start_row})", "INFO")
-            all_values = sheet.get_all_values()
+            all_values = self._sheets_call(sheet.get_all_values)
             
             if len(all_values) < start_row:
                 add_log(f"Sheet has insufficient rows (found {len(all_values)}, need {start_row})", "WARNING")
@@ -732,7 +1052,7 @@ class EnhancedBookingManager:
         """Read all data from any sheet"""
         try:
             add_log(f"Reading all data from sheet: {sheet.title}", "INFO")
-            all_values = sheet.get_all_values()
+            all_values = self._sheets_call(sheet.get_all_values)
             
             if not all_values:
                 add_log("Sheet is empty", "WARNING")
@@ -764,7 +1084,7 @@ class EnhancedBookingManager:
         """Update a single booking cell"""
         try:
             add_log(f"Updating cell [{row}, {col}] in {sheet.title} to: {value}", "INFO")
-            sheet.update_cell(row, col, value)
+            self._sheets_call(sheet.update_cell, row, col, value)
             add_log("Cell updated successfully", "SUCCESS")
             return True
         except Exception as e:
@@ -775,10 +1095,10 @@ class EnhancedBookingManager:
         """Add a new booking row"""
         try:
             add_log(f"Adding new booking row to {sheet.title}", "INFO")
-            all_values = sheet.get_all_values()
+            all_values = self._sheets_call(sheet.get_all_values)
             last_row = len(all_values) + 1
             
-            sheet.insert_row(data, last_row)
+            self._sheets_write_once(sheet.insert_row, data, last_row)
             add_log(f"Booking added at row {last_row}", "SUCCESS")
             return True
         except Exception as e:
@@ -789,7 +1109,7 @@ class EnhancedBookingManager:
         """Copy a row from the sheet"""
         try:
             add_log(f"Copying row {row_index} from {sheet.title}", "INFO")
-            all_values = sheet.get_all_values()
+            all_values = self._sheets_call(sheet.get_all_values)
             
             if row_index < len(all_values):
                 row_data = all_values[row_index]
@@ -806,7 +1126,7 @@ class EnhancedBookingManager:
         """Append a new row to the sheet"""
         try:
             add_log(f"Appending row to {sheet.title}", "INFO")
-            sheet.append_row(data)
+            self._sheets_write_once(sheet.append_row, data)
             add_log(f"Row appended successfully with {len(data)} cells", "SUCCESS")
             return True
         except Exception as e:
@@ -817,13 +1137,86 @@ class EnhancedBookingManager:
         """Update a single cell in real-time"""
         try:
             add_log(f"Updating cell [{row}, {col}] in {sheet.title} to: {value}", "INFO")
-            sheet.update_cell(row, col, value)
+            self._sheets_call(sheet.update_cell, row, col, value)
             add_log("Cell updated successfully", "SUCCESS")
             return True
         except Exception as e:
             add_log(f"Error updating cell: {str(e)}", "ERROR")
             return False
     
+    @staticmethod
+    def _coalesce_cell_updates(updates: List[Dict]) -> List[Dict]:
+        """Merge single-cell updates into contiguous rectangular blocks
+        
+        Returns blocks as {'row': top, 'col': left, 'values': [[...], ...]}. When the same
+        cell is updated twice the last value wins, matching the old one-by-one writes.
+        """
+        cells = {}
+        for update in updates:
+            cells[(int(update['row']), int(update['col']))] = update['value']
+        
+        # Horizontal runs of adjacent columns within a row
+        runs = []
+        for row, col in sorted(cells):
+            last = runs[-1] if runs else None
+            if last and last['row'] == row and last['col'] + len(last['values'][0]) == col:
+                last['values'][0].append(cells[(row, col)])
+            else:
+                runs.append({'row': row, 'col': col, 'values': [[cells[(row, col)]]]})
+        
+        # Stack runs covering the same columns on consecutive rows
+        blocks = []
+        open_blocks = {}
+        for run in runs:
+            span = (run['col'], len(run['values'][0]))
+            block = open_blocks.get(span)
+            if block and block['row'] + len(block['values']) == run['row']:
+                block['values'].append(run['values'][0])
+            else:
+                blocks.append(run)
+                open_blocks[span] = run
+        return blocks
+    
+    def _write_cell_ranges(self, sheet, updates: List[Dict]) -> int:
+        """Write cell updates as values:batchUpdate requests chunked under the payload limit
+        
+        Returns the number of API requests sent.
+        """
+        sheet_prefix = "'" + sheet.title.replace("'", "''") + "'"
+        request_count = 0
+        data = []
+        payload_size = 0
+        
+        def flush():
+            self._sheets_call(sheet.spreadsheet.values_batch_update, {
+                'valueInputOption': 'USER_ENTERED',
+                'data': data
+            })
+        
+        for block in self._coalesce_cell_updates(updates):
+            last_row = block['row'] + len(block['values']) - 1
+            last_col = block['col'] + len(block['values'][0]) - 1
+            entry = {
+                'range': f"{sheet_prefix}!{rowcol_to_a1(block['row'], block['col'])}:{rowcol_to_a1(last_row, last_col)}",
+                'values': block['values']
+            }
+            entry_size = len(json.dumps(entry, default=str))
+            
+            if data and payload_size + entry_size > WRITE_BATCH_MAX_BYTES:
+                flush()
+                request_count += 1
+                data = []
+                payload_size = 0
+            
+            data.append(entry)
+            payload_size += entry_size
+        
+        if data:
+            flush()
+            request_count += 1
+        
+        return request_count
+    
     def batch_update_cells(self, sheet, cell_list: List[Dict]) -> bool:
         """Batch update multiple cells at once
         cell_list format: [{'row': 1, 'col': 1, 'value': 'text'}, ...]
@@ -831,10 +1224,9 @@ class EnhancedBookingManager:
         try:
             add_log(f"Batch updating {len(cell_list)} cells in {sheet.title}", "INFO")
             
-            for cell_data in cell_list:
-                sheet.update_cell(cell_data['row'], cell_data['col'], cell_data['value'])
+            request_count = self._write_cell_ranges(sheet, cell_list)
             
-            add_log(f"Batch update completed: {len(cell_list)} cells updated", "SUCCESS")
+            add_log(f"Batch update completed: {len(cell_list)} cells updated in {request_count} request(s)", "SUCCESS")
             return True
         except Exception as e:
             add_log(f"Error in batch update: {str(e)}", "ERROR")
@@ -907,6 +1299,9 @@ def authenticate():
     with col2:
         force_refresh = st.checkbox("Force Refresh", value=False, help="Ignore cache and reload all files")
     
+    scan_subfolders = st.checkbox("Include subfolders", value=st.session_state.scan_subfolders,
+                                  help="Also list spreadsheets filed in subfolders (and folder shortcuts)")
+    
     if st.button("🚀 Connect to Google Sheets", type="primary", use_container_width=True):
         if uploaded_file:
             with st.spinner("Authenticating..."):
@@ -934,10 +1329,12 @@ def authenticate():
                         </div>
                         """, unsafe_allow_html=True)
                         
+                        st.session_state.scan_subfolders = scan_subfolders
                         st.session_state.workbooks = manager.list_workbooks_from_folder_enhanced(
                             DRIVE_FOLDER_ID,
                             use_cache=use_cache,
-                            force_refresh=force_refresh
+                            force_refresh=force_refresh,
+                            recursive=scan_subfolders
                         )
                         
                         progress = st.session_state.loading_progress
@@ -983,6 +1380,8 @@ def main_app():
         col1, col2 = st.columns(2)
         with col1:
             force_refresh = st.checkbox("Force Refresh", value=False, key="main_force_refresh")
+            st.session_state.scan_subfolders = st.checkbox("Include subfolders", value=st.session_state.scan_subfolders,
+                                                           key="main_scan_subfolders")
         
         with col2:
             if st.button("🗑️ Clear Cache"):
@@ -996,7 +1395,8 @@ def main_app():
                 with st.spinner("Refreshing..."):
                     st.session_state.workbooks = manager.list_workbooks_from_folder_enhanced(
                         DRIVE_FOLDER_ID,
-                        force_refresh=force_refresh
+                        force_refresh=force_refresh,
+                        recursive=st.session_state.scan_subfolders
                     )
                 if st.session_state.workbooks:
                     st.success(f"✅ Found {len(st.session_state.workbooks)} workbooks!")
@@ -1359,23 +1759,45 @@ def render_system_logs():
     """Render system logs"""
     st.markdown('<div class="section-header">📋 System Logs</div>', unsafe_allow_html=True)
     
+    limiters = get_rate_limiters()
+    st.caption(f"API pacing: Sheets {limiters['sheets'].requests_per_minute():.0f}/{SHEETS_REQUESTS_PER_MINUTE} per minute, "
+               f"Drive {limiters['drive'].requests_per_minute():.0f}/{DRIVE_REQUESTS_PER_MINUTE} per minute")
+    
     if st.button("🗑️ Clear Logs"):
-        st.session_state.logs = []
+        st.session_state.logs.clear()
         st.rerun()
     
     if st.session_state.logs:
-        st.info(f"Showing {len(st.session_state.logs)} log entries (max 100)")
+        col1, col2, col3 = st.columns([2, 2, 1])
+        with col1:
+            filter_level = st.multiselect(
+                "Filter by Level",
+                ["INFO", "SUCCESS", "WARNING", "ERROR"],
+                default=["INFO", "SUCCESS", "WARNING", "ERROR"]
+            )
+        with col2:
+            search_text = st.text_input("Search messages", placeholder="Type to filter...")
+        with col3:
+            time_window = st.selectbox("Time", list(LOG_TIME_WINDOWS))
         
-        for log in reversed(st.session_state.logs):
-            level_class = f"log-{log['level'].lower()}"
-            st.markdown(f"""
-            <div class="log-entry {level_class}">
-                <strong>[{log['timestamp']}]</strong> 
-                <span style="color: {'#28a745' if log['level'] == 'SUCCESS' else '#17a2b8' if log['level'] == 'INFO' else '#ffc107' if log['level'] == 'WARNING' else '#dc3545'};">
-                    {log['level']}
-                </span>: {log['message']}
-            </div>
-            """, unsafe_allow_html=True)
+        minutes = LOG_TIME_WINDOWS[time_window]
+        since = (datetime.now() - timedelta(minutes=minutes)).strftime("%Y-%m-%d %H:%M:%S") if minutes else None
+        
+        # Fetch the page the picker is on together with the match count, re-reading only if
+        # the filters shrank the results below that page
+        requested = (st.session_state.get("system_logs_page", 1) - 1) * LOG_PAGE_SIZE
+        page, matched = st.session_state.logs.query(filter_level, search_text, since, offset=requested)
+        offset = render_page_selector(matched, "system_logs_page")
+        if offset != requested:
+            page, matched = st.session_state.logs.query(filter_level, search_text, since, offset=offset)
+        
+        st.info(f"Showing {offset + 1 if page else 0}-{offset + len(page)} of {matched} matching log entries (max {LOG_BUFFER_SIZE} kept)")
+        
+        st.dataframe(
+            pd.DataFrame(page, columns=LogRecord._fields).drop(columns=['seq']),
+            use_container_width=True,
+            hide_index=True
+        )
     else:
         st.info("No logs yet")
 